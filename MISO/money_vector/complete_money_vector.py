@@ -1,5 +1,14 @@
 import pandas as pd
-import os
+import argparse, os, sys
+
+# shared --profile instrumentation lives with the paper vector pipeline
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "paper_vector"))
+from instrument import add_profile_argument, finish_profile, stage, start_profile
+
+ap = argparse.ArgumentParser()
+add_profile_argument(ap)
+args = ap.parse_args()
+start_profile(args.profile)
 
 print("="*70)
 print("MONEY VECTOR - COMPLETE ANALYSIS")
@@ -18,8 +27,10 @@ print(f"   ✓ Energy & Natural Resources: ${federal_lobbying_amount:,}")
 print("\n[2/3] State Lobbying (Indiana ILRC)")
 
 # Files are in data_clean/ folder
+st = stage("read.ilrc")
 ilrc_2024 = pd.read_csv("data_clean/indiana_energy_lobbying_2024.csv")
 ilrc_2025 = pd.read_csv("data_clean/indiana_energy_lobbying_2025.csv")
+st.rows(out=len(ilrc_2024) + len(ilrc_2025))
 
 count_2024 = len(ilrc_2024)
 count_2025 = len(ilrc_2025)
@@ -36,8 +47,11 @@ print(f"   ✓ Growth: +{growth} (+{growth_pct:.1f}%)")
 print("\n[3/3] Federal Awards (USAspending)")
 
 # Files are in scripts/ folder
+st = stage("read.awards")
 contracts = pd.read_csv("scripts/Contracts_PrimeAwardSummaries_2025-10-09_H15M27S56_1.csv")
 assistance = pd.read_csv("scripts/Assistance_PrimeAwardSummaries_2025-10-09_H15M27S59_1.csv")
+st.rows(out=len(contracts) + len(assistance))
+stage("aggregate.awards").rows(in_=len(contracts) + len(assistance))
 
 contracts_total = pd.to_numeric(contracts['total_obligated_amount'], errors='coerce').sum()
 assistance_total = pd.to_numeric(assistance['total_obligated_amount'], errors='coerce').sum()
@@ -58,6 +72,7 @@ for i, (name, amount) in enumerate(top5.items(), 1):
 # ===================================================================
 # MONEY MOMENTUM SCORE
 # ===================================================================
+stage("score")
 print("\n" + "="*70)
 print("MONEY MOMENTUM SCORE")
 print("="*70)
@@ -85,6 +100,7 @@ print("=" * 70)
 os.makedirs("final_output", exist_ok=True)
 
 # Build detailed row-by-row dataset
+st = stage("build.detailed").rows(in_=len(ilrc_2025) + len(assistance))
 money_vector_data = []
 
 # Add state lobbying entries (from ILRC)
@@ -130,6 +146,8 @@ for idx, row in assistance.iterrows():
 # Create DataFrame and save
 df_money = pd.DataFrame(money_vector_data)
 df_money = df_money.sort_values('date', ascending=False)
+st.rows(out=len(df_money))
+stage("write").rows(in_=len(df_money))
 df_money.to_csv("final_output/MONEY_VECTOR_DETAILED.csv", index=False)
 print("✅ Created: final_output/MONEY_VECTOR_DETAILED.csv")
 
@@ -207,3 +225,4 @@ print("  1. MONEY_VECTOR_DETAILED.csv     ← Row-by-row format (date, org, amou
 print("  2. MONEY_VECTOR_SUMMARY.csv      ← Summary table")
 print("  3. MONEY_VECTOR_FINDINGS.md      ← Full report")
 print("\n🎉 Ready for your presentation!")
+finish_profile(args.profile)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Multi-cutoff backtest engine over filings_hist.csv.
+
+Loads the history once (Parquet dataset when present, see storage.py) into a date-sorted columnar index (dates + prefix
+sums of keyword_count), then answers any (cutoff, lookback) window with
+searchsorted slicing. Monthly filings_count / keyword_hits for many cutoffs
+are computed together as a (cutoffs x months) broadcast, so no per-cutoff
+CSV snapshots (filings_before_*.csv) are needed.
+
+  python3 backtest.py --cutoffs 2023-07-27 2025-10-10 --lookback-years 2
+  python3 backtest.py --sweep 2024-01-01 2025-10-01 --freq W --out backtest_monthly.csv
+"""
+import argparse
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+from storage import read_dataset
+
+class FilingsIndex:
+    def __init__(self, dates: np.ndarray, keyword_count: np.ndarray):
+        order = np.argsort(dates, kind="stable")
+        self.dates = dates[order].astype("datetime64[D]")
+        self.keyword_count = keyword_count[order].astype(np.int64)
+        self._cum_kw = np.concatenate([[0], np.cumsum(self.keyword_count)])
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "FilingsIndex":
+        """path: CSV or Parquet dataset dir; default is parquet/filings_hist, else filings_hist.csv."""
+        df = read_dataset("filings_hist", columns=["date","keyword_count"], source=path)
+        ok = df["date"].notna().to_numpy()
+        return cls(df["date"].to_numpy()[ok], df["keyword_count"].to_numpy()[ok])
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def bounds(self, cutoffs, lookback: Optional[pd.DateOffset] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Row ranges [lo, hi) for windows [cutoff - lookback, cutoff); lookback=None -> from the start."""
+        c = pd.DatetimeIndex(pd.to_datetime(list(cutoffs)))
+        hi = np.searchsorted(self.dates, c.values.astype("datetime64[D]"), side="left")
+        if lookback is None:
+            lo = np.zeros_like(hi)
+        else:
+            lo = np.searchsorted(self.dates, (c - lookback).values.astype("datetime64[D]"), side="left")
+        return lo, hi
+
+    def window(self, cutoff, lookback: Optional[pd.DateOffset] = None) -> pd.DataFrame:
+        lo, hi = self.bounds([cutoff], lookback)
+        s = slice(lo[0], hi[0])
+        return pd.DataFrame({"date": self.dates[s].astype("datetime64[ns]"), "keyword_count": self.keyword_count[s]})
+
+    def totals(self, cutoffs, lookback: Optional[pd.DateOffset] = None) -> pd.DataFrame:
+        lo, hi = self.bounds(cutoffs, lookback)
+        return pd.DataFrame({
+            "cutoff": pd.to_datetime(list(cutoffs)),
+            "filings_count": hi - lo,
+            "keyword_hits": self._cum_kw[hi] - self._cum_kw[lo],
+        })
+
+    def monthly(self, cutoffs, lookback: Optional[pd.DateOffset] = None) -> pd.DataFrame:
+        """
+        Long frame (cutoff, month, filings_count, keyword_hits) for every cutoff at once.
+        `month` is the month-end label pandas' resample('M') would use.
+        """
+        cutoffs = pd.DatetimeIndex(pd.to_datetime(list(cutoffs)))
+        if len(self) == 0 or len(cutoffs) == 0:
+            return pd.DataFrame(columns=["cutoff","month","filings_count","keyword_hits"])
+        lo, hi = self.bounds(cutoffs, lookback)
+        months = pd.period_range(pd.Timestamp(self.dates[0]), pd.Timestamp(self.dates[-1]), freq="M")
+        starts = np.searchsorted(self.dates, months.start_time.values.astype("datetime64[D]"), side="left")
+        ends = np.append(starts[1:], len(self))
+        # clip every month's row range to every cutoff's window: (cutoffs x months)
+        s = np.clip(starts[None, :], lo[:, None], hi[:, None])
+        e = np.clip(ends[None, :], lo[:, None], hi[:, None])
+        counts = e - s
+        hits = self._cum_kw[e] - self._cum_kw[s]
+        # keep months between each window's first and last filing, like resample does
+        has = counts > 0
+        first = np.where(has.any(axis=1), has.argmax(axis=1), len(months))
+        last = np.where(has.any(axis=1), len(months) - 1 - has[:, ::-1].argmax(axis=1), -1)
+        m_idx = np.arange(len(months))[None, :]
+        keep = (m_idx >= first[:, None]) & (m_idx <= last[:, None])
+        ci, mi = np.nonzero(keep)
+        return pd.DataFrame({
+            "cutoff": cutoffs.values[ci],
+            "month": months.end_time.normalize().values[mi],
+            "filings_count": counts[ci, mi],
+            "keyword_hits": hits[ci, mi],
+        })
+
+def sweep_cutoffs(start, end, freq: str = "W") -> pd.DatetimeIndex:
+    return pd.date_range(start, end, freq=freq)
+
+def plot_window(monthly: pd.DataFrame, marker: pd.Timestamp, marker_label: str, title: str, out: Optional[str] = None):
+    import matplotlib.pyplot as plt
+    m = monthly.set_index("month")
+    ax = m["filings_count"].plot(figsize=(9,4), label="filings_count")
+    m["keyword_hits"].plot(ax=ax, linestyle="--", label="keyword_hits")
+    plt.axvline(marker, color="red", linestyle=":", label=marker_label)
+    plt.title(title)
+    plt.ylabel("Count")
+    plt.legend()
+    plt.tight_layout()
+    if out:
+        plt.savefig(out, dpi=300)
+        print(f"Plot saved as {out}")
+    return ax
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--hist", default=None, help="CSV or Parquet dataset (default: parquet/filings_hist, else filings_hist.csv)")
+    ap.add_argument("--cutoffs", nargs="*", default=[], help="YYYY-MM-DD cutoffs")
+    ap.add_argument("--sweep", nargs=2, metavar=("START","END"), help="Generate cutoffs from START to END")
+    ap.add_argument("--freq", default="W", help="Sweep frequency (pandas offset alias)")
+    ap.add_argument("--lookback-years", type=float, default=None, help="Window length before each cutoff (default: all history)")
+    ap.add_argument("--out", default="backtest_monthly.csv")
+    args = ap.parse_args()
+
+    idx = FilingsIndex.load(args.hist)
+    cutoffs = list(pd.to_datetime(args.cutoffs))
+    if args.sweep:
+        cutoffs += list(sweep_cutoffs(*args.sweep, freq=args.freq))
+    if not cutoffs:
+        cutoffs = [pd.Timestamp.today().normalize()]
+    lookback = pd.DateOffset(months=int(round(args.lookback_years * 12))) if args.lookback_years else None
+    monthly = idx.monthly(cutoffs, lookback)
+    monthly.to_csv(args.out, index=False)
+    print(f"[OK] wrote {args.out}: {len(cutoffs)} cutoffs x months = {len(monthly)} rows from {len(idx)} filings")
+
+if __name__ == "__main__":
+    main()
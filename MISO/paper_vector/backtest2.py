@@ -1,16 +1,14 @@
 #!/usr/bin/env python3
 import pandas as pd
 from datetime import datetime, timedelta
-
-# Load the full historical filings
-df = pd.read_csv("filings_hist.csv", parse_dates=["date"])
+from storage import read_dataset
 
 # Calculate 2-year cutoff from today
 today = pd.Timestamp.today().normalize()
 cutoff = today - pd.DateOffset(years=2)
 
-# Filter only the last 2 years of data
-df_recent = df[df["date"] >= cutoff]
+# Load only the last 2 years of filings (date predicate pushed into the scan)
+df_recent = read_dataset("filings_hist", start=cutoff)
 
 # Save output
 out_path = f"filings_last_2_years_until_{today.date()}.csv"
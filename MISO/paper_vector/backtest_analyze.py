@@ -1,20 +1,15 @@
 #!/usr/bin/env python3
 import pandas as pd
 import matplotlib.pyplot as plt
+from backtest import FilingsIndex, plot_window
 
-# Load the trimmed file created by backtest_prep.py
-df = pd.read_csv("filings_before_2023-07-27.csv", parse_dates=["date"])
+# Window straight from filings_hist (Parquet or CSV; no filings_before_*.csv snapshot needed)
+cutoff = pd.Timestamp("2023-07-27")
+idx = FilingsIndex.load()
 
 # Monthly aggregates
-monthly_filings = df.resample("M", on="date").size().rename("filings_count")
-monthly_keywords = df.resample("M", on="date")["keyword_count"].sum().rename("keyword_hits")
+monthly = idx.monthly([cutoff])
 
 # Plot
-ax = monthly_filings.plot(figsize=(9,4), label="filings_count")
-monthly_keywords.plot(ax=ax, linestyle="--", label="keyword_hits")
-plt.axvline(pd.Timestamp("2023-07-27"), color="red", linestyle=":", label="FERC Order 2023")
-plt.title("Regulatory Activity Before FERC Order 2023")
-plt.ylabel("Count")
-plt.legend()
-plt.tight_layout()
+plot_window(monthly, cutoff, "FERC Order 2023", "Regulatory Activity Before FERC Order 2023")
 plt.show()
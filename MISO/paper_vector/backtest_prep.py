@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import pandas as pd
 import sys
+from storage import read_dataset
 
 # usage: python3 backtest_prep.py 2023-07-27
 if len(sys.argv) < 2:
@@ -8,8 +9,7 @@ if len(sys.argv) < 2:
     sys.exit(1)
 
 cutoff = pd.to_datetime(sys.argv[1])
-df = pd.read_csv("filings_hist.csv", parse_dates=["date"])
-df_past = df[df["date"] < cutoff]
+df_past = read_dataset("filings_hist", end=cutoff)  # date predicate pushed into the scan
 
 out_path = f"filings_before_{cutoff.date()}.csv"
 df_past.to_csv(out_path, index=False)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Synthetic-scale benchmark for the paper vector pipeline.
+
+Generates FR / OIRA / UA / WH-shaped frames (same columns as the real pulls)
+with titles drawn from a pool of random word sequences, a configurable share
+of which contain lexicon keywords (multi-word, hyphenated and plural forms
+included). The pipeline stages are then timed separately, best of --repeat:
+
+  compile        LexiconMatcher build for the synthetic lexicon
+  label          score.label_events over every source (topic labeling)
+  keyword_count  matcher.keyword_counts over the normalized titles (flat export)
+  agency_match   AgencyDimension.match_mask over primary + full agency strings
+  features       count_cube + base planes + z-scores (features.py)
+  score          score_arrays + to_frame (topic_day layout)
+  flat_assemble  export's normalize_sources + assemble_flat end to end
+
+Every run appends one JSON line per scale to --history (default
+cache/bench_history.jsonl, untracked) with git commit, library versions and
+per-stage seconds, and prints the ratio against the previous entry with the same
+(rows, topics, keywords_per_topic); stages slower than --tolerance (and
+above --min-seconds) are flagged as regressions and the exit code is 1.
+
+  python3 bench.py                                  # 1e3, 1e4, 1e5 rows
+  python3 bench.py --rows 1e6 1e7 --topics 50 --keywords-per-topic 20
+
+Note: keyword/topic matrices are (titles x keywords) bool, so 1e7 rows with
+a large lexicon needs several GB of RAM.
+"""
+import argparse, json, os, platform, subprocess, sys, time
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from matcher import LexiconMatcher
+from features import base_planes, count_cube, score_arrays, to_frame, zscore_rows
+from score import label_events
+from export_regulatory_filings_flat import (DEFAULT_AGENCY_PATTERN, AgencyDimension,
+                                            assemble_flat, normalize_sources)
+
+SOURCE_SHARE = {"FR": 0.70, "OIRA": 0.05, "UA": 0.15, "WH": 0.10}
+AGENCIES = ["Energy Department", "Federal Energy Regulatory Commission", "Environmental Protection Agency",
+            "Commerce Department, Industry and Security Bureau", "Interior Department", "Treasury Department",
+            "Office of Electricity", "Defense Department", "Transportation Department", "Loan Programs Office"]
+DOC_TYPES = ["Rule", "Proposed Rule", "Notice", "Presidential Document"]
+HISTORY = os.path.join("cache", "bench_history.jsonl")
+STAGES = ["compile", "label", "keyword_count", "agency_match", "features", "score", "flat_assemble"]
+
+# ---- synthetic data ----
+def _words(rng: np.random.Generator, n: int, lo: int = 3, hi: int = 9) -> List[str]:
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    lens = rng.integers(lo, hi, size=n)
+    return list(dict.fromkeys("".join(rng.choice(letters, size=k)) for k in lens))
+
+def synthetic_lexicon(topics: int, per_topic: int, seed: int = 0) -> Dict[str, List[str]]:
+    """topic_i -> keywords; roughly 1/3 single words, 1/3 two-word phrases, 1/3 hyphenated."""
+    rng = np.random.default_rng(seed)
+    vocab = _words(rng, topics * per_topic * 3)
+    lex, i = {}, 0
+    for t in range(topics):
+        kws = []
+        for k in range(per_topic):
+            a, b = vocab[i], vocab[i + 1]
+            i += 2
+            kws.append(a if k % 3 == 0 else f"{a} {b}" if k % 3 == 1 else f"{a}-{b}")
+        lex[f"topic_{t:03d}"] = kws
+    return lex
+
+def title_pool(lex: Dict[str, List[str]], size: int, hit_rate: float, seed: int = 0) -> np.ndarray:
+    """`size` distinct-ish titles of 6-14 filler words; hit_rate of them embed 1-2 keywords."""
+    rng = np.random.default_rng(seed + 1)
+    filler = np.array(_words(rng, 5000))
+    kws = np.array([kw for v in lex.values() for kw in v], dtype=object)
+    lens = rng.integers(6, 15, size=size)
+    hits = rng.random(size) < hit_rate
+    out = np.empty(size, dtype=object)
+    for i in range(size):
+        words = list(rng.choice(filler, size=lens[i]))
+        if hits[i] and len(kws):
+            for kw in rng.choice(kws, size=rng.integers(1, 3)):
+                kw = kw + "s" if rng.random() < 0.2 else kw
+                words.insert(int(rng.integers(0, len(words) + 1)), kw.title() if rng.random() < 0.5 else kw)
+        out[i] = " ".join(words)
+    return out
+
+def synthetic_sources(rows: int, pool: np.ndarray, days: int = 365, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """FR/OIRA/UA/WH frames in the column layout each pull returns."""
+    rng = np.random.default_rng(seed + 2)
+    end = pd.Timestamp("2025-10-09")
+    def dates(n):
+        return (end - pd.to_timedelta(rng.integers(0, days, size=n), unit="D"))
+    def titles(n):
+        return pool[rng.integers(0, len(pool), size=n)]
+    def agencies(n):
+        return np.array(AGENCIES, dtype=object)[rng.integers(0, len(AGENCIES), size=n)]
+    n = {s: max(1, int(rows * share)) for s, share in SOURCE_SHARE.items()}
+    d = dates(n["FR"])
+    fr = pd.DataFrame({
+        "source": "FR", "id": [f"{2025}-{i:07d}" for i in range(n["FR"])], "title": titles(n["FR"]),
+        "agencies": agencies(n["FR"]), "publication_date": d.strftime("%Y-%m-%d"),
+        "type": np.array(DOC_TYPES, dtype=object)[rng.integers(0, len(DOC_TYPES), size=n["FR"])],
+        "comments_close_on": "", "html_url": "",
+    })
+    oira = pd.DataFrame({
+        "source": "OIRA", "id": [f"RIN-{i}" for i in range(n["OIRA"])], "title": titles(n["OIRA"]),
+        "agency": agencies(n["OIRA"]), "stage": "Proposed Rule", "received": dates(n["OIRA"]),
+        "status": "Under Review", "detail_url": None,
+    })
+    ua = pd.DataFrame({
+        "source": "UA", "id": [f"UA-{i}" for i in range(n["UA"])], "title": titles(n["UA"]),
+        "agency": agencies(n["UA"]), "stage": "Long-Term Actions",
+        "date": dates(n["UA"]).to_period("M").to_timestamp(), "timetable": "", "next_action_date": None, "edition": "",
+    })
+    wh = pd.DataFrame({
+        "source": "WH", "title": titles(n["WH"]), "agency": "White House", "date": dates(n["WH"]),
+        "url": [f"https://www.whitehouse.gov/p/{i}" for i in range(n["WH"])],
+    })
+    return {"FR": fr, "OIRA": oira, "UA": ua, "WH": wh}
+
+# ---- timing ----
+def best_of(fn: Callable, repeat: int):
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+def run_stages(frames: Dict[str, pd.DataFrame], lex: Dict[str, List[str]], repeat: int = 3,
+               days: int = 365) -> Dict[str, float]:
+    res = {}
+    res["compile"], matcher = best_of(lambda: LexiconMatcher(lex), repeat)
+    kw_matcher = LexiconMatcher({kw: [kw] for kws in lex.values() for kw in kws})
+
+    def label():
+        parts = [label_events(frames["FR"], "publication_date", "title", "source", matcher),
+                 label_events(frames["OIRA"], "received", "title", "source", matcher),
+                 label_events(frames["UA"], "date", "title", "source", matcher),
+                 label_events(frames["WH"], "date", "title", "source", matcher)]
+        return pd.concat(parts, ignore_index=True)
+    res["label"], events = best_of(label, repeat)
+
+    normal = normalize_sources(frames)
+    res["keyword_count"], _ = best_of(lambda: kw_matcher.keyword_counts(normal["title"]), repeat)
+    def agency_match():
+        agencies = AgencyDimension(DEFAULT_AGENCY_PATTERN)  # fresh per run: no warm decision memo
+        return agencies.match_mask(normal["agency_primary"]) | agencies.match_mask(normal["agency_full"])
+    res["agency_match"], _ = best_of(agency_match, repeat)
+
+    topics = list(lex)
+    end = pd.Timestamp("2025-10-09")
+    dates = pd.date_range(end - pd.Timedelta(days=days), end, freq="D")
+    def features():
+        f = base_planes(count_cube(events, topics, dates))
+        f["z_fr_notice"] = zscore_rows(f["fr_notice_count"])
+        f["z_comment_rate"] = zscore_rows(f["comment_rate_14d"])
+        return f
+    res["features"], f = best_of(features, repeat)
+    def score():
+        f["score"] = score_arrays(f)
+        return to_frame(f, topics, dates)
+    res["score"], _ = best_of(score, repeat)
+    res["flat_assemble"], _ = best_of(lambda: assemble_flat(normalize_sources(frames), kw_matcher,
+                                                            AgencyDimension(DEFAULT_AGENCY_PATTERN)), repeat)
+    res["events"] = int(len(events))
+    return res
+
+# ---- history ----
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception:
+        return None
+
+def _key(rec: Dict):
+    return (rec["rows"], rec["topics"], rec["keywords_per_topic"])
+
+def last_matching(history: str, rec: Dict) -> Optional[Dict]:
+    if not os.path.exists(history):
+        return None
+    prev = None
+    with open(history) as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except ValueError:
+                continue
+            if _key(r) == _key(rec):
+                prev = r
+    return prev
+
+def append_history(history: str, rec: Dict) -> None:
+    os.makedirs(os.path.dirname(history) or ".", exist_ok=True)
+    with open(history, "a") as f:
+        f.write(json.dumps(rec, sort_keys=True) + "\n")
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=float, nargs="*", default=[1e3, 1e4, 1e5], help="Total synthetic rows per scale")
+    ap.add_argument("--topics", type=int, default=5)
+    ap.add_argument("--keywords-per-topic", type=int, default=8)
+    ap.add_argument("--hit-rate", type=float, default=0.2, help="Share of titles containing a keyword")
+    ap.add_argument("--title-pool", type=int, default=100_000, help="Distinct titles to sample rows from")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--history", default=HISTORY)
+    ap.add_argument("--tolerance", type=float, default=1.25, help="Flag stages slower than this ratio vs the last run")
+    ap.add_argument("--min-seconds", type=float, default=0.05, help="Ignore ratios for stages faster than this (timer noise)")
+    args = ap.parse_args()
+
+    lex = synthetic_lexicon(args.topics, args.keywords_per_topic, args.seed)
+    regressions = 0
+    for rows in (int(r) for r in args.rows):
+        pool = title_pool(lex, min(rows, args.title_pool), args.hit_rate, args.seed)
+        frames = synthetic_sources(rows, pool, args.days, args.seed)
+        stages = run_stages(frames, lex, args.repeat, args.days)
+        rec = {
+            "ts": pd.Timestamp.now("UTC").isoformat(timespec="seconds"),
+            "commit": _git_commit(), "python": platform.python_version(),
+            "pandas": pd.__version__, "numpy": np.__version__, "host": platform.node(),
+            "rows": rows, "topics": args.topics, "keywords_per_topic": args.keywords_per_topic,
+            "hit_rate": args.hit_rate, "title_pool": len(pool), "days": args.days, "repeat": args.repeat,
+            "events": stages.pop("events"), "seconds": {k: round(stages[k], 6) for k in STAGES},
+        }
+        prev = last_matching(args.history, rec)
+        append_history(args.history, rec)
+        print(f"rows={rows:>10,}  events={rec['events']:,}")
+        for k in STAGES:
+            s = rec["seconds"][k]
+            line = f"  {k:<14}{s:>10.4f}s  {rows / s if s else float('inf'):>14,.0f} rows/s"
+            if prev and prev["seconds"].get(k):
+                ratio = s / prev["seconds"][k]
+                flag = ratio > args.tolerance and s > args.min_seconds
+                regressions += flag
+                line += f"  x{ratio:.2f} vs {prev.get('commit') or prev['ts']}" + ("  [REGRESSION]" if flag else "")
+            print(line)
+    print(f"[OK] appended {len(args.rows)} records to {args.history}")
+    if regressions:
+        print(f"[WARN] {regressions} stage(s) slower than x{args.tolerance}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Resident refresh service for the paper vector.
+
+  python3 daemon.py                           # run until SIGINT / SIGTERM
+  python3 daemon.py --once                    # a single refresh cycle (cron / smoke test)
+  python3 daemon.py --every FR=300 --every UA=43200
+
+The process stays up and keeps the compiled lexicon, each source's labeled
+events, the FR store and one warm FetchEngine (HTTP session) per source in
+memory. Each cycle pulls only the sources whose schedule is due (side by
+side, fanout.py), relabels just those, and rescores only the topics whose
+(date, source) event counts changed -- every topic when the UTC day rolls
+over and the window moves. Features are per topic (z-scores run along each
+topic's own days), so the rescored rows equal a full score.py run.
+
+Publishing is atomic: topic_day.csv is written to a temp file and renamed,
+the topic_day Parquet dataset is swapped in (storage.write_dataset), and the
+paper_vector block of client/public/data/vector_data.json is rewritten the
+same way (process_data.publish_paper_vector). A failed, timed-out or
+suspiciously empty pull keeps the previous frame and is retried after
+RETRY_SECONDS.
+"""
+import argparse, os, signal, sys, threading, time
+from typing import Dict, List, Optional
+import pandas as pd
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+import process_data  # repo root: builds client/public/data/vector_data.json
+from fetch import DEFAULT_CONCURRENCY, DEFAULT_RATE, configure as configure_fetch
+from fanout import fan_out, format_status, source_engines
+from features import build_features
+from fts import index_frames
+from fr_store import FRStore
+from fr_text import body_events, text_engine
+from storage import write_dataset
+from throttle import format_host_stats
+from ingest import CACHE_DIR, SOURCE_NAMES, make_sources
+from lexicon import load_lexicon
+from matcher import compile_lexicon
+from score import EVENT_COLUMNS, SCORE_STATE, concat_events, label_source
+
+# seconds between refreshes per source (UA editions change twice a year, WH and FR daily)
+SCHEDULE: Dict[str, int] = {"FR": 15 * 60, "OIRA": 30 * 60, "UA": 12 * 3600, "WH": 15 * 60}
+SOURCE_HOSTS = {"FR": "federalregister.gov", "OIRA": "reginfo.gov", "UA": "reginfo.gov", "WH": "whitehouse.gov"}
+RETRY_SECONDS = 5 * 60
+
+def parse_every(items: List[str]) -> Dict[str, int]:
+    out = {}
+    for item in items or []:
+        name, _, secs = item.partition("=")
+        name = name.strip().upper()
+        if name not in SCHEDULE or not secs:
+            raise SystemExit(f"--every expects SOURCE=SECONDS with SOURCE in {','.join(SCHEDULE)}: {item!r}")
+        out[name] = int(secs)
+    return out
+
+def cache_ttls(schedule: Dict[str, int]) -> Dict[str, int]:
+    """Response-cache TTLs short enough that every scheduled pull revalidates upstream."""
+    shortest: Dict[str, int] = {}
+    for name, host in SOURCE_HOSTS.items():
+        shortest[host] = min(shortest.get(host, schedule[name]), schedule[name])
+    return {host: secs // 2 for host, secs in shortest.items()}
+
+def utc_today() -> pd.Timestamp:
+    return pd.Timestamp.now("UTC").normalize().tz_localize(None)
+
+def write_csv(df: pd.DataFrame, path: str) -> None:
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+def paper_rows(feat: pd.DataFrame):
+    """(datetime, row) pairs in the shape process_data reads from topic_day."""
+    for row in feat[process_data.PAPER_COLUMNS].to_dict("records"):
+        yield row["date"].to_pydatetime(), row
+
+class Refresher:
+    def __init__(self, args):
+        self.args = args
+        self.schedule = dict(SCHEDULE, **parse_every(args.every))
+        base = configure_fetch(concurrency=args.concurrency or DEFAULT_CONCURRENCY,
+                               rate=args.rate if args.rate is not None else DEFAULT_RATE,
+                               cache_dir=None if args.no_cache else CACHE_DIR,
+                               offline=args.offline, cache_max_mb=args.cache_max_mb,
+                               ttls=cache_ttls(self.schedule))
+        lex = load_lexicon(args.lexicon)
+        keywords = sorted({kw for kws in lex.values() for kw in kws})
+        self.matcher = compile_lexicon(lex)
+        fr_store = None if args.no_cache else FRStore(os.path.join(CACHE_DIR, "fr_store"))
+        self.sources = {s.name: s for s in make_sources(keywords, args.days, fr_store)}
+        self.engines = source_engines(list(self.sources.values()), base, args.concurrency, args.rate)
+        self.text_engine = text_engine(args.concurrency, args.rate) if args.fr_text else None
+        self.next_due = {name: 0.0 for name in SOURCE_NAMES}
+        self.events: Dict[str, pd.DataFrame] = {name: pd.DataFrame(columns=EVENT_COLUMNS) for name in SOURCE_NAMES}
+        self.rows: Dict[str, int] = {name: 0 for name in SOURCE_NAMES}
+        self.counts: Optional[pd.Series] = None   # (topic, date, source) -> events behind self.feat
+        self.feat: Optional[pd.DataFrame] = None
+        self.today: Optional[pd.Timestamp] = None
+
+    def seconds_until_due(self) -> float:
+        return max(0.0, min(self.next_due.values()) - time.monotonic())
+
+    def refresh(self) -> List[str]:
+        """Pull and relabel the due sources; returns the ones whose events were replaced."""
+        now = time.monotonic()
+        due = [self.sources[n] for n in SOURCE_NAMES if self.next_due[n] <= now]
+        if not due:
+            return []
+        frames, status = fan_out(due, budget=self.args.budget, engines=self.engines)
+        print("[INFO] sources:", format_status(status), file=sys.stderr)
+        print("[INFO] hosts:", format_host_stats(), file=sys.stderr)
+        updated = []
+        for name, st in status.items():
+            if st["status"] != "ok" or (st["rows"] == 0 and self.rows[name] > 0):
+                if st["status"] == "ok":
+                    print(f"[WARN] {name} returned no rows (had {self.rows[name]}); keeping the previous pull", file=sys.stderr)
+                self.next_due[name] = now + min(RETRY_SECONDS, self.schedule[name])
+                continue
+            self.events[name] = label_source(name, frames[name], self.matcher)
+            if name == "FR" and self.text_engine is not None:
+                body = body_events(frames[name], self.matcher, self.text_engine)
+                self.events[name] = concat_events([self.events[name], body])
+            self.rows[name] = st["rows"]
+            self.next_due[name] = now + self.schedule[name]
+            updated.append(name)
+        if updated:
+            index_frames({name: frames[name] for name in updated})
+        return updated
+
+    def rescore(self) -> Optional[List[str]]:
+        """Rescore topics whose events changed into self.feat; None when nothing changed."""
+        today = utc_today()
+        events = concat_events(self.events.values())
+        if events.empty:
+            print("[WARN] No events labeled; check endpoints/keywords.", file=sys.stderr)
+            return None
+        counts = events.groupby(["topic", "date", "source"], sort=True).size()
+        topics = set(events["topic"].unique())
+        keep = None
+        if self.feat is None or today != self.today:
+            changed = topics
+        else:
+            diff = counts.sub(self.counts, fill_value=0)
+            changed = set(diff[diff != 0].index.get_level_values("topic")) & topics
+            gone = set(self.feat["topic"].unique()) - topics
+            if not changed and not gone:
+                return None
+            keep = self.feat[~self.feat["topic"].isin(changed | gone)]
+        start = today - pd.Timedelta(days=self.args.days)
+        fresh = build_features(events[events["topic"].isin(changed)], start, today, topics=sorted(changed))
+        if keep is not None and not keep.empty:
+            fresh = pd.concat([keep, fresh], ignore_index=True)
+        self.feat = fresh.sort_values(["topic", "date"], kind="stable").reset_index(drop=True)
+        self.counts, self.today = counts, today
+        return sorted(changed)
+
+    def publish(self) -> None:
+        write_csv(self.feat, self.args.out)
+        write_dataset(self.feat, "topic_day")
+        if os.path.exists(SCORE_STATE):
+            os.remove(SCORE_STATE)  # score.py --incremental's byte offsets no longer match --out
+        if not self.args.no_dashboard:
+            process_data.publish_paper_vector(paper_rows(self.feat))
+
+    def cycle(self) -> None:
+        t0 = time.perf_counter()
+        updated = self.refresh()
+        if not updated and self.feat is not None and self.today == utc_today():
+            return
+        changed = self.rescore()
+        if changed is None:
+            return
+        self.publish()
+        print(f"[OK] rescored {len(changed)} topic(s) after {','.join(updated) or 'day rollover'}; "
+              f"wrote {self.args.out} with {len(self.feat)} rows in {time.perf_counter() - t0:.1f}s")
+
+    def close(self) -> None:
+        for engine in self.engines.values():
+            engine.close()
+        if self.text_engine is not None:
+            self.text_engine.close()
+
+def main():
+    ap = argparse.ArgumentParser(description="Keep topic_day (and the dashboard JSON) fresh on a per-source schedule")
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--out", type=str, default="topic_day.csv")
+    ap.add_argument("--lexicon", type=str, default="lexicon.yaml")
+    ap.add_argument("--every", action="append", metavar="SOURCE=SECONDS",
+                    help=f"Refresh interval override, repeatable (defaults: {', '.join(f'{k}={v}' for k, v in SCHEDULE.items())})")
+    ap.add_argument("--once", action="store_true", help="Run one refresh cycle and exit")
+    ap.add_argument("--no-dashboard", action="store_true", help="Don't rewrite client/public/data/vector_data.json")
+    ap.add_argument("--fr-text", action="store_true", help="Add FR body-text hits to topic_day (fr_text.py)")
+    ap.add_argument("--concurrency", type=int, default=None,
+                    help="Parallel HTTP requests per source (default: per-source limits in fanout.py)")
+    ap.add_argument("--rate", type=float, default=None,
+                    help="Max requests/second per source (default: per-source limits in fanout.py)")
+    ap.add_argument("--budget", type=float, default=None,
+                    help="Wall-clock seconds allowed per source pull (default: per-source budgets in fanout.py)")
+    ap.add_argument("--offline", action="store_true", help="Replay responses from the cache only (no network)")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the on-disk response cache")
+    ap.add_argument("--cache-max-mb", type=int, default=512, help="LRU size bound for the response cache")
+    args = ap.parse_args()
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    r = Refresher(args)
+    try:
+        while not stop.is_set():
+            try:
+                r.cycle()
+            except Exception as e:  # stay resident; the next cycle retries
+                print(f"[WARN] refresh cycle failed: {type(e).__name__}: {e}", file=sys.stderr)
+            if args.once:
+                break
+            stop.wait(max(1.0, r.seconds_until_due()))
+    finally:
+        r.close()
+
+if __name__ == "__main__":
+    main()
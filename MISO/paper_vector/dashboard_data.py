@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Data layer for streamlit_app.py (pure pandas, no Streamlit imports).
+
+The heatmap is aggregated server-side before it reaches Altair: the selected
+date range is binned daily, weekly or monthly so that at most ~MAX_BINS
+columns are drawn per topic, whatever the window length. Each bin carries the
+mean and max score and the number of days it covers.
+"""
+from typing import Optional, Sequence
+import pandas as pd
+
+MAX_BINS = 120
+FREQ_LABELS = {"D": "daily", "W": "weekly", "M": "monthly"}
+
+def choose_freq(start, end, max_bins: int = MAX_BINS) -> str:
+    """Finest of D / W / M that keeps the range within max_bins columns."""
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    if days <= max_bins:
+        return "D"
+    if days / 7 <= max_bins:
+        return "W"
+    return "M"
+
+def bin_start(dates: pd.Series, freq: str) -> pd.Series:
+    """Left edge of each date's bin (weeks start on Monday, months on the 1st)."""
+    d = dates.dt.normalize()
+    if freq == "W":
+        return d - pd.to_timedelta(d.dt.dayofweek, unit="D")
+    if freq == "M":
+        return d - pd.to_timedelta(d.dt.day - 1, unit="D")
+    return d
+
+def select(df: pd.DataFrame, topics: Sequence[str], start=None, end=None) -> pd.DataFrame:
+    """Rows for topics within [start, end] (inclusive days)."""
+    mask = df["topic"].isin(list(topics)).to_numpy().copy()
+    if start is not None:
+        mask &= (df["date"] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (df["date"] <= pd.Timestamp(end)).to_numpy()
+    return df.loc[mask]
+
+def aggregate_heatmap(df: pd.DataFrame, topics: Sequence[str], start=None, end=None,
+                      freq: Optional[str] = None) -> pd.DataFrame:
+    """(topic, date, score, score_max, days) with one row per topic x bin."""
+    sub = select(df, topics, start, end)
+    if sub.empty:
+        return pd.DataFrame(columns=["topic","date","score","score_max","days"])
+    freq = freq or choose_freq(sub["date"].min(), sub["date"].max())
+    keyed = pd.DataFrame({"topic": sub["topic"].to_numpy(), "date": bin_start(sub["date"], freq).to_numpy(),
+                          "score": sub["score"].to_numpy(dtype=float)})
+    out = (keyed.groupby(["topic","date"], sort=True, observed=True)["score"]
+                .agg(score="mean", score_max="max", days="size")
+                .reset_index())
+    out[["score","score_max"]] = out[["score","score_max"]].round(2)
+    return out
+
+def trend_frame(df: pd.DataFrame, topic: str, start=None, end=None) -> pd.DataFrame:
+    return select(df, [topic], start, end)[["date","score"]].reset_index(drop=True)
+
+def watchlist(df: pd.DataFrame, topics: Sequence[str], n: int = 3) -> pd.DataFrame:
+    """Top-n topics by score on the latest day."""
+    sub = select(df, topics)
+    if sub.empty:
+        return pd.DataFrame(columns=["topic","score"])
+    today = sub["date"].max()
+    return (sub[sub["date"] == today].sort_values("score", ascending=False)
+               .head(n)[["topic","score"]].reset_index(drop=True))
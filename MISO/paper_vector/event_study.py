@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Event-study lead-time evaluation for topic_day scores.
+
+Given a table of labeled regulatory events (event_date, topic, name), measure
+for every event, topic and score threshold how many days before the event the
+momentum score first crossed the threshold (within --horizon days), plus hit
+and false-alarm rates. Everything is vectorized over (thresholds x events x
+horizon); the parameter grid (score weights, rolling windows) is spread over a
+process pool, each worker rebuilding scores from the raw topic_day counts.
+
+  python3 event_study.py --events regulatory_events.csv --workers 4
+"""
+import argparse, itertools, os, sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from features import COMMENT_WINDOW, EO_WINDOW, SCORE_WEIGHTS, rolling_sum, score_arrays, zscore_rows
+
+DEFAULT_THRESHOLDS = [10, 20, 30, 40, 50, 60, 70, 80, 90]
+DEFAULT_HORIZON = 180
+
+# ---- dense inputs ----
+def pivot_topic_day(df: pd.DataFrame, columns: Sequence[str]):
+    """topic_day long frame -> (topics, dates, {col: topics x days array})."""
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"]).dt.normalize()
+    topics = sorted(df["topic"].unique())
+    dates = pd.date_range(df["date"].min(), df["date"].max(), freq="D")
+    ti = pd.Index(topics).get_indexer(df["topic"])
+    di = dates.get_indexer(df["date"])
+    planes = {}
+    for c in columns:
+        a = np.zeros((len(topics), len(dates)))
+        if c in df.columns:
+            a[ti, di] = pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy()
+        planes[c] = a
+    return topics, dates, planes
+
+def check_event_topics(events: pd.DataFrame, topics: Sequence[str]) -> List[str]:
+    """
+    Event topics missing from topic_day (warned about: their events are
+    dropped). Raises ValueError when none of them are there.
+    """
+    wanted = sorted(events["topic"].dropna().unique())
+    missing = [t for t in wanted if t not in set(topics)]
+    if wanted and len(missing) == len(wanted):
+        raise ValueError(f"no event topic ({', '.join(wanted)}) is in topic_day (topics: {', '.join(sorted(topics))}); "
+                         "align the events' topics with lexicon.yaml")
+    if missing:
+        n = int(events["topic"].isin(missing).sum())
+        print(f"[WARN] {n} event(s) dropped, topic not in topic_day: {', '.join(missing)}", file=sys.stderr)
+    return missing
+
+def event_indices(events: pd.DataFrame, topics: List[str], dates: pd.DatetimeIndex):
+    """(topic idx, day idx) per event; events outside the grid are dropped."""
+    ev = events.copy()
+    ev["event_date"] = pd.to_datetime(ev["event_date"]).dt.normalize()
+    ti = pd.Index(topics).get_indexer(ev["topic"])
+    di = dates.get_indexer(ev["event_date"])
+    ok = (ti >= 0) & (di >= 0)
+    return ev[ok].reset_index(drop=True), ti[ok], di[ok]
+
+# ---- core evaluation ----
+def evaluate(score: np.ndarray, ev_t: np.ndarray, ev_d: np.ndarray,
+             thresholds: Sequence[float], horizon: int = DEFAULT_HORIZON) -> Dict[str, np.ndarray]:
+    """
+    score: topics x days. Returns per-threshold arrays:
+      lead    (K x E) days between first crossing in [event-horizon, event) and the event; NaN = miss
+      hit_rate, false_alarm_rate, alarms  (K,)
+    A false alarm is an upward crossing not followed by an event for that topic within horizon days.
+    """
+    thr = np.asarray(thresholds, dtype=float)
+    n_t, n_d = score.shape
+    # (E x H) window of day indices before each event; out-of-range days never cross
+    offs = np.arange(-horizon, 0)
+    idx = ev_d[:, None] + offs[None, :]
+    valid = idx >= 0
+    win = np.where(valid, score[ev_t[:, None], np.clip(idx, 0, n_d - 1)], -np.inf)
+    crossed = win[None, :, :] >= thr[:, None, None]             # K x E x H
+    any_cross = crossed.any(axis=2)
+    first = crossed.argmax(axis=2)
+    lead = np.where(any_cross, horizon - first, np.nan)
+
+    # upward crossings (alarm onsets) and whether an event follows within horizon
+    above = score[None, :, :] >= thr[:, None, None]              # K x T x D
+    onset = above & ~np.concatenate([np.zeros_like(above[:, :, :1]), above[:, :, :-1]], axis=2)
+    ev_mat = np.zeros((n_t, n_d))
+    np.add.at(ev_mat, (ev_t, ev_d), 1)
+    cs = np.concatenate([np.zeros((n_t, 1)), np.cumsum(ev_mat, axis=1)], axis=1)
+    d = np.arange(n_d)
+    upcoming = cs[:, np.minimum(d + horizon, n_d)] - cs[:, d + 1]  # events in (d, d+horizon]
+    false = onset & (upcoming[None, :, :] == 0)
+    alarms = onset.sum(axis=(1, 2))
+    n_ev = max(len(ev_t), 1)
+    return {
+        "lead": lead,
+        "hit_rate": any_cross.sum(axis=1) / n_ev,
+        "false_alarm_rate": np.where(alarms > 0, false.sum(axis=(1, 2)) / np.maximum(alarms, 1), np.nan),
+        "alarms": alarms,
+    }
+
+def rescore(planes: Dict[str, np.ndarray], weights: Dict[str, float],
+            comment_window: int, eo_window: int) -> np.ndarray:
+    """Rebuild the score plane from raw topic_day counts for one parameter set."""
+    f = dict(planes)
+    f["comment_rate_14d"] = rolling_sum(planes["fr_notice_count"], comment_window)
+    f["eo_hits_45d"] = rolling_sum(planes["wh_hits"], eo_window)
+    f["z_fr_notice"] = zscore_rows(f["fr_notice_count"])
+    f["z_comment_rate"] = zscore_rows(f["comment_rate_14d"])
+    return score_arrays(f, weights)
+
+# ---- parameter grid on a process pool ----
+RAW_COLUMNS = ["fr_notice_count", "under_review_count", "econ_significant_flag", "wh_hits", "agency_diversity"]
+_W: Dict = {}
+
+def _init_worker(planes, ev_t, ev_d, thresholds, horizon):
+    _W.update(planes=planes, ev_t=ev_t, ev_d=ev_d, thresholds=thresholds, horizon=horizon)
+
+def _run_config(cfg: Dict) -> List[Dict]:
+    score = rescore(_W["planes"], cfg["weights"], cfg["comment_window"], cfg["eo_window"])
+    res = evaluate(score, _W["ev_t"], _W["ev_d"], _W["thresholds"], _W["horizon"])
+    rows = []
+    for k, thr in enumerate(_W["thresholds"]):
+        lead = res["lead"][k]
+        rows.append({
+            "config": cfg["id"],
+            "comment_window": cfg["comment_window"],
+            "eo_window": cfg["eo_window"],
+            **{f"w_{name}": w for name, w in cfg["weights"].items()},
+            "threshold": thr,
+            "hit_rate": res["hit_rate"][k],
+            "false_alarm_rate": res["false_alarm_rate"][k],
+            "alarms": int(res["alarms"][k]),
+            "median_lead_days": float(np.nanmedian(lead)) if np.isfinite(lead).any() else np.nan,
+            "mean_lead_days": float(np.nanmean(lead)) if np.isfinite(lead).any() else np.nan,
+        })
+    return rows
+
+def default_grid() -> List[Dict]:
+    grid = []
+    for i, (cw, ew, wc, we) in enumerate(itertools.product([7, COMMENT_WINDOW, 28], [30, EO_WINDOW, 90],
+                                                             [15, SCORE_WEIGHTS["z_comment_rate"], 35],
+                                                             [5, SCORE_WEIGHTS["eo_hits_45d"], 25])):
+        w = dict(SCORE_WEIGHTS, z_comment_rate=wc, eo_hits_45d=we)
+        grid.append({"id": i, "comment_window": cw, "eo_window": ew, "weights": w})
+    return grid
+
+def run_grid(topic_day: pd.DataFrame, events: pd.DataFrame, grid: Optional[List[Dict]] = None,
+             thresholds: Sequence[float] = DEFAULT_THRESHOLDS, horizon: int = DEFAULT_HORIZON,
+             workers: Optional[int] = None) -> pd.DataFrame:
+    topics, dates, planes = pivot_topic_day(topic_day, RAW_COLUMNS)
+    ev, ev_t, ev_d = event_indices(events, topics, dates)
+    grid = grid or default_grid()
+    args = (planes, ev_t, ev_d, list(thresholds), horizon)
+    if workers == 1:
+        _init_worker(*args)
+        chunks = [_run_config(cfg) for cfg in grid]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=args) as ex:
+            chunks = list(ex.map(_run_config, grid, chunksize=max(1, len(grid) // (4 * (workers or os.cpu_count() or 1)))))
+    out = pd.DataFrame([r for rows in chunks for r in rows])
+    out["n_events"] = len(ev)
+    return out
+
+def event_leads(topic_day: pd.DataFrame, events: pd.DataFrame,
+                thresholds: Sequence[float] = DEFAULT_THRESHOLDS, horizon: int = DEFAULT_HORIZON) -> pd.DataFrame:
+    """Per-event lead days for the scores as written in topic_day (no rescoring)."""
+    topics, dates, planes = pivot_topic_day(topic_day, ["score"])
+    ev, ev_t, ev_d = event_indices(events, topics, dates)
+    res = evaluate(planes["score"], ev_t, ev_d, thresholds, horizon)
+    leads = pd.DataFrame(res["lead"].T, columns=[f"lead_at_{t:g}" for t in thresholds])
+    return pd.concat([ev, leads], axis=1)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--topic-day", default="topic_day.csv")
+    ap.add_argument("--events", default="regulatory_events.csv", help="CSV with event_date, topic[, name]")
+    ap.add_argument("--thresholds", type=float, nargs="*", default=DEFAULT_THRESHOLDS)
+    ap.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="Days before an event to look for a crossing")
+    ap.add_argument("--workers", type=int, default=None, help="Process pool size (1 = run inline)")
+    ap.add_argument("--out", default="event_study.csv")
+    ap.add_argument("--leads-out", default="event_leads.csv", help="Per-event lead days at the stored score")
+    args = ap.parse_args()
+
+    topic_day = pd.read_csv(args.topic_day)
+    events = pd.read_csv(args.events)
+    try:
+        check_event_topics(events, topic_day["topic"].unique())
+    except ValueError as e:
+        print(f"[ERR] {e}", file=sys.stderr)
+        sys.exit(2)
+    event_leads(topic_day, events, args.thresholds, args.horizon).to_csv(args.leads_out, index=False)
+    res = run_grid(topic_day, events, thresholds=args.thresholds, horizon=args.horizon, workers=args.workers)
+    res.to_csv(args.out, index=False)
+    best = res.sort_values(["hit_rate", "false_alarm_rate", "median_lead_days"], ascending=[False, True, False]).head(5)
+    print(f"[OK] wrote {args.out} ({res['config'].nunique()} configs x {len(args.thresholds)} thresholds) and {args.leads_out}")
+    print(best[["config","comment_window","eo_window","threshold","hit_rate","false_alarm_rate","median_lead_days"]].to_string(index=False))
+
+if __name__ == "__main__":
+    main()
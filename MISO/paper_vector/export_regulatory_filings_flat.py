@@ -1,66 +1,29 @@
 #!/usr/bin/env python3
-import os, sys, time, argparse, re, string
-from typing import List, Dict
+import os, argparse, re, string
+from typing import List, Dict, Tuple
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlencode, quote_plus
-from io import StringIO
+from fetch import DEFAULT_CONCURRENCY, DEFAULT_RATE, configure as configure_fetch
+from lexicon import all_keywords, load_lexicon
+from matcher import compile_keywords
+from fr_store import FRStore
+from ingest import CACHE_DIR, fetch_documents, load_documents
+from storage import write_dataset
+from instrument import add_profile_argument, finish_profile, span, start_profile
 
-CACHE_DIR = "./cache"
-os.makedirs(CACHE_DIR, exist_ok=True)
+DEFAULT_AGENCY_PATTERN = "Department of Energy|Energy Department|DOE|ARPA-E|Loan Programs Office|Office of Electricity|Fossil Energy and Carbon Management|EERE"
 
-def load_lexicon(path: str = "lexicon.yaml") -> Dict[str, List[str]]:
-    import yaml
-    with open(path, "r") as f:
-        raw = yaml.safe_load(f)
-    return {k: [s.lower() for s in v.get("include", [])] for k, v in raw.items()}
-
-def all_keywords(lex: Dict[str, List[str]]) -> List[str]:
-    return sorted({kw for kws in lex.values() for kw in kws})
-
-# put this REPLACEMENT in place of your current keyword_count_in_title()
 def keyword_count_in_title(title: str, keywords: List[str]) -> int:
     """
-    Count UNIQUE keyword hits in the title using boundary-aware regex:
+    Count UNIQUE keyword hits in the title (see matcher.py for the rules):
     - treats 'data center' ~ 'data-center'
     - handles simple plurals ('procedure' ~ 'procedures', 'agreement' ~ 'agreements')
     - punctuation/extra spaces in title are ignored
+    The keyword list is compiled once and memoized, not per title.
     """
     if not title:
         return 0
-
-    text = title.lower()
-    # normalize punctuation to spaces for safer word-boundary matches
-    text = re.sub(r"[^\w\s\-]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    hits = set()
-    for kw in keywords:
-        if not kw:
-            continue
-        k = kw.lower().strip()
-        # allow space OR hyphen between words: "data[ -]?center"
-        k = re.sub(r"\s+", r"[\\s\\-]?", k)
-        # simple plural support: (s|es)? on last token
-        # e.g. "procedure(s|es)?", "agreement(s|es)?"
-        if " " in kw or "-" in kw:
-            # multiword: let the final token pluralize
-            parts = re.split(r"[ \-]+", kw.strip().lower())
-            if parts:
-                last = re.escape(parts[-1])
-                tail_plural = rf"(?:s|es)?"
-                k = re.sub(rf"{re.escape(parts[-1])}$", last + tail_plural, re.escape(" ".join(parts)))
-                k = re.sub(r"\s+", r"[\\s\\-]?", k)
-        else:
-            # single word plural
-            k = re.escape(kw.lower().strip()) + r"(?:s|es)?"
-
-        pattern = rf"\b{k}\b"
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            hits.add(kw)
-
-    return len(hits)
+    return compile_keywords(tuple(keywords)).keyword_count(title)
 
 
 def fmt_us_date(d: pd.Timestamp) -> str:
@@ -78,234 +41,128 @@ def compile_agency_matcher(pattern: str):
     """
     pattern: pipe-separated terms, e.g.
       "Department of Energy|Energy Department|DOE|ARPA-E|Loan Programs Office|Office of Electricity|Fossil Energy and Carbon Management|EERE"
-    Normalizes both sides and does substring match.
+    Normalizes both sides and does substring match. Decisions are memoized per
+    distinct raw string (see AgencyDimension).
     """
-    terms = [_norm(t) for t in (pattern.split("|") if pattern else []) if t.strip()]
-    if not terms:
-        return lambda s: True
-    def _match(s: str) -> bool:
-        ns = _norm(s)
-        return any(t in ns for t in terms)
-    return _match
-
-# ---------------- sources ----------------
-def pull_federal_register(keywords: List[str], days: int = 365) -> pd.DataFrame:
-    base = "https://www.federalregister.gov/api/v1/documents.json"
-    start_date = (pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)).date().isoformat()
-    params = {"per_page": 250, "order": "newest", "conditions[publication_date][gte]": start_date}
-    rows, seen_ids = [], set()
-    for kw in keywords:
-        q = params.copy()
-        if " " in kw: kw = f'"{kw}"'
-        q["conditions[term]"] = kw
-        url = f"{base}?{urlencode(q, quote_via=quote_plus)}"
-        try:
-            r = requests.get(url, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            for d in data.get("results", []):
-                doc_id = d.get("document_number")
-                if doc_id in seen_ids: 
-                    continue
-                seen_ids.add(doc_id)
-                rows.append({
-                    "source": "FR",
-                    "id": doc_id,
-                    "title": d.get("title"),
-                    # Join all agency names; FR often returns "Energy Department; Office of ...".
-                    "agencies": ", ".join([a.get("name","") for a in d.get("agencies", [])]) if d.get("agencies") else "",
-                    "publication_date": d.get("publication_date"),
-                    "type": d.get("type"),
-                    "html_url": d.get("html_url"),
-                })
-            time.sleep(0.25)
-        except Exception as e:
-            print("[WARN] FR fetch failed for", kw, "->", e, file=sys.stderr)
-            continue
-    return pd.DataFrame(rows)
-
-def pull_oira_under_review(days: int = 365) -> pd.DataFrame:
-    url = "https://www.reginfo.gov/public/do/eoReviewSearch"
-    try:
-        html = requests.get(url, timeout=30).text
-        tables = pd.read_html(StringIO(html))
-    except Exception as e:
-        print("[WARN] Could not parse OIRA page:", e, file=sys.stderr)
-        return pd.DataFrame()
-    frames = []
-    for t in tables:
-        cols = [str(c).lower() for c in t.columns]
-        if any("agency" in c for c in cols) and any("received" in c for c in cols):
-            df = t.copy()
-            df.columns = [str(c).strip().lower() for c in df.columns]
-            if "received" in df.columns:
-                df["received"] = pd.to_datetime(df["received"], errors="coerce")
-            cutoff = pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)
-            df = df[df["received"] >= cutoff]
-            out = pd.DataFrame({
-                "source": "OIRA",
-                "title": df.get("title", df.get("subject")),
-                "agency": df.get("agency"),
-                "date": df["received"]
-            })
-            frames.append(out)
-    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
-
-def pull_unified_agenda_xml() -> pd.DataFrame:
-    index_url = "https://www.reginfo.gov/public/do/eAgendaXmlReport"
-    try:
-        html = requests.get(index_url, timeout=30).text
-        soup = BeautifulSoup(html, "html.parser")
-        links = [a.get("href") for a in soup.find_all("a") if a.get("href","").lower().endswith(".xml")]
-        links = links[:5]
-        rows = []
-        for link in links:
-            link = link if link.startswith("http") else ("https://www.reginfo.gov" + link)
-            try:
-                xml = requests.get(link, timeout=30).text
-                for m in re.finditer(r"<Title>(.*?)</Title>.*?<Agency>(.*?)</Agency>", xml, re.S):
-                    title = BeautifulSoup(m.group(1), "xml").text
-                    agency = BeautifulSoup(m.group(2), "xml").text
-                    rows.append({
-                        "source": "UA",
-                        "title": title,
-                        "agency": agency,
-                        "date": pd.Timestamp.utcnow().normalize()
-                    })
-            except Exception as e:
-                print("[WARN] UA subfetch failed:", e, file=sys.stderr)
-        return pd.DataFrame(rows)
-    except Exception as e:
-        print("[WARN] UA index fetch failed:", e, file=sys.stderr)
-        return pd.DataFrame()
+    return AgencyDimension(pattern).matches
 
-def pull_whitehouse(days: int = 365) -> pd.DataFrame:
-    pages = [
-        "https://www.whitehouse.gov/presidential-actions/executive-orders/",
-        "https://www.whitehouse.gov/briefings-statements/",
-        "https://www.whitehouse.gov/presidential-actions/"
-    ]
-    rows = []
-    cutoff = (pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)).date()
-    for url in pages:
-        try:
-            html = requests.get(url, timeout=30).text
-            soup = BeautifulSoup(html, "html.parser")
-            for item in soup.find_all(["article","li","div","a"]):
-                text = item.get_text(" ", strip=True)
-                if not text or len(text) < 20: 
-                    continue
-                m = re.search(r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}", text)
-                if not m: 
-                    continue
-                d = pd.to_datetime(m.group(0), errors="coerce")
-                if pd.notna(d) and d.date() >= cutoff:
-                    rows.append({
-                        "source": "WH",
-                        "title": text[:200],
-                        "agency": "White House",
-                        "date": d.normalize()
-                    })
-        except Exception as e:
-            print("[WARN] WhiteHouse scrape failed for", url, "->", e, file=sys.stderr)
-    return pd.DataFrame(rows)
+class AgencyDimension:
+    """
+    Agency strings are tiny-cardinality next to filings, so each distinct raw
+    string is normalized and matched once; filings then carry an integer code.
+      dim = AgencyDimension(pattern)
+      ok = dim.match_mask(series)     # bool array, one lookup per row
+      cat = dim.encode(series)        # pandas Categorical
+    """
+    def __init__(self, pattern: str):
+        self.terms = [_norm(t) for t in (pattern.split("|") if pattern else []) if t.strip()]
+        self._decisions: Dict[str, bool] = {}
+
+    def matches(self, s: str) -> bool:
+        s = s if isinstance(s, str) else ""
+        hit = self._decisions.get(s)
+        if hit is None:
+            ns = _norm(s)
+            hit = self._decisions[s] = (not self.terms) or any(t in ns for t in self.terms)
+        return hit
+
+    def encode(self, s: pd.Series) -> pd.Categorical:
+        return pd.Categorical(pd.Series(s).fillna("").astype(str))
+
+    def match_mask(self, s: pd.Series) -> np.ndarray:
+        cat = self.encode(s)
+        ok = np.fromiter((self.matches(c) for c in cat.categories), dtype=bool, count=len(cat.categories))
+        return ok[cat.codes] if len(ok) else np.zeros(len(cat), dtype=bool)
+
+# ---------------- source adapters ----------------
+# Every source is mapped onto one typed frame; filtering, keyword counting,
+# dedupe and sorting then run once over the concatenation.
+NORMAL_COLUMNS = ["date", "agency", "agency_primary", "agency_full", "title", "source"]
+FLAT_COLUMNS = ["date", "agency", "filing_title", "keyword_count"]
+
+def _empty_normal() -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "date" else object) for c in NORMAL_COLUMNS})
+
+def _to_day(values) -> pd.Series:
+    d = pd.to_datetime(pd.Series(values), errors="coerce", utc=True)
+    return d.dt.tz_convert(None).dt.normalize()
+
+def _col(df: pd.DataFrame, name: str) -> pd.Series:
+    return df[name] if name in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+
+def adapt_fr(df: pd.DataFrame) -> pd.DataFrame:
+    full = _col(df, "agencies").fillna("").astype(str)
+    # primary agency is helpful but we check the whole string too
+    primary = full.str.split(",").str[0].str.strip()
+    return pd.DataFrame({
+        "date": _to_day(_col(df, "publication_date").to_numpy()).to_numpy(),
+        "agency": primary.where(primary != "", full).replace("", "Federal Register").to_numpy(),
+        "agency_primary": primary.to_numpy(),
+        "agency_full": full.to_numpy(),
+        "title": _col(df, "title").to_numpy(),
+        "source": "FR",
+    })
+
+def _adapt_simple(source: str, fallback: str, date_col: str = "date"):
+    def adapt(df: pd.DataFrame) -> pd.DataFrame:
+        ag = _col(df, "agency").fillna("").astype(str)
+        return pd.DataFrame({
+            "date": _to_day(_col(df, date_col).to_numpy()).to_numpy(),
+            "agency": ag.replace("", fallback).to_numpy(),
+            "agency_primary": ag.to_numpy(),
+            "agency_full": ag.to_numpy(),
+            "title": _col(df, "title").to_numpy(),
+            "source": source,
+        })
+    return adapt
+
+SOURCE_ADAPTERS = {
+    "FR": adapt_fr,
+    "OIRA": _adapt_simple("OIRA", "OIRA", date_col="received"),
+    "UA": _adapt_simple("UA", "Unified Agenda"),
+    "WH": _adapt_simple("WH", "White House"),
+}
+
+def normalize_sources(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    parts = [SOURCE_ADAPTERS[name](df) for name, df in frames.items() if df is not None and not df.empty]
+    return pd.concat(parts, ignore_index=True) if parts else _empty_normal()
+
+def fmt_us_dates(d: pd.Series) -> pd.Series:
+    """Vectorized fmt_us_date: M/D/YYYY without zero padding."""
+    return d.dt.month.astype(str) + "/" + d.dt.day.astype(str) + "/" + d.dt.year.astype(str)
 
 # ---------------- flat CSV assembler (with debug) ----------------
-def build_flat_csv(days: int, out_path: str, lex_path: str, agency_pattern: str, debug: bool) -> None:
-    lex = load_lexicon(lex_path)
-    kws = all_keywords(lex)
-    agency_ok = compile_agency_matcher(agency_pattern)
-
-    fr_df = pull_federal_register(kws, days=days)
-    oira_df = pull_oira_under_review(days=days)
-    ua_df = pull_unified_agenda_xml()
-    wh_df = pull_whitehouse(days=days)
-
-    rows = []
-    unmatched = []
-
-    # FR
-    if not fr_df.empty:
-        for _, r in fr_df.iterrows():
-            d = pd.to_datetime(r.get("publication_date"), errors="coerce")
-            if pd.isna(d): 
-                continue
-            agencies_full = r.get("agencies") or ""
-            # primary agency is helpful but we check the whole string too
-            primary_agency = (agencies_full.split(",")[0].strip() if agencies_full else "")
-            if not agency_ok(primary_agency) and not agency_ok(agencies_full):
-                if debug: unmatched.append(agencies_full)
-                continue
-            title = r.get("title", "")
-            rows.append({
-                "date": fmt_us_date(d.to_pydatetime()),
-                "agency": primary_agency or agencies_full or "Federal Register",
-                "filing_title": title,
-                "keyword_count": keyword_count_in_title(title, kws)
-            })
-
-    # OIRA
-    if oira_df is not None and not oira_df.empty:
-        for _, r in oira_df.iterrows():
-            ag = r.get("agency") or ""
-            if not agency_ok(ag):
-                if debug: unmatched.append(ag)
-                continue
-            d = pd.to_datetime(r.get("date"), errors="coerce")
-            if pd.isna(d): 
-                continue
-            title = r.get("title", "")
-            rows.append({
-                "date": fmt_us_date(d.to_pydatetime()),
-                "agency": ag or "OIRA",
-                "filing_title": title,
-                "keyword_count": keyword_count_in_title(title, kws)
-            })
-
-    # UA
-    if ua_df is not None and not ua_df.empty:
-        for _, r in ua_df.iterrows():
-            ag = r.get("agency") or ""
-            if not agency_ok(ag):
-                if debug: unmatched.append(ag)
-                continue
-            d = pd.to_datetime(r.get("date"), errors="coerce")
-            if pd.isna(d): 
-                continue
-            title = r.get("title", "")
-            rows.append({
-                "date": fmt_us_date(d.to_pydatetime()),
-                "agency": ag or "Unified Agenda",
-                "filing_title": title,
-                "keyword_count": keyword_count_in_title(title, kws)
-            })
-
-    # WH
-    if wh_df is not None and not wh_df.empty:
-        for _, r in wh_df.iterrows():
-            ag = r.get("agency") or ""
-            if not agency_ok(ag):
-                if debug: unmatched.append(ag)
-                continue
-            d = pd.to_datetime(r.get("date"), errors="coerce")
-            if pd.isna(d): 
-                continue
-            title = r.get("title", "")
-            rows.append({
-                "date": fmt_us_date(d.to_pydatetime()),
-                "agency": ag or "White House",
-                "filing_title": title,
-                "keyword_count": keyword_count_in_title(title, kws)
-            })
-
-    flat = pd.DataFrame(rows, columns=["date","agency","filing_title","keyword_count"])
-    flat = flat.dropna(subset=["date","filing_title"]).drop_duplicates()
-    try:
-        flat["_d"] = pd.to_datetime(flat["date"])
-        flat = flat.sort_values(["_d","agency"]).drop(columns=["_d"])
-    except Exception:
-        pass
-    flat.to_csv(out_path, index=False)
+def assemble_flat(normal: pd.DataFrame, matcher, agencies: AgencyDimension) -> Tuple[pd.DataFrame, List[str]]:
+    """Filter / count / dedupe / sort the normalized frame. Returns (flat, unmatched agency strings)."""
+    ok = pd.Series(agencies.match_mask(normal["agency_primary"]) | agencies.match_mask(normal["agency_full"]),
+                   index=normal.index)
+    unmatched = normal.loc[~ok, "agency_full"].tolist()
+    df = normal[ok & normal["date"].notna()]
+    df = df[df["title"].notna()]
+    flat = pd.DataFrame({
+        "date": fmt_us_dates(df["date"]),
+        "agency": agencies.encode(df["agency"]),
+        "filing_title": df["title"],
+        "keyword_count": matcher.keyword_counts(df["title"]),
+        "_d": df["date"],
+    })
+    flat = flat.drop_duplicates(subset=FLAT_COLUMNS)
+    flat = flat.sort_values(["_d", "agency"], kind="stable").drop(columns=["_d"])
+    return flat.reset_index(drop=True), unmatched
+
+def write_flat(frames: Dict[str, pd.DataFrame], kws: List[str], out_path: str,
+               agency_pattern: str = DEFAULT_AGENCY_PATTERN, debug: bool = False) -> pd.DataFrame:
+    """Derive and write filings_flat from source frames (ingest.fetch_documents / load_documents)."""
+    agencies = AgencyDimension(agency_pattern)
+    with span("normalize", rows_in=sum(len(f) for f in frames.values())) as s:
+        normal = normalize_sources(frames)
+        s.rows(out=len(normal))
+    with span("assemble", rows_in=len(normal)) as s:
+        flat, unmatched = assemble_flat(normal, compile_keywords(tuple(kws)), agencies)
+        s.rows(out=len(flat))
+    with span("write", rows_in=len(flat)):
+        flat.to_csv(out_path, index=False)
+        write_dataset(flat, "filings_flat")
     print(f"[OK] wrote {out_path} with {len(flat)} rows")
 
     if debug and (flat.empty or len(unmatched) > 0):
@@ -314,6 +171,20 @@ def build_flat_csv(days: int, out_path: str, lex_path: str, agency_pattern: str,
             print("[DEBUG] Example unmatched agency strings (first 15):")
             for s in sample:
                 print("  -", s)
+    return flat
+
+def build_flat_csv(days: int, out_path: str, lex_path: str, agency_pattern: str, debug: bool,
+                   fr_store: FRStore = None, full_resync: bool = False,
+                   concurrency: int = None, rate: float = None, budget: float = None,
+                   from_raw: bool = False) -> None:
+    kws = all_keywords(load_lexicon(lex_path))
+    if from_raw:
+        with span("load.raw") as s:
+            frames = load_documents()
+            s.rows(out=sum(len(f) for f in frames.values()))
+    else:
+        frames, _ = fetch_documents(kws, days, fr_store, full_resync, concurrency=concurrency, rate=rate, budget=budget)
+    write_flat(frames, kws, out_path, agency_pattern, debug)
 
 def main():
     ap = argparse.ArgumentParser()
@@ -321,11 +192,35 @@ def main():
     ap.add_argument("--out", type=str, default="filings_flat.csv")
     ap.add_argument("--lexicon", type=str, default="lexicon.yaml")
     ap.add_argument("--agency", type=str,
-        default="Department of Energy|Energy Department|DOE|ARPA-E|Loan Programs Office|Office of Electricity|Fossil Energy and Carbon Management|EERE",
+        default=DEFAULT_AGENCY_PATTERN,
         help="Pipe-separated terms for case-insensitive matching")
     ap.add_argument("--debug", action="store_true", help="Print sample of unmatched agency strings")
+    ap.add_argument("--concurrency", type=int, default=None,
+                    help="Parallel HTTP requests per source (default: per-source limits in fanout.py)")
+    ap.add_argument("--rate", type=float, default=None,
+                    help="Max requests/second per source (default: per-source limits in fanout.py)")
+    ap.add_argument("--budget", type=float, default=None,
+                    help="Wall-clock seconds allowed per source pull (default: per-source budgets in fanout.py)")
+    ap.add_argument("--offline", action="store_true", help="Replay responses from the cache only (no network)")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the on-disk response cache")
+    ap.add_argument("--cache-max-mb", type=int, default=512, help="LRU size bound for the response cache")
+    ap.add_argument("--full-resync", action="store_true", help="Ignore FR watermarks and re-pull the whole window")
+    ap.add_argument("--from-raw", action="store_true",
+                    help="Build from the documents stored by the last score.py / export run instead of fetching")
+    add_profile_argument(ap)
     args = ap.parse_args()
-    build_flat_csv(days=args.days, out_path=args.out, lex_path=args.lexicon, agency_pattern=args.agency, debug=args.debug)
+    start_profile(args.profile)
+    configure_fetch(concurrency=args.concurrency or DEFAULT_CONCURRENCY,
+                    rate=args.rate if args.rate is not None else DEFAULT_RATE,
+                    cache_dir=None if args.no_cache else CACHE_DIR,
+                    offline=args.offline, cache_max_mb=args.cache_max_mb)
+    fr_store = None if args.no_cache else FRStore(os.path.join(CACHE_DIR, "fr_store"))
+    try:
+        build_flat_csv(days=args.days, out_path=args.out, lex_path=args.lexicon, agency_pattern=args.agency, debug=args.debug,
+                       fr_store=fr_store, full_resync=args.full_resync,
+                       concurrency=args.concurrency, rate=args.rate, budget=args.budget, from_raw=args.from_raw)
+    finally:
+        finish_profile(args.profile)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Concurrent source pull stage.
+
+FR, OIRA, Unified Agenda and White House live on independent hosts, so the
+four pulls run side by side, each on its own FetchEngine (own session, rate
+limit and per-request timeout, shared response cache) and with its own wall
+time budget. Once a source's budget is spent its engine stops issuing
+requests (fetch.BudgetExceeded) and the stage moves on with an empty frame
+for it, so end-to-end time is bounded by the slowest source / largest
+budget instead of the sum of all four.
+
+  frames, status = fan_out([Source("FR", pull_fr, FR_COLUMNS), ...])
+  status["FR"] -> {"status": "ok", "rows": 1724, "seconds": 12.3, "error": None}
+
+status is ok / partial (budget ran out but the pull returned what it had) /
+timeout / error.
+"""
+import sys, time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from fetch import BudgetExceeded, FetchEngine, default_engine
+from instrument import count
+
+# per-source engine settings; budget = wall seconds for the whole pull
+SOURCE_LIMITS: Dict[str, Dict] = {
+    "FR":   {"concurrency": 8, "rate": 8.0, "timeout": 30, "budget": 600},
+    "OIRA": {"concurrency": 2, "rate": 2.0, "timeout": 30, "budget": 120},
+    "UA":   {"concurrency": 4, "rate": 4.0, "timeout": 120, "budget": 900},
+    "WH":   {"concurrency": 4, "rate": 4.0, "timeout": 30, "budget": 300},
+}
+
+class Source:
+    """One pull: `pull(engine) -> DataFrame`, plus the columns to use when it fails."""
+    def __init__(self, name: str, pull: Callable[[FetchEngine], pd.DataFrame], columns: Sequence[str],
+                 concurrency: Optional[int] = None, rate: Optional[float] = None,
+                 timeout: Optional[int] = None, budget: Optional[float] = None):
+        limits = SOURCE_LIMITS.get(name, {})
+        self.name = name
+        self.pull = pull
+        self.columns = list(columns)
+        self.concurrency = concurrency or limits.get("concurrency", 4)
+        self.rate = rate if rate is not None else limits.get("rate", 4.0)
+        self.timeout = timeout or limits.get("timeout", 30)
+        self.budget = budget or limits.get("budget", 300)
+
+def source_engines(sources: List[Source], base: Optional[FetchEngine] = None, concurrency: Optional[int] = None,
+                   rate: Optional[float] = None) -> Dict[str, FetchEngine]:
+    """One child engine per source (own session and rate limit, shared cache)."""
+    base = base or default_engine()
+    return {src.name: base.child(concurrency=concurrency or src.concurrency,
+                                 rate=rate if rate is not None else src.rate, timeout=src.timeout)
+            for src in sources}
+
+def _run(src: Source, engine: FetchEngine, close: bool) -> Tuple[pd.DataFrame, float, bool]:
+    """(frame, seconds, expired); pulls that swallow per-item errors may return partial frames."""
+    t0 = time.perf_counter()
+    try:
+        df = src.pull(engine)
+        return df, time.perf_counter() - t0, time.monotonic() >= engine.deadline
+    finally:
+        if close:
+            engine.close()
+
+def fan_out(sources: List[Source], base: Optional[FetchEngine] = None,
+            concurrency: Optional[int] = None, rate: Optional[float] = None,
+            budget: Optional[float] = None,
+            engines: Optional[Dict[str, FetchEngine]] = None) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict]]:
+    """
+    Run every source concurrently. concurrency / rate / budget, when given,
+    override each source's own limits. Returns (frames, status); a failed or
+    timed-out source yields an empty frame with its columns.
+    engines: long-lived per-source engines (source_engines) to reuse and keep
+    open, e.g. in daemon.py; by default fresh ones are made and closed.
+    """
+    own = engines is None
+    if own:
+        engines = source_engines(sources, base, concurrency, rate)
+    t0 = time.monotonic()
+    ex = ThreadPoolExecutor(max_workers=max(1, len(sources)), thread_name_prefix="source")
+    futures = {}
+    for src in sources:
+        b = budget or src.budget
+        engine = engines[src.name]
+        engine.deadline = t0 + b
+        futures[src.name] = (src, b, ex.submit(_run, src, engine, own))
+
+    frames, status = {}, {}
+    for name, (src, b, fut) in futures.items():
+        st = {"status": "ok", "rows": 0, "seconds": None, "error": None}
+        try:
+            df, secs, expired = fut.result(timeout=max(0.0, t0 + b - time.monotonic()))
+            st.update(rows=len(df), seconds=round(secs, 3))
+            if expired:
+                st.update(status="partial", error=f"budget {b:g}s exceeded")
+        except (FutureTimeout, BudgetExceeded):
+            df = None
+            st.update(status="timeout", seconds=round(time.monotonic() - t0, 3), error=f"budget {b:g}s exceeded")
+        except Exception as e:
+            df = None
+            st.update(status="error", seconds=round(time.monotonic() - t0, 3), error=f"{type(e).__name__}: {e}")
+        frames[name] = df if df is not None else pd.DataFrame(columns=src.columns)
+        status[name] = st
+        count(f"rows.{name}", st["rows"])
+        count(f"seconds.{name}", st["seconds"] or 0)
+        if st["status"] != "ok":
+            print(f"[WARN] {name} pull {st['status']}: {st['error']} (continuing with {st['rows']} rows)", file=sys.stderr)
+    # a timed-out pull stops at its next request (engine deadline); don't block on it
+    ex.shutdown(wait=False, cancel_futures=True)
+    return frames, status
+
+def format_status(status: Dict[str, Dict]) -> str:
+    return "  ".join(f"{n}={s['status']}({s['rows']} rows, {s['seconds']}s)" for n, s in status.items())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Dense topic x day feature engine for score.py.
+
+Labeled events are scattered once into a (sources x topics x days) count
+cube; rolling windows are cumulative-sum differences along the day axis and
+z-scores are axis reductions, so there is no per-topic Python at all.
+Output columns/order match the old MultiIndex + merge + rolling-transform
+implementation (topic_day.csv).
+"""
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+SOURCES = ["FR", "OIRA", "UA", "WH"]
+# FR documents whose body text mentions a topic / of those, ones whose title doesn't (fr_text.py)
+BODY_SOURCES = ["FR_BODY", "FR_BODY_ONLY"]
+CUBE_SOURCES = SOURCES + BODY_SOURCES
+COMMENT_WINDOW = 14
+EO_WINDOW = 45
+SCORE_WEIGHTS: Dict[str, float] = {
+    "z_fr_notice": 20,
+    "z_comment_rate": 25,
+    "under_review_count": 15,
+    "econ_significant_flag": 10,
+    "eo_hits_45d": 15,
+    "agency_diversity": 5,
+}
+PRE_SCORE_COLUMNS = ["topic","date","fr_notice_count","comment_rate_14d",
+                     "under_review_count","econ_significant_flag",
+                     "wh_hits","eo_hits_45d","agency_diversity"]
+BODY_COLUMNS = ["fr_body_count","fr_body_only_count"]  # zero unless score.py --fr-text; not scored
+TOPIC_DAY_COLUMNS = PRE_SCORE_COLUMNS + ["z_fr_notice","z_comment_rate","score"] + BODY_COLUMNS
+
+def count_cube(events: pd.DataFrame, topics: Sequence[str], dates: pd.DatetimeIndex,
+               sources: Sequence[str] = CUBE_SOURCES) -> np.ndarray:
+    """(sources x topics x days) float array of event counts. Events outside the grid are dropped."""
+    cube = np.zeros((len(sources), len(topics), len(dates)), dtype=np.float64)
+    if events is None or events.empty:
+        return cube
+    s = pd.Index(sources).get_indexer(events["source"])
+    t = pd.Index(topics).get_indexer(events["topic"])
+    d = dates.get_indexer(pd.to_datetime(events["date"]).dt.normalize())
+    ok = (s >= 0) & (t >= 0) & (d >= 0)
+    np.add.at(cube, (s[ok], t[ok], d[ok]), 1.0)
+    return cube
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing window sum along the last axis (min_periods=1), via cumsum differences."""
+    c = np.cumsum(x, axis=-1)
+    out = c.copy()
+    if window < x.shape[-1]:
+        out[..., window:] -= c[..., :-window]
+    return out
+
+def zscore_rows(x: np.ndarray) -> np.ndarray:
+    """Per-row (topic) z-score along the day axis, ddof=0; flat rows -> 0."""
+    mu = x.mean(axis=-1, keepdims=True)
+    sd = x.std(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x - mu) / sd
+    return np.where(sd > 0, z, 0.0)
+
+def score_arrays(f: Dict[str, np.ndarray], weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    weights = weights or SCORE_WEIGHTS
+    total = sum(w * np.nan_to_num(f[k]) for k, w in weights.items())
+    return np.clip(total, 0, 100)
+
+def base_planes(cube: np.ndarray, sources: Sequence[str] = CUBE_SOURCES) -> Dict[str, np.ndarray]:
+    """Feature planes before z-scoring."""
+    src = {name: i for i, name in enumerate(sources)}
+    fr = cube[src["FR"]]
+    wh = cube[src["WH"]]
+    plane = lambda name: cube[src[name]] if name in src else np.zeros(fr.shape)
+    return {
+        "fr_notice_count": fr,
+        "comment_rate_14d": rolling_sum(fr, COMMENT_WINDOW),
+        "under_review_count": np.clip(cube[src["OIRA"]], 0, 1),
+        "econ_significant_flag": np.zeros(fr.shape, dtype=np.int64),  # placeholder; could be upgraded if parsed
+        "wh_hits": wh,
+        "eo_hits_45d": rolling_sum(wh, EO_WINDOW),
+        "agency_diversity": np.clip((cube[[src[n] for n in SOURCES]] > 0).sum(axis=0), 0, 4).astype(np.float64),
+        "fr_body_count": plane("FR_BODY"),
+        "fr_body_only_count": plane("FR_BODY_ONLY"),
+    }
+
+def feature_arrays(cube: np.ndarray, sources: Sequence[str] = CUBE_SOURCES) -> Dict[str, np.ndarray]:
+    """All (topics x days) feature planes from a count cube."""
+    f = base_planes(cube, sources)
+    f["z_fr_notice"] = zscore_rows(f["fr_notice_count"])
+    f["z_comment_rate"] = zscore_rows(f["comment_rate_14d"])
+    f["score"] = score_arrays(f)
+    return f
+
+def to_frame(f: Dict[str, np.ndarray], topics: Sequence[str], dates: pd.DatetimeIndex,
+             columns: List[str] = TOPIC_DAY_COLUMNS) -> pd.DataFrame:
+    """Flatten planes to the long topic_day layout, sorted by (topic, date)."""
+    n_t, n_d = len(topics), len(dates)
+    data = {
+        "topic": np.repeat(np.asarray(topics, dtype=object), n_d),
+        "date": np.tile(dates.values, n_t),
+    }
+    for c in columns:
+        if c not in data:
+            data[c] = f[c].reshape(-1)
+    return pd.DataFrame(data, columns=columns)
+
+def build_features(events: pd.DataFrame, start, end,
+                   topics: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    events: (date, topic, source) rows from label_events.
+    Returns the full topic_day frame for every topic over [start, end] daily.
+    """
+    topics = list(topics) if topics is not None else sorted(events["topic"].unique())
+    dates = pd.date_range(start, end, freq="D")
+    cube = count_cube(events, topics, dates)
+    return to_frame(feature_arrays(cube), topics, dates)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP fetch engine for the paper-vector scrapers.
+
+One pooled keep-alive requests.Session, a thread pool for concurrency and a
+token bucket so we stay polite to federalregister.gov / reginfo.gov.
+Optionally backed by http_cache.ResponseCache (see --offline / --no-cache).
+Each request goes through throttle.py: per-host AIMD concurrency, retries
+with Retry-After / jittered backoff and a circuit breaker.
+"""
+import gzip, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from http_cache import ResponseCache
+from instrument import count
+from throttle import request as throttled_request
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 8.0  # requests / second
+DEFAULT_TIMEOUT = 30
+
+class BudgetExceeded(TimeoutError):
+    """Raised instead of issuing a request once an engine's deadline has passed."""
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/sec, holds at most `burst`."""
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, n: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                wait = (n - self.tokens) / self.rate
+            time.sleep(wait)
+
+def make_session(pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"User-Agent": "miso-paper-vector/0.1"})
+    return s
+
+class FetchEngine:
+    """
+    Pooled, rate-limited GETs plus a thread-pool `map` for fan-out.
+      engine = FetchEngine(concurrency=8, rate=8)
+      results = engine.map(lambda kw: engine.get_json(url_for(kw)), keywords)
+    """
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 burst: Optional[float] = None, timeout: int = DEFAULT_TIMEOUT,
+                 cache: Optional[ResponseCache] = None, deadline: Optional[float] = None):
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.cache = cache
+        self.deadline = deadline  # time.monotonic() after which no new request is issued
+        self.bucket = TokenBucket(rate, burst)
+        self.session = make_session(self.concurrency)
+
+    def child(self, concurrency: Optional[int] = None, rate: Optional[float] = None,
+              timeout: Optional[int] = None, deadline: Optional[float] = None) -> "FetchEngine":
+        """Engine with its own session, rate limit and deadline, sharing this engine's cache."""
+        return FetchEngine(concurrency=concurrency or self.concurrency,
+                           rate=rate if rate is not None else self.bucket.rate,
+                           timeout=timeout or self.timeout, cache=self.cache, deadline=deadline)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (None = no deadline); raises once it has passed."""
+        if self.deadline is None:
+            return None
+        left = self.deadline - time.monotonic()
+        if left <= 0:
+            raise BudgetExceeded("source time budget exhausted")
+        return left
+
+    def _send(self, url: str, **kw) -> requests.Response:
+        self.bucket.acquire()
+        left = self.remaining()
+        if left is not None:
+            kw["timeout"] = min(kw.get("timeout") or self.timeout, left)
+        r = self.session.get(url, **kw)
+        count("http_requests")
+        if not kw.get("stream"):
+            count("http_bytes", len(r.content))
+        return r
+
+    def _network_get(self, url: str, params: Optional[dict] = None, **kw) -> requests.Response:
+        return throttled_request(self._send, url, self.concurrency, deadline=self.deadline, params=params, **kw)
+
+    def get(self, url: str, params: Optional[dict] = None, **kw):
+        kw.setdefault("timeout", self.timeout)
+        if self.cache is not None:
+            r = self.cache.fetch(self._network_get, url, params=params, **kw)
+            if r.from_cache:
+                count("cache_hits")
+            return r
+        r = self._network_get(url, params=params, **kw)
+        r.raise_for_status()
+        return r
+
+    def download(self, url: str, path: str, compress: bool = False) -> int:
+        """Stream url into path (gzip-compressed when asked) via a temp file; returns bytes received."""
+        tmp = f"{path}.{threading.get_ident()}.part"
+        n = 0
+        try:
+            with throttled_request(self._send, url, self.concurrency, deadline=self.deadline,
+                                   stream=True, timeout=self.timeout) as r:
+                r.raise_for_status()
+                with (gzip.open(tmp, "wb") if compress else open(tmp, "wb")) as f:
+                    for chunk in r.iter_content(1 << 16):
+                        f.write(chunk)
+                        n += len(chunk)
+                        self.remaining()  # stop mid-file once the budget is spent
+            os.replace(tmp, path)
+        finally:
+            count("http_bytes", n)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return n
+
+    def get_text(self, url: str, params: Optional[dict] = None, **kw) -> str:
+        return self.get(url, params=params, **kw).text
+
+    def get_json(self, url: str, params: Optional[dict] = None, **kw):
+        return self.get(url, params=params, **kw).json()
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        """
+        Run fn over items concurrently; results come back in input order.
+        Exceptions are returned in place of results so one bad item can't
+        sink the batch (callers decide whether to warn or raise).
+        """
+        items = list(items)
+        def _safe(x):
+            try:
+                return fn(x)
+            except Exception as e:
+                return e
+        if self.concurrency == 1 or len(items) <= 1:
+            return [_safe(x) for x in items]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as ex:
+            return list(ex.map(_safe, items))
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+_default_engine: Optional[FetchEngine] = None
+
+def default_engine() -> FetchEngine:
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = FetchEngine()
+    return _default_engine
+
+def configure(concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+              timeout: int = DEFAULT_TIMEOUT, cache_dir: Optional[str] = None,
+              offline: bool = False, cache_max_mb: Optional[int] = None,
+              ttls: Optional[Dict[str, int]] = None) -> FetchEngine:
+    """(Re)build the process-wide engine from CLI flags. cache_dir=None disables caching."""
+    global _default_engine
+    if _default_engine is not None:
+        _default_engine.close()
+    cache = None
+    if cache_dir:
+        cache = ResponseCache(cache_dir, ttls=ttls, offline=offline,
+                              **({"max_bytes": cache_max_mb * 1024 * 1024} if cache_max_mb else {}))
+    _default_engine = FetchEngine(concurrency=concurrency, rate=rate, timeout=timeout, cache=cache)
+    return _default_engine
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Incremental Federal Register sync.
+
+Persistent store of FR search results (one line per keyword and document)
+plus a per-keyword high-water mark, so a daily refresh only asks the API
+for documents published since the last successful sync. New keywords get
+a fully paginated backfill (follows `next_page_url`, no silent 250-row cap).
+
+Keywords are not searched one request each: the query planner ORs them
+into combined `conditions[term]` searches ("a" | "b c" | ...), packed so a
+batch stays under the URL limit and its expected result count (from the
+store's own per-keyword history) stays well below the API's pagination cap;
+a batch that still overflows is split in half and retried, down to a single
+keyword whose date range is then halved (a single day over the cap is
+warned about). Only the fields the pipeline keeps are requested
+(`fields[]`). Each hit is attributed back to the keywords of its batch
+with the compiled matcher over the title and the search excerpt; a hit neither mentions (matched deeper in the body) is
+kept once under UNATTRIBUTED together with its batch's keywords, and read
+back under any of them, so the union over any keyword set is the same
+document set the per-keyword searches returned.
+
+A sync reads documents.jsonl once; planning estimates and frame() reuse
+that copy until the file changes.
+
+Layout under <root>:
+  documents.jsonl  -- one {"keyword": ..., **doc} line per (keyword, document); appended each
+                      sync, then compacted so a re-fetched document keeps only its latest line
+                      (UNATTRIBUTED lines also carry "batch": [keywords])
+  watermarks.json  -- {keyword: {"synced_through": "YYYY-MM-DD", "window_start": "YYYY-MM-DD"}}
+"""
+import json, os, re, sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, quote_plus
+import pandas as pd
+from fetch import FetchEngine, default_engine
+from instrument import count
+from matcher import compile_keywords
+
+FR_BASE = "https://www.federalregister.gov/api/v1/documents.json"
+FR_PER_PAGE = 1000  # API max
+FR_COLUMNS = ["source","id","title","agencies","publication_date","type","comments_close_on","html_url"]
+# fr_row's inputs, plus the search excerpt used for keyword attribution
+FR_FIELDS = ["document_number","title","agencies","publication_date","type","comments_close_on","html_url","excerpts"]
+FR_RESULT_CAP = 10000     # the API stops paginating past this many results
+MAX_TERM_CHARS = 1500     # url-encoded conditions[term] per request (whole URL stays < ~2 KB)
+MAX_BATCH_RESULTS = 2000  # planned hits per combined search
+DEFAULT_EST = 50          # planned hits for a keyword with no history
+UNATTRIBUTED = "(unattributed)"  # hits no keyword of their batch mentions in title/excerpt
+
+def fr_term(kw: str) -> str:
+    return f'"{kw}"' if " " in kw else kw
+
+def fr_row(d: dict) -> dict:
+    return {
+        "source": "FR",
+        "id": d.get("document_number"),
+        "title": d.get("title"),
+        "agencies": ", ".join([a.get("name","") for a in d.get("agencies", [])]) if d.get("agencies") else None,
+        "publication_date": d.get("publication_date"),
+        "type": d.get("type"),
+        "comments_close_on": d.get("comments_close_on"),
+        "html_url": d.get("html_url"),
+    }
+
+def fr_url(params: dict) -> str:
+    return f"{FR_BASE}?{urlencode(params, doseq=True, quote_via=quote_plus)}"
+
+def iter_fr_pages(engine: FetchEngine, params: dict) -> Iterator[dict]:
+    """Yield raw FR documents for one search, following next_page_url to the end."""
+    url = fr_url(params)
+    while url:
+        data = engine.get_json(url)
+        for d in data.get("results", []) or []:
+            yield d
+        url = data.get("next_page_url")
+
+def search_fr(engine: FetchEngine, kw: str, start_date: str) -> List[dict]:
+    params = {
+        "per_page": FR_PER_PAGE,
+        "order": "newest",
+        "conditions[publication_date][gte]": start_date,
+        "conditions[term]": fr_term(kw),
+    }
+    return [fr_row(d) for d in iter_fr_pages(engine, params)]
+
+# ---- query planner ----
+def combined_term(keywords: Sequence[str]) -> str:
+    return " | ".join(fr_term(kw) for kw in keywords)
+
+def plan_batches(keywords: Sequence[str], estimates: Optional[Dict[str, float]] = None,
+                 max_chars: int = MAX_TERM_CHARS, max_results: int = MAX_BATCH_RESULTS) -> List[List[str]]:
+    """Pack keywords (in order) into OR-batches under the term length and expected-hits limits."""
+    estimates = estimates or {}
+    batches, cur, chars, hits = [], [], 0, 0.0
+    for kw in keywords:
+        n = len(quote_plus(" | " + fr_term(kw)))
+        est = estimates.get(kw, DEFAULT_EST)
+        if cur and (chars + n > max_chars or hits + est > max_results):
+            batches.append(cur)
+            cur, chars, hits = [], 0, 0.0
+        cur.append(kw)
+        chars += n
+        hits += est
+    if cur:
+        batches.append(cur)
+    return batches
+
+_TAGS = re.compile(r"<[^>]+>")
+
+def attribute(keywords: Sequence[str], docs: List[dict]) -> Dict[str, List[dict]]:
+    """
+    keyword -> fr_rows of the docs it matches (title or excerpt). Docs no
+    keyword matches go once to UNATTRIBUTED, tagged with the batch's keywords.
+    """
+    m = compile_keywords(tuple(keywords))
+    out: Dict[str, List[dict]] = {kw: [] for kw in [*keywords, UNATTRIBUTED]}
+    for d in docs:
+        text = f"{d.get('title') or ''} {_TAGS.sub(' ', str(d.get('excerpts') or ''))}"
+        hits = m.keywords_in(text)
+        if not hits:
+            count("fr_unattributed_hits")
+            out[UNATTRIBUTED].append({**fr_row(d), "batch": list(keywords)})
+            continue
+        row = fr_row(d)
+        for kw in keywords:
+            if kw in hits:
+                out[kw].append(row)
+    return out
+
+def _merge(*parts: Dict[str, List[dict]]) -> Dict[str, List[dict]]:
+    out: Dict[str, List[dict]] = {}
+    for part in parts:
+        for key, rows in part.items():
+            out.setdefault(key, []).extend(rows)
+    return out
+
+def search_batch(engine: FetchEngine, keywords: Sequence[str], start_date: str,
+                 end_date: Optional[str] = None) -> Dict[str, List[dict]]:
+    """
+    One combined search for `keywords` published in [start_date, end_date].
+    While it overflows FR_RESULT_CAP the keywords are split in half, then a
+    single keyword's date range; a single day that still overflows is warned
+    about (only its first FR_RESULT_CAP hits are reachable).
+    """
+    params = {
+        "per_page": FR_PER_PAGE,
+        "order": "newest",
+        "conditions[publication_date][gte]": start_date,
+        "conditions[term]": combined_term(keywords),
+        "fields[]": FR_FIELDS,
+    }
+    if end_date:
+        params["conditions[publication_date][lte]"] = end_date
+    data = engine.get_json(fr_url(params))
+    total = data.get("count") or 0
+    if total > FR_RESULT_CAP:
+        if len(keywords) > 1:
+            half = len(keywords) // 2
+            count("fr_batch_splits")
+            return _merge(search_batch(engine, keywords[:half], start_date, end_date),
+                          search_batch(engine, keywords[half:], start_date, end_date))
+        first = pd.Timestamp(start_date)
+        last = pd.Timestamp(end_date) if end_date else pd.Timestamp.now("UTC").tz_localize(None).normalize()
+        if first < last:
+            mid = first + (last - first) // 2
+            count("fr_date_splits")
+            return _merge(search_batch(engine, keywords, start_date, mid.date().isoformat()),
+                          search_batch(engine, keywords, (mid + pd.Timedelta(days=1)).date().isoformat(),
+                                       last.date().isoformat()))
+        print(f"[WARN] FR search for {fr_term(keywords[0])} on {start_date}: {total} results, "
+              f"only the first {FR_RESULT_CAP} are reachable", file=sys.stderr)
+    docs = list(data.get("results", []) or [])
+    url = data.get("next_page_url")
+    while url:
+        data = engine.get_json(url)
+        docs.extend(data.get("results", []) or [])
+        url = data.get("next_page_url")
+    return attribute(keywords, docs)
+
+def search_keywords(engine: FetchEngine, starts: Dict[str, str],
+                    estimates: Optional[Dict[str, float]] = None) -> Dict[str, object]:
+    """
+    keyword -> fr_rows (or the Exception its batch failed with) for
+    keyword -> start date, plus UNATTRIBUTED -> the hits of every batch
+    that no keyword matched. Keywords sharing a start date share batches.
+    """
+    groups: Dict[str, List[str]] = {}
+    for kw, start in starts.items():
+        groups.setdefault(start, []).append(kw)
+    batches: List[Tuple[str, List[str]]] = [(start, b) for start, kws in groups.items()
+                                            for b in plan_batches(kws, estimates)]
+    count("fr_batches", len(batches))
+    out: Dict[str, object] = {UNATTRIBUTED: []}
+    for (start, kws), res in zip(batches, engine.map(lambda sb: search_batch(engine, sb[1], sb[0]), batches)):
+        for kw in kws:
+            out[kw] = res if isinstance(res, Exception) else res[kw]
+        if not isinstance(res, Exception):
+            out[UNATTRIBUTED].extend(res[UNATTRIBUTED])
+    return out
+
+def by_keyword(df: pd.DataFrame, keywords: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Stored rows with UNATTRIBUTED ones read back under their batch: under the
+    first batch keyword in `keywords` (every batch keyword when keywords is None).
+    """
+    if UNATTRIBUTED not in set(df["keyword"]) or "batch" not in df.columns:
+        return df
+    un = df["keyword"] == UNATTRIBUTED
+    batch = df.loc[un, "batch"]
+    if keywords is None:
+        extra = df[un].assign(keyword=batch).explode("keyword")
+    else:
+        wanted = set(keywords)
+        extra = df[un].assign(keyword=[next((k for k in b if k in wanted), None) for b in batch])
+    return pd.concat([df[~un], extra.dropna(subset=["keyword"])]).sort_index(kind="stable")
+
+def compact_records(records: List[dict]) -> List[dict]:
+    """
+    Latest record per (keyword, document), in order of last write (re-synced
+    watermark days repeat docs); an UNATTRIBUTED doc keeps the union of its
+    batches' keywords.
+    """
+    latest: Dict[Tuple[str, str], dict] = {}
+    for d in records:
+        key = (d.get("keyword"), d.get("id"))
+        prev = latest.pop(key, None)  # re-insert: a re-fetched doc moves to its newest position
+        if prev is not None and key[0] == UNATTRIBUTED:
+            old = prev.get("batch") or []
+            d = {**d, "batch": old + [kw for kw in d.get("batch") or [] if kw not in old]}
+        latest[key] = d
+    return list(latest.values())
+
+class FRStore:
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.docs_path = os.path.join(root, "documents.jsonl")
+        self.marks_path = os.path.join(root, "watermarks.json")
+        self.marks: Dict[str, dict] = {}
+        self._docs: Optional[Tuple[Optional[Tuple[int, int]], pd.DataFrame]] = None
+        if os.path.exists(self.marks_path):
+            with open(self.marks_path, "r") as f:
+                self.marks = json.load(f)
+
+    def _save_marks(self) -> None:
+        tmp = self.marks_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.marks, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.marks_path)
+
+    def _records(self) -> List[dict]:
+        if not os.path.exists(self.docs_path):
+            return []
+        with open(self.docs_path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        if not os.path.exists(self.docs_path):
+            return None
+        st = os.stat(self.docs_path)
+        return st.st_size, st.st_mtime_ns
+
+    def _cache(self, records: List[dict]) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(records) if records else pd.DataFrame(columns=["keyword", *FR_COLUMNS])
+        self._docs = (self._signature(), df)
+        return df
+
+    def documents(self) -> pd.DataFrame:
+        """documents.jsonl as a frame; re-read only when the file changed since this store last read or wrote it."""
+        if self._docs is None or self._docs[0] != self._signature():
+            return self._cache(self._records())
+        return self._docs[1]
+
+    def write(self, records: List[dict], new: List[dict]) -> None:
+        """Store records (the file's current lines) plus new ones, compacted; appends when nothing was dropped."""
+        kept = compact_records(records + new)
+        dropped = len(records) + len(new) - len(kept)
+        if dropped:
+            tmp = self.docs_path + ".tmp"
+            with open(tmp, "w") as f:
+                f.writelines(json.dumps(r) + "\n" for r in kept)
+            os.replace(tmp, self.docs_path)
+            count("fr_store_compacted", dropped)
+        elif new:
+            with open(self.docs_path, "a") as f:
+                f.writelines(json.dumps(r) + "\n" for r in new)
+        self._cache(kept)
+
+    def estimates(self, plan: Dict[str, str]) -> Dict[str, float]:
+        """Expected hits per keyword since its planned start, scaled from its stored hits over its window."""
+        df = self.documents()
+        if df.empty:
+            return {}
+        hits = by_keyword(df)["keyword"].value_counts()
+        today = pd.Timestamp.now("UTC").tz_localize(None).normalize()
+        out = {}
+        for kw, start in plan.items():
+            m = self.marks.get(kw)
+            if not m or kw not in hits.index:
+                continue
+            window = max(1, (pd.Timestamp(m["synced_through"]) - pd.Timestamp(m["window_start"])).days)
+            out[kw] = hits[kw] * min(1.0, ((today - pd.Timestamp(start)).days + 1) / window) + 1
+        return out
+
+    def plan(self, keywords: List[str], start_date: str, full: bool = False) -> Dict[str, str]:
+        """keyword -> first publication date to request this run."""
+        out = {}
+        for kw in keywords:
+            m = self.marks.get(kw)
+            if full or not m or m.get("window_start", start_date) > start_date:
+                out[kw] = start_date  # new keyword or widened window: backfill
+            else:
+                # gte the watermark day itself: FR can post more docs later on the same day
+                out[kw] = max(m["synced_through"], start_date)
+        return out
+
+    def sync(self, keywords: List[str], days: int = 365, engine: Optional[FetchEngine] = None,
+             full: bool = False) -> Dict[str, int]:
+        """Fetch only what's new for each keyword; returns keyword -> #docs fetched."""
+        engine = engine or default_engine()
+        today = pd.Timestamp.utcnow().normalize().date().isoformat()
+        start_date = (pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)).date().isoformat()
+        if engine.cache is not None and engine.cache.offline:
+            return {}
+        plan = self.plan(keywords, start_date, full=full)
+        fetched, new = {}, []
+        records = self._records()  # the one read of documents.jsonl this sync
+        self._cache(records)
+        results = search_keywords(engine, plan, self.estimates(plan))
+        for kw in keywords:
+            rows = results[kw]
+            if isinstance(rows, Exception):
+                print("[WARN] FR fetch failed for", fr_term(kw), "->", rows, file=sys.stderr)
+                continue
+            new.extend({"keyword": kw, **r} for r in rows)
+            prev = self.marks.get(kw, {})
+            backfilled = plan[kw] == start_date
+            self.marks[kw] = {
+                "synced_through": today,
+                "window_start": start_date if backfilled else prev.get("window_start", start_date),
+            }
+            fetched[kw] = len(rows)
+        new.extend({"keyword": UNATTRIBUTED, **r} for r in results[UNATTRIBUTED])
+        self.write(records, new)
+        self._save_marks()
+        return fetched
+
+    def frame(self, keywords: Optional[List[str]] = None, since: Optional[str] = None) -> pd.DataFrame:
+        """
+        Deduplicated document table (latest version of each doc wins),
+        restricted to `keywords` and publication_date >= since.
+        """
+        df = self.documents()
+        if df.empty:
+            return pd.DataFrame(columns=FR_COLUMNS)
+        df = by_keyword(df, keywords)
+        if keywords is not None:
+            df = df[df["keyword"].isin(keywords)]
+        if since is not None:
+            df = df[df["publication_date"].astype(str) >= since]
+        if df.empty:
+            return pd.DataFrame(columns=FR_COLUMNS)
+        df = df.reset_index(drop=True)
+        latest = df.drop_duplicates("id", keep="last").set_index("id")  # file order: newest write wins
+        order = {kw: i for i, kw in enumerate(keywords or sorted(df["keyword"].unique()))}
+        # keyword order first (matches the old per-keyword loop), newest first within a keyword
+        first = (df.assign(_k=df["keyword"].map(order))
+                   .sort_values(["_k","publication_date"], ascending=[True, False], kind="stable")
+                   .drop_duplicates("id", keep="first")["id"])
+        df = latest.loc[first.values].reset_index()
+        return df.reindex(columns=FR_COLUMNS).reset_index(drop=True)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Optional Federal Register body-text stage (score.py / daemon.py --fr-text).
+
+Titles miss most grid and data-center rules filed under generic titles
+("Combined Notice of Filings #1"), so this stage also reads the documents.
+The plain text of every FR document in the pull is downloaded on the FR
+engine's bounded pool (rate limit + per-host AIMD, throttle.py) straight
+into one gzip file per document under cache/fr_text/. FR documents don't
+change once published, so each is fetched once per cache lifetime.
+
+Bodies are streamed through the compiled lexicon matcher 64 KB at a time
+(the automaton state carries across chunks, matcher.iter_tokens), so no
+whole document is held in memory. Per-document keyword hits are memoized in
+cache/fr_text/body_hits.json together with the keyword set they were
+scanned for: a run only scans documents it hasn't seen, and a lexicon with
+new keywords rescans the cached text without refetching it.
+
+The result is two extra event sources per (document, topic):
+  FR_BODY       the body mentions one of the topic's keywords
+  FR_BODY_ONLY  ... and the title doesn't (what title labeling misses)
+which features.py reports as topic_day's fr_body_count / fr_body_only_count.
+"""
+import gzip, json, os, sys
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from fanout import SOURCE_LIMITS
+from fetch import FetchEngine, default_engine
+from instrument import count
+from matcher import LexiconMatcher, compile_keywords
+
+TEXT_DIR = os.path.join("cache", "fr_text")
+TEXT_URL = "https://www.federalregister.gov/documents/full_text/text/{y:04d}/{m:02d}/{d:02d}/{doc}.txt"
+CHUNK_CHARS = 1 << 16
+EVENT_COLUMNS = ["date", "topic", "source"]
+
+def text_engine(concurrency: Optional[int] = None, rate: Optional[float] = None) -> FetchEngine:
+    """Own session on FR's per-source limits (fanout.SOURCE_LIMITS) unless overridden."""
+    lim = SOURCE_LIMITS["FR"]
+    return default_engine().child(concurrency=concurrency or lim["concurrency"],
+                                  rate=rate if rate is not None else lim["rate"], timeout=lim["timeout"])
+
+def text_url(doc_id: str, publication_date) -> Optional[str]:
+    d = pd.to_datetime(publication_date, errors="coerce")
+    if pd.isna(d) or not doc_id:
+        return None
+    return TEXT_URL.format(y=d.year, m=d.month, d=d.day, doc=doc_id)
+
+def text_path(root: str, doc_id: str) -> str:
+    return os.path.join(root, doc_id[-2:], f"{doc_id}.txt.gz")
+
+def read_chunks(path: str, size: int = CHUNK_CHARS) -> Iterator[str]:
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+def download_texts(docs: pd.DataFrame, engine: FetchEngine, root: str = TEXT_DIR,
+                   fetch: bool = True) -> Dict[str, str]:
+    """doc id -> local .txt.gz for the FR rows in docs; only missing documents are downloaded."""
+    paths, todo = {}, []
+    for doc_id, date in zip(docs["id"], docs["publication_date"]):
+        if not isinstance(doc_id, str) or not doc_id:
+            continue
+        path = text_path(root, doc_id)
+        if os.path.exists(path):
+            paths[doc_id] = path
+        elif fetch:
+            url = text_url(doc_id, date)
+            if url:
+                todo.append((doc_id, url, path))
+    if not todo or (engine.cache is not None and engine.cache.offline):
+        return paths
+
+    def _download(item) -> str:
+        doc_id, url, path = item
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        engine.download(url, path, compress=True)
+        return path
+    failed = []
+    for (doc_id, url, _), res in zip(todo, engine.map(_download, todo)):
+        if isinstance(res, Exception):
+            failed.append((url, res))
+        else:
+            paths[doc_id] = res
+    count("fr_text_downloads", len(todo) - len(failed))
+    if failed:
+        print(f"[WARN] FR text: {len(failed)}/{len(todo)} download(s) failed, retried next run "
+              f"(e.g. {failed[0][0]} -> {failed[0][1]})", file=sys.stderr)
+    return paths
+
+class BodyHits:
+    """doc id -> keywords its body mentions, for the keyword set in `keywords`."""
+    def __init__(self, root: str = TEXT_DIR):
+        self.path = os.path.join(root, "body_hits.json")
+        self.keywords: List[str] = []
+        self.docs: Dict[str, List[str]] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                state = json.load(f)
+            self.keywords, self.docs = state["keywords"], state["docs"]
+
+    def save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"keywords": self.keywords, "docs": self.docs}, f)
+        os.replace(tmp, self.path)
+
+    def scan(self, keywords: Sequence[str], paths: Dict[str, str]) -> Dict[str, List[str]]:
+        """Body keywords (restricted to `keywords`) for every doc in paths; unseen docs are scanned."""
+        if not set(keywords) <= set(self.keywords):
+            self.keywords = sorted(set(self.keywords) | set(keywords))
+            self.docs = {}  # new keywords: rescan the cached text
+        scanner = compile_keywords(tuple(self.keywords))
+        todo = [d for d in paths if d not in self.docs]
+        for doc_id in todo:
+            try:
+                self.docs[doc_id] = sorted(scanner.keywords_in_stream(read_chunks(paths[doc_id])))
+            except (OSError, EOFError) as e:  # truncated / corrupt file: drop it, refetched next run
+                print(f"[WARN] FR text unreadable, dropping {paths[doc_id]}: {e}", file=sys.stderr)
+                os.remove(paths[doc_id])
+        count("fr_text_scanned", len(todo))
+        if todo:
+            self.save()
+        wanted = set(keywords)
+        return {d: [k for k in self.docs[d] if k in wanted] for d in paths if d in self.docs}
+
+def body_events(fr: pd.DataFrame, matcher: LexiconMatcher, engine: Optional[FetchEngine] = None,
+                root: str = TEXT_DIR, fetch: bool = True) -> pd.DataFrame:
+    """
+    FR_BODY / FR_BODY_ONLY (date, topic, source) events for the FR rows in fr.
+    fetch=False uses only text already on disk (e.g. score.py --relabel).
+    """
+    if fr is None or fr.empty:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    own = engine is None
+    engine = engine or text_engine()
+    try:
+        paths = download_texts(fr, engine, root, fetch=fetch)
+    finally:
+        if own:
+            engine.close()
+    hits = BodyHits(root).scan(matcher.keywords, paths)
+    kw_id = {kw: i for i, kw in enumerate(matcher.keywords)}
+    title_hits = matcher.topic_matrix(fr["title"]).to_numpy()
+    dates = pd.to_datetime(fr["publication_date"], errors="coerce", utc=True).dt.tz_convert(None).dt.normalize()
+    topics = np.asarray(matcher.topics, dtype=object)
+    rows = []
+    for i, (doc_id, date) in enumerate(zip(fr["id"], dates)):
+        kws = hits.get(doc_id)
+        if not kws or pd.isna(date):
+            continue
+        body = matcher.kw_topic[[kw_id[k] for k in kws]].any(axis=0)
+        for j in np.nonzero(body)[0]:
+            rows.append((date, topics[j], "FR_BODY"))
+            if not title_hits[i, j]:
+                rows.append((date, topics[j], "FR_BODY_ONLY"))
+    return pd.DataFrame(rows, columns=EVENT_COLUMNS)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+SQLite FTS5 full-text index over filing titles and agencies.
+
+Documents from the storage datasets (filings_hist, filings_flat and the raw_*
+pulls) go into a stored `docs` table; an external-content FTS5 table over
+(title, agency) is kept in sync by triggers. Every row gets a stable uid
+(source id where there is one, else a hash of date/agency/title plus its
+occurrence number), so re-indexing a grown dataset only inserts the new
+rows, and a dataset whose file fingerprint is unchanged is skipped outright.
+
+Queries use FTS5 syntax: phrases ("data center"), prefixes (hyperscal*),
+AND / OR / NOT, NEAR(...) and column filters (agency: energy).
+
+  python3 fts.py --build                                   # index / top up every dataset
+  python3 fts.py '"data center" OR hyperscal*' --start 2024-01-01
+  python3 fts.py 'transmission NOT agency:commerce' --daily --dataset raw_fr
+
+score.py and daemon.py add each fresh pull as it arrives (index_frames).
+"""
+import argparse, hashlib, os, sqlite3, sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+from storage import fingerprint, read_dataset, resolve_source
+
+FTS_PATH = os.path.join("cache", "fts.sqlite")
+
+# dataset -> (id, title, agency, date, url) columns; None where the dataset has no such field
+INDEXED: Dict[str, Tuple[Optional[str], str, str, str, Optional[str]]] = {
+    "raw_fr":       ("id", "title", "agencies", "publication_date", "html_url"),
+    "raw_oira":     ("id", "title", "agency", "received", "detail_url"),
+    "raw_ua":       ("id", "title", "agency", "date", None),
+    "raw_wh":       (None, "title", "agency", "date", "url"),
+    "filings_hist": (None, "filing_title", "agency", "date", None),
+    "filings_flat": (None, "filing_title", "agency", "date", None),
+}
+# source name (score.py frames) -> dataset
+SOURCE_DATASETS = {"FR": "raw_fr", "OIRA": "raw_oira", "UA": "raw_ua", "WH": "raw_wh"}
+RESULT_COLUMNS = ["date", "dataset", "doc_id", "title", "agency", "url", "rank"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    rowid   INTEGER PRIMARY KEY,
+    uid     TEXT UNIQUE NOT NULL,
+    dataset TEXT NOT NULL,
+    doc_id  TEXT,
+    date    TEXT,
+    title   TEXT,
+    agency  TEXT,
+    url     TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_date ON docs(date);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, agency, content='docs', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts(rowid, title, agency) VALUES (new.rowid, new.title, new.agency);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts(docs_fts, rowid, title, agency) VALUES ('delete', old.rowid, old.title, old.agency);
+END;
+CREATE TABLE IF NOT EXISTS meta (dataset TEXT PRIMARY KEY, fingerprint TEXT);
+"""
+
+def _text(s: pd.Series) -> List[Optional[str]]:
+    return [None if pd.isna(v) else str(v) for v in s]
+
+def _iso(s: pd.Series) -> List[Optional[str]]:
+    d = pd.to_datetime(s, errors="coerce", utc=True).dt.tz_convert(None)
+    return [None if pd.isna(v) else v.strftime("%Y-%m-%d") for v in d]
+
+def doc_rows(df: pd.DataFrame, dataset: str) -> List[Tuple]:
+    """(uid, dataset, doc_id, date, title, agency, url) per row of a dataset frame."""
+    id_col, title_col, agency_col, date_col, url_col = INDEXED[dataset]
+    n = len(df)
+    col = lambda c: _text(df[c]) if c and c in df.columns else [None] * n
+    ids, titles, agencies, urls = col(id_col), col(title_col), col(agency_col), col(url_col)
+    dates = _iso(df[date_col]) if date_col in df.columns else [None] * n
+    rows, seen = [], {}
+    for i in range(n):
+        if ids[i]:
+            uid = f"{dataset}:{ids[i]}"
+        else:
+            h = hashlib.sha1(f"{dates[i]}|{agencies[i]}|{titles[i]}".encode("utf-8")).hexdigest()[:20]
+            k = seen[h] = seen.get(h, -1) + 1  # identical rows stay distinct documents
+            uid = f"{dataset}:{h}:{k}"
+        rows.append((uid, dataset, ids[i], dates[i], titles[i], agencies[i], urls[i]))
+    return rows
+
+class FTSIndex:
+    def __init__(self, path: str = FTS_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- writes ----
+    def add(self, df: pd.DataFrame, dataset: str) -> int:
+        """Insert rows not indexed yet (by uid); returns how many were new."""
+        if df is None or df.empty:
+            return 0
+        size = lambda: self.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        with self.db:
+            before = size()
+            self.db.executemany("INSERT OR IGNORE INTO docs (uid, dataset, doc_id, date, title, agency, url) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?)", doc_rows(df, dataset))
+            return size() - before
+
+    def update(self, datasets: Optional[Iterable[str]] = None, force: bool = False) -> Dict[str, int]:
+        """Top the index up from the stored datasets, skipping ones unchanged since the last update."""
+        added = {}
+        for name in datasets or INDEXED:
+            if not os.path.exists(resolve_source(name)):
+                continue  # never written (no Parquet dataset, no CSV export)
+            fp = fingerprint(name)
+            row = self.db.execute("SELECT fingerprint FROM meta WHERE dataset = ?", (name,)).fetchone()
+            if row and row[0] == fp and not force:
+                added[name] = 0
+                continue
+            added[name] = self.add(read_dataset(name), name)
+            with self.db:
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, fp))
+        return added
+
+    def rebuild(self) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM docs")
+            self.db.execute("DELETE FROM meta")
+            self.db.execute("INSERT INTO docs_fts(docs_fts) VALUES ('rebuild')")
+
+    # ---- queries ----
+    def _where(self, query: str, start, end, datasets: Optional[Sequence[str]]) -> Tuple[str, List]:
+        sql, args = "docs_fts MATCH ?", [query]
+        if start is not None:
+            sql += " AND d.date >= ?"
+            args.append(pd.Timestamp(start).strftime("%Y-%m-%d"))
+        if end is not None:
+            sql += " AND d.date <= ?"
+            args.append(pd.Timestamp(end).strftime("%Y-%m-%d"))
+        if datasets:
+            sql += f" AND d.dataset IN ({','.join('?' * len(datasets))})"
+            args.extend(datasets)
+        return sql, args
+
+    def _query(self, sql: str, args: List) -> List[Tuple]:
+        try:
+            return self.db.execute(sql, args).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"bad FTS query {args[0]!r}: {e}") from None
+
+    def search(self, query: str, start=None, end=None, datasets: Optional[Sequence[str]] = None,
+               limit: Optional[int] = 50) -> pd.DataFrame:
+        """Matching documents, best bm25 rank first; start/end are inclusive days."""
+        where, args = self._where(query, start, end, datasets)
+        sql = (f"SELECT d.date, d.dataset, d.doc_id, d.title, d.agency, d.url, bm25(docs_fts) AS rank "
+               f"FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid WHERE {where} ORDER BY rank")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        out = pd.DataFrame(self._query(sql, args), columns=RESULT_COLUMNS)
+        out["date"] = pd.to_datetime(out["date"])
+        return out
+
+    def count(self, query: str, start=None, end=None, datasets: Optional[Sequence[str]] = None) -> int:
+        where, args = self._where(query, start, end, datasets)
+        return self._query(f"SELECT COUNT(*) FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid WHERE {where}", args)[0][0]
+
+    def daily_counts(self, query: str, start=None, end=None, datasets: Optional[Sequence[str]] = None,
+                     dense: bool = True) -> pd.DataFrame:
+        """(date, hits) per day; dense fills days without hits with 0 across [start, end]."""
+        where, args = self._where(query, start, end, datasets)
+        rows = self._query(f"SELECT d.date, COUNT(*) FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid "
+                           f"WHERE {where} AND d.date IS NOT NULL GROUP BY d.date ORDER BY d.date", args)
+        out = pd.DataFrame(rows, columns=["date", "hits"])
+        out["date"] = pd.to_datetime(out["date"])
+        if not dense or (out.empty and (start is None or end is None)):
+            return out
+        days = pd.date_range(start if start is not None else out["date"].min(),
+                             end if end is not None else out["date"].max(), freq="D")
+        return (out.set_index("date")["hits"].reindex(days, fill_value=0)
+                   .rename_axis("date").reset_index())
+
+def index_frames(frames: Dict[str, pd.DataFrame], path: str = FTS_PATH) -> Dict[str, int]:
+    """Add fresh source pulls (score.py / daemon.py frames keyed FR/OIRA/UA/WH) to the index."""
+    with FTSIndex(path) as idx:
+        return {name: idx.add(df, SOURCE_DATASETS[name]) for name, df in frames.items() if name in SOURCE_DATASETS}
+
+def main():
+    ap = argparse.ArgumentParser(description="Full-text search over filing titles/agencies (SQLite FTS5)")
+    ap.add_argument("query", nargs="?", help='FTS5 query, e.g. \'"data center" OR hyperscal*\'')
+    ap.add_argument("--build", action="store_true", help="Index new rows from every stored dataset first")
+    ap.add_argument("--rebuild", action="store_true", help="Drop the index and re-import everything")
+    ap.add_argument("--db", default=FTS_PATH)
+    ap.add_argument("--dataset", action="append", choices=sorted(INDEXED), help="Restrict to dataset(s)")
+    ap.add_argument("--start", default=None, help="First day (inclusive)")
+    ap.add_argument("--end", default=None, help="Last day (inclusive)")
+    ap.add_argument("--daily", action="store_true", help="Print per-day hit counts instead of documents")
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--out", default=None, help="Also write the result to this CSV")
+    args = ap.parse_args()
+
+    with FTSIndex(args.db) as idx:
+        if args.rebuild:
+            idx.rebuild()
+        if args.build or args.rebuild:
+            added = idx.update(args.dataset)
+            print("[OK] indexed " + ", ".join(f"{k}+{v}" for k, v in added.items()), file=sys.stderr)
+        if not args.query:
+            return
+        try:
+            if args.daily:
+                res = idx.daily_counts(args.query, args.start, args.end, args.dataset)
+            else:
+                res = idx.search(args.query, args.start, args.end, args.dataset, limit=args.limit)
+            total = idx.count(args.query, args.start, args.end, args.dataset)
+        except ValueError as e:
+            print(f"[ERR] {e}", file=sys.stderr)
+            sys.exit(2)
+    with pd.option_context("display.max_colwidth", 90, "display.width", 200):
+        print(res.drop(columns=["url"], errors="ignore").to_string(index=False))
+    print(f"[OK] {total} matching document(s)", file=sys.stderr)
+    if args.out:
+        res.to_csv(args.out, index=False)
+        print(f"[OK] wrote {args.out}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
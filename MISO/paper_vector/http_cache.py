@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk HTTP response cache for the paper-vector scrapers.
+
+Layout:  <cache_dir>/http/<k[:2]>/<k>.body  +  <k>.json  (k = sha256 of url+params)
+- per-source TTLs (matched on hostname suffix)
+- stale entries are revalidated with If-None-Match / If-Modified-Since
+- size-bounded LRU eviction (body mtime is the access clock)
+- offline replay: serve whatever is on disk, never touch the network
+"""
+import hashlib, json, os, threading, time
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_TTLS: Dict[str, int] = {
+    "federalregister.gov": 6 * 3600,
+    "reginfo.gov": 24 * 3600,
+    "whitehouse.gov": 1 * 3600,
+    "*": 6 * 3600,
+}
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+class OfflineCacheMiss(LookupError):
+    """Raised in --offline mode when a URL was never cached."""
+
+def cache_key(url: str, params: Optional[dict] = None) -> str:
+    if params:
+        url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()), doseq=True)}"
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+class CachedResponse:
+    """Just enough of requests.Response for our callers (.text / .json() / .content)."""
+    def __init__(self, url: str, content: bytes, meta: dict, from_cache: bool = True):
+        self.url = url
+        self.content = content
+        self.status_code = meta.get("status", 200)
+        self.headers = meta.get("headers", {})
+        self.encoding = meta.get("encoding") or "utf-8"
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        return None
+
+class ResponseCache:
+    def __init__(self, cache_dir: str, ttls: Optional[Dict[str, int]] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.root = os.path.join(cache_dir, "http")
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.revalidated = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._index = self._scan()  # key -> [size, last_access]
+
+    # ---- paths / index ----
+    def _paths(self, key: str):
+        d = os.path.join(self.root, key[:2])
+        return os.path.join(d, key + ".body"), os.path.join(d, key + ".json")
+
+    def _scan(self) -> Dict[str, list]:
+        idx = {}
+        for sub in os.listdir(self.root):
+            d = os.path.join(self.root, sub)
+            if not os.path.isdir(d):
+                continue
+            for fn in os.listdir(d):
+                if fn.endswith(".body"):
+                    st = os.stat(os.path.join(d, fn))
+                    idx[fn[:-5]] = [st.st_size, st.st_mtime]
+        return idx
+
+    def total_bytes(self) -> int:
+        with self.lock:
+            return sum(v[0] for v in self._index.values())
+
+    def ttl_for(self, url: str) -> int:
+        host = (urlsplit(url).hostname or "").lower()
+        for suffix, ttl in self.ttls.items():
+            if suffix != "*" and (host == suffix or host.endswith("." + suffix)):
+                return ttl
+        return self.ttls["*"]
+
+    # ---- read / write ----
+    def lookup(self, key: str):
+        """Return (content, meta) or None."""
+        body_p, meta_p = self._paths(key)
+        try:
+            with open(meta_p, "r") as f:
+                meta = json.load(f)
+            with open(body_p, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        try:
+            os.utime(body_p, (now, now))
+        except OSError:
+            pass
+        with self.lock:
+            if key in self._index:
+                self._index[key][1] = now
+        return content, meta
+
+    def is_fresh(self, url: str, meta: dict) -> bool:
+        return (time.time() - meta.get("fetched_at", 0)) < self.ttl_for(url)
+
+    def store(self, key: str, url: str, content: bytes, status: int, headers, encoding: Optional[str]) -> dict:
+        body_p, meta_p = self._paths(key)
+        os.makedirs(os.path.dirname(body_p), exist_ok=True)
+        meta = {
+            "url": url,
+            "status": status,
+            "fetched_at": time.time(),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "headers": {k: headers[k] for k in ("Content-Type",) if k in headers},
+            "encoding": encoding,
+        }
+        tmp = f"{body_p}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, body_p)
+        self._write_meta(meta_p, meta)
+        with self.lock:
+            self._index[key] = [len(content), time.time()]
+        self.evict()
+        return meta
+
+    def touch(self, key: str, meta: dict) -> None:
+        """Mark a revalidated (304) entry fresh again."""
+        meta["fetched_at"] = time.time()
+        self._write_meta(self._paths(key)[1], meta)
+
+    def _write_meta(self, meta_p: str, meta: dict) -> None:
+        tmp = f"{meta_p}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_p)
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until under max_bytes. Returns #evicted."""
+        with self.lock:
+            total = sum(v[0] for v in self._index.values())
+            if total <= self.max_bytes:
+                return 0
+            victims = []
+            for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+            for key in victims:
+                del self._index[key]
+        for key in victims:
+            for p in self._paths(key):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+        return len(victims)
+
+    # ---- main entry used by FetchEngine ----
+    def fetch(self, get, url: str, params: Optional[dict] = None, **kw):
+        """
+        GET through the cache. Fresh hit -> disk; stale hit -> conditional GET;
+        miss -> full GET and store. Offline -> disk or OfflineCacheMiss.
+        `get` is the network call, e.g. a rate-limited session.get.
+        """
+        key = cache_key(url, params)
+        cached = self.lookup(key)
+        if self.offline:
+            if cached is None:
+                raise OfflineCacheMiss(url)
+            with self.lock:
+                self.hits += 1
+            return CachedResponse(url, cached[0], cached[1])
+        if cached is not None and self.is_fresh(url, cached[1]):
+            with self.lock:
+                self.hits += 1
+            return CachedResponse(url, cached[0], cached[1])
+
+        headers = dict(kw.pop("headers", None) or {})
+        if cached is not None:
+            meta = cached[1]
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        r = get(url, params=params, headers=headers, **kw)
+        if r.status_code == 304 and cached is not None:
+            with self.lock:
+                self.revalidated += 1
+            self.touch(key, cached[1])
+            return CachedResponse(url, cached[0], cached[1])
+        r.raise_for_status()
+        with self.lock:
+            self.misses += 1
+        meta = self.store(key, url, r.content, r.status_code, r.headers, r.encoding)
+        return CachedResponse(url, r.content, meta, from_cache=False)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated,
+                    "entries": len(self._index), "bytes": sum(v[0] for v in self._index.values())}
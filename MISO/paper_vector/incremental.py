@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Incremental topic_day scoring (score.py --incremental).
+
+Instead of rescoring the whole --days window every run, we persist per-topic
+windowed sum / sum-of-squares of the z-scored features, plus ring buffers of
+each finalized day's FR count, 14d comment rate and WH hits for the days
+still inside the window. A run scores only the days after the last finalized
+day and appends them to topic_day.csv:
+
+  - days < today are *finalized*: added to the sums and buffers and appended
+  - today is *provisional*: written after the finalized rows and truncated
+    away (via the saved byte offset) on the next run, since more filings can
+    still land today
+
+Days that leave the --days window are subtracted from the sums (a full run's
+14d rate is truncated at the window start, so the 13 days after a leaving
+day drop its FR count too), so a run costs O(new days x topics) whatever the
+window length, and the appended rows equal a full run's rows for those days.
+Counts are integers, so the sums never drift.
+
+topic_day.csv is trimmed lazily: rows are only rewritten once a whole month
+has left the window (score.py drops the Parquet month partitions the same
+way). Topics new to the lexicon start with an all-zero history; `--full`
+rebuilds the baseline, as does a change in --days or in topic_day's columns
+(the appended CSV keeps one header). Appended days are grouped by date at the
+tail of the file, not re-sorted by topic.
+"""
+import json, os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from features import (COMMENT_WINDOW, EO_WINDOW, TOPIC_DAY_COLUMNS,
+                      base_planes, count_cube, feature_arrays, rolling_sum, score_arrays, to_frame)
+
+Z_FEATURES = {"z_fr_notice": "fr_notice_count", "z_comment_rate": "comment_rate_14d"}
+BUFFERS = ["fr_notice_count", "comment_rate_14d", "wh_hits"]
+
+class ScoreState:
+    def __init__(self, path: str):
+        self.path = path
+        self.topics: List[str] = []
+        self.finalized: Optional[pd.Timestamp] = None
+        self.out_path: Optional[str] = None
+        self.csv_offset = 0
+        self.csv_first: Optional[pd.Timestamp] = None  # oldest day still in topic_day.csv
+        self.columns: List[str] = list(TOPIC_DAY_COLUMNS)
+        self.window = 0  # days scored per run (--days + 1, today included)
+        self.sums = np.zeros((0, len(Z_FEATURES)))
+        self.sumsq = np.zeros((0, len(Z_FEATURES)))
+        # ring buffers (buffer x topics x window-1 slots) of the finalized days in the window
+        self.buf = np.zeros((len(BUFFERS), 0, 0))
+        self.head = 0  # slot of the oldest buffered day
+        self.size = 0  # buffered days, ending at `finalized`
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ScoreState"]:
+        if not os.path.exists(path):
+            return None
+        st = cls(path)
+        with np.load(path, allow_pickle=False) as z:
+            if "buf" not in z:
+                return None  # state from an older layout: rebaseline
+            meta = json.loads(str(z["meta"]))
+            st.sums, st.sumsq, st.buf = z["sums"], z["sumsq"], z["buf"]
+        st.topics = meta["topics"]
+        st.finalized = pd.Timestamp(meta["finalized"])
+        st.out_path = meta["out_path"]
+        st.csv_offset = meta["csv_offset"]
+        st.csv_first = pd.Timestamp(meta["csv_first"])
+        st.columns = meta.get("columns", [])
+        st.window, st.head, st.size = meta["window"], meta["head"], meta["size"]
+        return st
+
+    def save(self) -> None:
+        meta = {"topics": self.topics, "finalized": str(self.finalized.date()), "out_path": self.out_path,
+                "csv_offset": self.csv_offset, "csv_first": str(self.csv_first.date()), "columns": self.columns,
+                "window": self.window, "head": self.head, "size": self.size}
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, meta=np.array(json.dumps(meta)), sums=self.sums, sumsq=self.sumsq, buf=self.buf)
+        os.replace(tmp, self.path)
+
+    def ensure_topics(self, topics: List[str]) -> None:
+        new = [t for t in topics if t not in set(self.topics)]
+        if not new:
+            return
+        k = len(new)
+        self.topics = self.topics + new
+        self.sums = np.vstack([self.sums, np.zeros((k, len(Z_FEATURES)))])
+        self.sumsq = np.vstack([self.sumsq, np.zeros((k, len(Z_FEATURES)))])
+        b, _, cap = self.buf.shape
+        self.buf = np.concatenate([self.buf, np.zeros((b, k, cap))], axis=1)
+
+    # ---- ring buffer ----
+    def slots(self, first: int, last: int) -> np.ndarray:
+        """Ring slots of buffered days first..last-1 (0 = oldest)."""
+        return (self.head + np.arange(first, last)) % self.buf.shape[2]
+
+    def tail(self, name: str, days: int) -> np.ndarray:
+        """Last `days` buffered values of one buffer (fewer when less is buffered), oldest first."""
+        k = min(days, self.size)
+        return self.buf[BUFFERS.index(name)][:, self.slots(self.size - k, self.size)]
+
+    def drop_before(self, start: pd.Timestamp) -> None:
+        """Subtract buffered days older than start from the sums, oldest first."""
+        fr, cr = BUFFERS.index("fr_notice_count"), BUFFERS.index("comment_rate_14d")
+        while self.size and self.finalized - pd.Timedelta(days=self.size - 1) < start:
+            j = self.head
+            gone = np.stack([self.buf[fr][:, j], self.buf[cr][:, j]], axis=1)
+            self.sums -= gone
+            self.sumsq -= gone ** 2
+            self.head = (self.head + 1) % self.buf.shape[2]
+            self.size -= 1
+            # a full run's 14d rate starts at the window start: the next days lose the dropped day's count
+            js = self.slots(0, min(self.size, COMMENT_WINDOW - 1))
+            old = self.buf[cr][:, js]
+            new = old - gone[:, :1]
+            self.sums[:, 1] += (new - old).sum(axis=1)
+            self.sumsq[:, 1] += (new ** 2 - old ** 2).sum(axis=1)
+            self.buf[cr][:, js] = new
+
+    def fold(self, f: Dict[str, np.ndarray], upto: int) -> None:
+        """Add the first `upto` days of feature planes to the sums and buffers."""
+        if upto <= 0:
+            return
+        js = self.slots(self.size, self.size + upto)
+        for i, name in enumerate(BUFFERS):
+            self.buf[i][:, js] = f[name][:, :upto]
+        z = np.stack([f[col][:, :upto] for col in Z_FEATURES.values()], axis=1)  # topics x features x days
+        self.sums += z.sum(axis=2)
+        self.sumsq += (z ** 2).sum(axis=2)
+        self.size += upto
+
+def _write(frame: pd.DataFrame, out_path: str, header: bool, mode: str) -> int:
+    frame.to_csv(out_path, index=False, header=header, mode=mode)
+    return os.path.getsize(out_path)
+
+def month_start(day: pd.Timestamp) -> pd.Timestamp:
+    return day.normalize().replace(day=1)
+
+def trim_csv(out_path: str, start: pd.Timestamp) -> int:
+    """Drop topic_day.csv rows dated before start (rows are kept byte for byte); returns the new size."""
+    first = start.strftime("%Y-%m-%d")
+    tmp = out_path + ".tmp"
+    with open(out_path, "r", newline="") as src, open(tmp, "w", newline="") as dst:
+        dst.write(src.readline())  # header
+        for line in src:
+            if line.split(",", 2)[1][:10] >= first:  # topic,date,... (topics are slugs)
+                dst.write(line)
+    os.replace(tmp, out_path)
+    return os.path.getsize(out_path)
+
+def baseline(events: pd.DataFrame, start: pd.Timestamp, today: pd.Timestamp,
+             out_path: str, state_path: str) -> pd.DataFrame:
+    """Full recompute; writes topic_day with today's rows last and seeds the state."""
+    topics = sorted(events["topic"].unique())
+    dates = pd.date_range(start, today, freq="D")
+    f = feature_arrays(count_cube(events, topics, dates))
+    feat = to_frame(f, topics, dates)
+    final = feat[feat["date"] < today]
+    offset = _write(final, out_path, header=True, mode="w")
+    _write(feat[feat["date"] >= today], out_path, header=False, mode="a")
+
+    st = ScoreState(state_path)
+    st.window = len(dates)
+    st.buf = np.zeros((len(BUFFERS), 0, st.window - 1))
+    st.ensure_topics(topics)
+    st.fold(f, upto=len(dates) - 1)
+    st.finalized = today - pd.Timedelta(days=1)
+    st.out_path, st.csv_offset, st.csv_first = out_path, offset, start
+    st.save()
+    return feat
+
+def update(state: ScoreState, events: pd.DataFrame, today: pd.Timestamp) -> pd.DataFrame:
+    """Score (finalized, today], append to state.out_path, advance the state. Returns new rows."""
+    state.ensure_topics(sorted(events["topic"].unique()))
+    dates = pd.date_range(state.finalized + pd.Timedelta(days=1), today, freq="D")
+    if len(dates) == 0:
+        return pd.DataFrame(columns=TOPIC_DAY_COLUMNS)
+    start = today - pd.Timedelta(days=state.window - 1)
+    state.drop_before(start)
+    f = base_planes(count_cube(events, state.topics, dates))
+
+    # rolling windows continue from the buffered days (all inside the window now)
+    for col, src, window in (("comment_rate_14d", "fr_notice_count", COMMENT_WINDOW),
+                             ("eo_hits_45d", "wh_hits", EO_WINDOW)):
+        hist = state.tail(src, window - 1)
+        f[col] = rolling_sum(np.concatenate([hist, f[src]], axis=1), window)[:, hist.shape[1]:]
+
+    # z over the window ending today: buffered sums + the new days (provisional included)
+    n = state.size + len(dates)
+    for j, (zcol, col) in enumerate(Z_FEATURES.items()):
+        mu = (state.sums[:, j] + f[col].sum(axis=1)) / n
+        var = np.maximum((state.sumsq[:, j] + (f[col] ** 2).sum(axis=1)) / n - mu ** 2, 0.0)
+        sd = np.sqrt(var)[:, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            f[zcol] = np.where(sd > 0, (f[col] - mu[:, None]) / sd, 0.0)
+    f["score"] = score_arrays(f)
+    new_rows = to_frame(f, state.topics, dates).sort_values(["date", "topic"], kind="stable")
+
+    with open(state.out_path, "r+b") as fh:
+        fh.truncate(state.csv_offset)  # drop last run's provisional day
+    if state.csv_first < month_start(start):  # a whole month has left the window
+        state.csv_first = month_start(start)
+        trim_csv(state.out_path, state.csv_first)
+    final = new_rows[new_rows["date"] < today]
+    state.csv_offset = _write(final, state.out_path, header=False, mode="a")
+    _write(new_rows[new_rows["date"] >= today], state.out_path, header=False, mode="a")
+
+    state.fold(f, upto=len(dates) - 1)
+    state.finalized = today - pd.Timedelta(days=1)
+    state.save()
+    return new_rows
+
+def score_incremental(events: pd.DataFrame, start: pd.Timestamp, today: pd.Timestamp,
+                      out_path: str, state_path: str, full: bool = False) -> pd.DataFrame:
+    """Entry point for score.py: incremental update if possible, else a fresh baseline."""
+    state = None if full else ScoreState.load(state_path)
+    window = (today - start).days + 1
+    if (state is None or state.out_path != out_path or not os.path.exists(out_path)
+            or os.path.getsize(out_path) < state.csv_offset or state.finalized >= today
+            or state.columns != TOPIC_DAY_COLUMNS or window < 2 or state.window != window
+            or (today - state.finalized).days > window):
+        return baseline(events, start, today, out_path, state_path)
+    return update(state, events, today)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Shared paper-vector ingestion: one fetch pass over FR, OIRA, the Unified
+Agenda and White House feeding both score.py (topic_day) and
+export_regulatory_filings_flat.py (filings_flat).
+
+fetch_documents() pulls every source once (concurrently, fanout.py), keeps
+the raw frames as the on-disk document set (relabel.save_raw -> raw_*
+datasets) and adds them to the full-text index (fts.py). Both outputs are
+derived from those same frames, either in one run
+
+  python3 score.py --flat-out filings_flat.csv
+
+or later from the stored documents without touching the network
+
+  python3 export_regulatory_filings_flat.py --from-raw
+"""
+import os, sys
+from io import StringIO
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from fetch import FetchEngine, default_engine
+from fanout import Source, fan_out, format_status
+from fr_store import FRStore, FR_COLUMNS, UNATTRIBUTED, fr_term, search_keywords
+from fts import index_frames
+from instrument import span
+from relabel import load_raw, save_raw
+from throttle import format_host_stats
+from unified_agenda import UA_COLUMNS, load_unified_agenda
+from whitehouse import WH_COLUMNS, pull_whitehouse_listings
+
+CACHE_DIR = "./cache"
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# ---- Federal Register ----
+def pull_federal_register(keywords:List[str], days:int=365, engine:FetchEngine=None,
+                          store:FRStore=None, full:bool=False)->pd.DataFrame:
+    # API docs: https://www.federalregister.gov/developers/documentation/api/v1
+    # With a store: incremental sync since each keyword's watermark, then read the window back.
+    # Without: stateless fetch of the whole window (still fully paginated).
+    engine = engine or default_engine()
+    start_date = (pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)).date().isoformat()
+    if store is not None:
+        store.sync(keywords, days=days, engine=engine, full=full)
+        return store.frame(keywords, since=start_date)
+
+    # batched OR searches (fr_store query planner), then dedupe in keyword order like the old serial loop
+    results = search_keywords(engine, {kw: start_date for kw in keywords})
+    unattributed: Dict[str, List[dict]] = {}
+    for d in results[UNATTRIBUTED]:  # under its batch's first keyword, the one that claimed it before
+        unattributed.setdefault(d["batch"][0], []).append(d)
+    rows, seen_ids = [], set()
+    for kw in keywords:
+        docs = results[kw]
+        if not isinstance(docs, Exception):
+            docs = docs + unattributed.get(kw, [])
+        if isinstance(docs, Exception):
+            print("[WARN] FR fetch failed for", fr_term(kw), "->", docs, file=sys.stderr)
+            continue
+        for d in docs:
+            if d["id"] in seen_ids:
+                continue
+            seen_ids.add(d["id"])
+            rows.append(d)
+    return pd.DataFrame(rows, columns=FR_COLUMNS)
+
+# ---- OIRA / Reginfo ----
+OIRA_COLUMNS = ["source","id","title","agency","stage","received","status","detail_url"]
+
+def pull_oira_under_review(days:int=365, engine:FetchEngine=None)->pd.DataFrame:
+    # Fallback: parse EO review page tables (no API key). 
+    url = "https://www.reginfo.gov/public/do/eoReviewSearch"
+    try:
+                # --- FIX: fetch HTML manually to avoid SSL verify errors with read_html(url) ---
+        html = (engine or default_engine()).get_text(url)
+        tables = pd.read_html(StringIO(html))
+    except Exception as e:
+        print("[WARN] Could not parse OIRA page:", e, file=sys.stderr)
+        return pd.DataFrame(columns=OIRA_COLUMNS)
+    frames = []
+    for t in tables:
+        cols = [str(c).lower() for c in t.columns]
+        if any("agency" in c for c in cols) and any("received" in c for c in cols):
+            df = t.copy()
+            df.columns = [str(c).strip().lower() for c in df.columns]
+            if "received" in df.columns:
+                df["received"] = pd.to_datetime(df["received"], errors="coerce")
+            cutoff = pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)
+            df = df[df["received"] >= cutoff]
+            df["source"] = "OIRA"
+            df["id"] = df["rin"] if "rin" in df.columns else None
+            df["title"] = df["title"] if "title" in df.columns else df.get("subject")
+            df["agency"] = df.get("agency")
+            df["stage"] = df.get("stage")
+            df["status"] = df.get("status")
+            df["detail_url"] = None
+            frames.append(df[OIRA_COLUMNS])
+    if not frames:
+        return pd.DataFrame(columns=OIRA_COLUMNS)
+    return pd.concat(frames, ignore_index=True).drop_duplicates()
+
+def pull_unified_agenda_xml(engine:FetchEngine=None)->pd.DataFrame:
+    # Every agenda edition, streamed to disk and parsed incrementally (unified_agenda.py)
+    return load_unified_agenda(os.path.join(CACHE_DIR, "ua_xml"), engine)
+
+# ---- White House ----
+def pull_whitehouse(days:int=365, engine:FetchEngine=None)->pd.DataFrame:
+    # Post cards from the paginated archive listings, deduped by URL (whitehouse.py)
+    return pull_whitehouse_listings(days=days, engine=engine)
+
+SOURCE_NAMES = ["FR", "OIRA", "UA", "WH"]
+
+def make_sources(keywords:List[str], days:int, fr_store:FRStore=None, full:bool=False)->List[Source]:
+    return [
+        Source("FR", lambda e: pull_federal_register(keywords, days=days, engine=e, store=fr_store, full=full), FR_COLUMNS),
+        Source("OIRA", lambda e: pull_oira_under_review(days=days, engine=e), OIRA_COLUMNS),
+        Source("UA", pull_unified_agenda_xml, UA_COLUMNS),
+        Source("WH", lambda e: pull_whitehouse(days=days, engine=e), WH_COLUMNS),
+    ]
+
+def fetch_documents(keywords: List[str], days: int, fr_store: Optional[FRStore] = None, full: bool = False,
+                    concurrency: Optional[int] = None, rate: Optional[float] = None, budget: Optional[float] = None,
+                    csv: bool = False) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict]]:
+    """
+    Pull every source once; returns (frames keyed by SOURCE_NAMES, per-source status).
+    The frames are stored as the raw document layer (CSV exports too with csv=True)
+    and indexed for full-text search before they are returned.
+    """
+    # the four sources run concurrently, each with its own limits and time budget (fanout.py)
+    with span("fetch", rows_in=len(keywords)) as s:
+        frames, status = fan_out(make_sources(keywords, days, fr_store, full),
+                                 concurrency=concurrency, rate=rate, budget=budget)
+        s.rows(out=sum(len(f) for f in frames.values()))
+    print("[INFO] sources:", format_status(status), file=sys.stderr)
+    print("[INFO] hosts:", format_host_stats(), file=sys.stderr)
+    # raw documents are always kept (Parquet) so a lexicon edit can relabel without refetching,
+    # and new ones are added to the full-text index for ad-hoc keyword queries (fts.py)
+    with span("write.raw", rows_in=sum(len(f) for f in frames.values())):
+        save_raw(frames, csv=csv)
+        index_frames(frames)
+    return frames, status
+
+def load_documents() -> Dict[str, pd.DataFrame]:
+    """The document set stored by the last fetch_documents() (no network)."""
+    return load_raw()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Lightweight run instrumentation: per-stage wall time, counters, rows in/out
+and tracemalloc peak, emitted as a JSON report by `--profile`.
+
+  from instrument import span, count, add_profile_argument, start_profile, finish_profile
+  with span("fetch.fr") as s:
+      df = pull(...)
+      s.rows(out=len(df))
+  count("http_requests")            # attributed to every open span + run totals
+
+Linear top-level scripts (no main()) can use stage("name") instead: it
+closes the previous stage opened with stage() and opens the next one.
+
+Everything is a no-op until start_profile() is called, so the calls can stay
+in hot paths. Counters may be bumped from worker threads (fetch.py does);
+they are attributed to the spans open on the main pipeline at that moment.
+"""
+import json, os, sys, threading, time, tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+MB = 1 << 20
+
+class Span:
+    def __init__(self, name: str, path: str, rows_in: Optional[int] = None):
+        self.name, self.path = name, path
+        self.rows_in: Optional[int] = rows_in
+        self.rows_out: Optional[int] = None
+        self.counters: Dict[str, float] = {}
+        self.peak = 0
+        self.t0 = time.perf_counter()
+        self.wall = 0.0
+
+    def rows(self, **kw) -> "Span":
+        """rows(in_=n) / rows(out=n)."""
+        if "in_" in kw:
+            self.rows_in = int(kw["in_"])
+        if "out" in kw:
+            self.rows_out = int(kw["out"])
+        return self
+
+    def count(self, key: str, n: float = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def as_dict(self) -> Dict:
+        d = {"stage": self.path, "wall_s": round(self.wall, 6), "rows_in": self.rows_in, "rows_out": self.rows_out}
+        if tracemalloc.is_tracing():
+            d["peak_mb"] = round(self.peak / MB, 3)
+        d.update(self.counters)
+        return d
+
+class _NullSpan:
+    def rows(self, **kw):
+        return self
+    def count(self, key, n=1):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.stack: List[Span] = []
+        self.done: List[Span] = []
+        self.totals: Dict[str, float] = {}
+        self._stage: Optional[Span] = None
+        self._lock = threading.Lock()
+        self.t0 = time.perf_counter()
+        self.run_peak = 0
+
+    def start(self, trace_memory: bool = True) -> None:
+        self.enabled = True
+        self.t0 = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _sample_peak(self) -> None:
+        """Fold the tracemalloc peak since the last sample into every open span."""
+        if not tracemalloc.is_tracing():
+            return
+        _, peak = tracemalloc.get_traced_memory()
+        for s in self.stack:
+            s.peak = max(s.peak, peak)
+        self.run_peak = max(self.run_peak, peak)
+        tracemalloc.reset_peak()
+
+    def open(self, name: str, rows_in: Optional[int] = None) -> Span:
+        with self._lock:
+            self._sample_peak()
+            path = "/".join([s.name for s in self.stack] + [name])
+            s = Span(name, path, rows_in)
+            if tracemalloc.is_tracing():
+                s.peak = tracemalloc.get_traced_memory()[0]
+            self.stack.append(s)
+            return s
+
+    def close(self, s: Span) -> None:
+        with self._lock:
+            self._sample_peak()
+            s.wall = time.perf_counter() - s.t0
+            if s in self.stack:
+                self.stack.remove(s)
+            self.done.append(s)
+
+    @contextmanager
+    def span(self, name: str, rows_in: Optional[int] = None):
+        if not self.enabled:
+            yield NULL_SPAN
+            return
+        s = self.open(name, rows_in)
+        try:
+            yield s
+        finally:
+            self.close(s)
+
+    def stage(self, name: Optional[str]):
+        """Sequential stages for linear scripts; stage(None) just closes the current one."""
+        if not self.enabled:
+            return NULL_SPAN
+        if self._stage is not None:
+            self.close(self._stage)
+            self._stage = None
+        if name is not None:
+            self._stage = self.open(name)
+            return self._stage
+        return NULL_SPAN
+
+    def count(self, key: str, n: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.totals[key] = self.totals.get(key, 0) + n
+            for s in self.stack:
+                s.count(key, n)
+
+    def report(self) -> Dict:
+        self.stage(None)
+        with self._lock:
+            self._sample_peak()
+        rep = {
+            "script": os.path.basename(sys.argv[0]),
+            "argv": sys.argv[1:],
+            "wall_s": round(time.perf_counter() - self.t0, 6),
+            "counters": self.totals,
+            "stages": [s.as_dict() for s in sorted(self.done, key=lambda s: s.t0)],
+        }
+        if tracemalloc.is_tracing():
+            rep["peak_mb"] = round(self.run_peak / MB, 3)
+        return rep
+
+PROFILER = Profiler()
+
+def span(name: str, rows_in: Optional[int] = None):
+    return PROFILER.span(name, rows_in)
+
+def stage(name: Optional[str]):
+    return PROFILER.stage(name)
+
+def count(key: str, n: float = 1) -> None:
+    PROFILER.count(key, n)
+
+def add_profile_argument(ap) -> None:
+    ap.add_argument("--profile", nargs="?", const="", default=None, metavar="PATH",
+                    help="Record per-stage time/counters/peak memory and write a JSON report (default: profile_<script>.json)")
+
+def start_profile(path: Optional[str]) -> None:
+    """Enable instrumentation when --profile was given (path may be '')."""
+    if path is not None:
+        PROFILER.start()
+
+def finish_profile(path: Optional[str]) -> Optional[Dict]:
+    """Write the JSON report and a one-line-per-stage summary to stderr."""
+    if path is None or not PROFILER.enabled:
+        return None
+    rep = PROFILER.report()
+    out = path or f"profile_{os.path.splitext(rep['script'])[0]}.json"
+    with open(out, "w") as f:
+        json.dump(rep, f, indent=2)
+    for s in rep["stages"]:
+        extra = "".join(f" {k}={v:g}" for k, v in s.items()
+                        if k not in ("stage", "wall_s", "rows_in", "rows_out", "peak_mb") and isinstance(v, (int, float)))
+        rows = f" rows {s['rows_in'] if s['rows_in'] is not None else '-'}->{s['rows_out'] if s['rows_out'] is not None else '-'}"
+        peak = f" peak {s['peak_mb']:.1f}MB" if "peak_mb" in s else ""
+        print(f"[PROFILE] {s['stage']:<28}{s['wall_s']:>9.3f}s{rows}{peak}{extra}", file=sys.stderr)
+    print(f"[OK] wrote {out}", file=sys.stderr)
+    return rep
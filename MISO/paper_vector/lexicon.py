@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+lexicon.yaml loading and per-topic fingerprints.
+
+Two layouts are accepted:
+
+  data_center:                       category: Data Centers
+    include: [data center, ...]      keywords: [data center, ...]
+  cooling:                           (or a list of such category blocks)
+    include: [...]
+
+Category blocks become topics named after the category slug
+("Data Centers" -> data_centers). Keywords are lowercased.
+
+A topic's fingerprint is a hash of its normalized keyword set, so editing
+one topic's keywords changes only that topic's fingerprint (relabel.py).
+"""
+import hashlib, re
+from typing import Dict, List, Set, Tuple
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+
+def _category(block: Dict) -> Tuple[str, List[str]]:
+    return slug(block["category"]), [str(s).lower() for s in block.get("keywords") or []]
+
+def parse_lexicon(raw) -> Dict[str, List[str]]:
+    """topic -> lowercased keywords, from either lexicon layout."""
+    if isinstance(raw, list):
+        return dict(_category(b) for b in raw)
+    if isinstance(raw, dict) and "keywords" in raw and not isinstance(raw["keywords"], dict):
+        return dict([_category(raw)])
+    return {k: [str(s).lower() for s in (v or {}).get("include", [])] for k, v in (raw or {}).items()}
+
+def load_lexicon(path: str = "lexicon.yaml") -> Dict[str, List[str]]:
+    import yaml
+    with open(path, "r") as f:
+        return parse_lexicon(yaml.safe_load(f))
+
+def all_keywords(lex: Dict[str, List[str]]) -> List[str]:
+    return sorted({kw for kws in lex.values() for kw in kws})
+
+def topic_fingerprints(lex: Dict[str, List[str]]) -> Dict[str, str]:
+    """topic -> sha1 of its sorted, de-duplicated keyword set (order and repeats don't matter)."""
+    return {t: hashlib.sha1("\n".join(sorted(set(kws))).encode("utf-8")).hexdigest()[:16]
+            for t, kws in lex.items()}
+
+def changed_topics(old: Dict[str, str], new: Dict[str, str]) -> Tuple[Set[str], Set[str]]:
+    """(topics added or edited, topics removed) between two fingerprint maps."""
+    return {t for t, fp in new.items() if old.get(t) != fp}, set(old) - set(new)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Lexicon-compiled multi-keyword matcher shared by score.py and
+export_regulatory_filings_flat.py.
+
+Titles are normalized the way keyword_count_in_title always did (lowercase,
+punctuation -> space) and split into tokens on spaces/hyphens. Every
+keyword is compiled into token sequences covering the matching rules:
+  - 'data center' ~ 'data-center' ~ 'datacenter'
+  - simple plurals on the last token ('agreement' ~ 'agreements', 'box' ~ 'boxes')
+All variants go into one Aho-Corasick automaton over tokens, so a title is
+matched in a single left-to-right pass regardless of lexicon size, and
+overlapping keywords ('power' inside 'power purchase agreement') all hit.
+"""
+import itertools, re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+import numpy as np
+import pandas as pd
+
+_PUNCT_RE = re.compile(r"[^\w\s\-]")
+_SPLIT_RE = re.compile(r"[\s\-]+")
+PLURAL_SUFFIXES = ("", "s", "es")
+
+def tokenize(text: str) -> List[str]:
+    if not isinstance(text, str):
+        return []
+    text = _PUNCT_RE.sub(" ", text.lower())
+    return [t for t in _SPLIT_RE.split(text) if t]
+
+_WORD_END_RE = re.compile(r"\w\Z")
+
+def iter_tokens(chunks: Iterable[str]) -> Iterator[str]:
+    """tokenize() over a stream of text chunks; a token cut at a chunk boundary is carried into the next."""
+    carry = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        toks = tokenize(carry + chunk)
+        carry = toks.pop() if toks and _WORD_END_RE.search(chunk) else ""
+        yield from toks
+    if carry:
+        yield carry
+
+def keyword_variants(kw: str) -> Set[Tuple[str, ...]]:
+    """All token sequences that count as a hit for kw."""
+    toks = tokenize(kw)
+    if not toks:
+        return set()
+    out = set()
+    # every way of gluing adjacent tokens together ('data center' -> 'datacenter')
+    for glue in itertools.product((False, True), repeat=len(toks) - 1):
+        seq = [toks[0]]
+        for tok, g in zip(toks[1:], glue):
+            if g:
+                seq[-1] += tok
+            else:
+                seq.append(tok)
+        for suf in PLURAL_SUFFIXES:
+            out.add(tuple(seq[:-1]) + (seq[-1] + suf,))
+    return out
+
+class LexiconMatcher:
+    """
+    m = LexiconMatcher({"topic": ["data center", "hyperscale"], ...})
+    m.keywords_in(title)      -> {"data center"}
+    m.topics_in(title)        -> ["topic"]         (lexicon order)
+    m.topic_matrix(series)    -> bool DataFrame, one column per topic
+    m.keyword_counts(series)  -> int Series of unique keyword hits per title
+    m.keywords_in_stream(chunks) -> keywords in a long text read chunk by chunk
+    """
+    def __init__(self, lex: Dict[str, Sequence[str]]):
+        self.topics: List[str] = list(lex.keys())
+        self.keywords: List[str] = sorted({kw for kws in lex.values() for kw in kws if kw and kw.strip()})
+        kw_id = {kw: i for i, kw in enumerate(self.keywords)}
+        # keyword x topic incidence, for turning keyword hits into topic hits
+        self.kw_topic = np.zeros((len(self.keywords), len(self.topics)), dtype=bool)
+        for j, topic in enumerate(self.topics):
+            for kw in lex[topic]:
+                if kw in kw_id:
+                    self.kw_topic[kw_id[kw], j] = True
+        self._build(kw_id)
+
+    # ---- Aho-Corasick over tokens ----
+    def _build(self, kw_id: Dict[str, int]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        out: List[Set[int]] = [set()]
+        for kw, i in kw_id.items():
+            for seq in keyword_variants(kw):
+                node = 0
+                for tok in seq:
+                    nxt = goto[node].get(tok)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][tok] = nxt
+                        goto.append({})
+                        out.append(set())
+                    node = nxt
+                out[node].add(i)
+        fail = [0] * len(goto)
+        q = deque(goto[0].values())
+        while q:
+            node = q.popleft()
+            for tok, nxt in goto[node].items():
+                q.append(nxt)
+                f = fail[node]
+                while f and tok not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(tok, 0) if goto[f].get(tok, 0) != nxt else 0
+                out[nxt] |= out[fail[nxt]]
+        self._goto, self._fail = goto, fail
+        self._out = [frozenset(o) for o in out]
+
+    def _match_ids(self, tokens: Iterable[str]) -> Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node, hits = 0, set()
+        for tok in tokens:
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            if out[node]:
+                hits |= out[node]
+        return hits
+
+    # ---- single title ----
+    def keywords_in(self, title: str) -> Set[str]:
+        return {self.keywords[i] for i in self._match_ids(tokenize(title))}
+
+    def keywords_in_stream(self, chunks: Iterable[str]) -> Set[str]:
+        """keywords_in over text arriving in chunks; the automaton state runs across chunk boundaries."""
+        return {self.keywords[i] for i in self._match_ids(iter_tokens(chunks))}
+
+    def keyword_count(self, title: str) -> int:
+        return len(self._match_ids(tokenize(title)))
+
+    def topics_in(self, title: str) -> List[str]:
+        ids = list(self._match_ids(tokenize(title)))
+        if not ids:
+            return []
+        hit = self.kw_topic[ids].any(axis=0)
+        return [t for t, h in zip(self.topics, hit) if h]
+
+    # ---- batch ----
+    def keyword_matrix(self, titles: pd.Series) -> np.ndarray:
+        """(len(titles), n_keywords) bool matrix. Each distinct title is matched once."""
+        codes, uniques = pd.factorize(pd.Series(titles).fillna("").astype(str), sort=False)
+        mat = np.zeros((len(uniques), len(self.keywords)), dtype=bool)
+        for r, title in enumerate(uniques):
+            ids = self._match_ids(tokenize(title))
+            if ids:
+                mat[r, list(ids)] = True
+        return mat[codes] if len(codes) else np.zeros((0, len(self.keywords)), dtype=bool)
+
+    def topic_matrix(self, titles: pd.Series) -> pd.DataFrame:
+        kw = self.keyword_matrix(titles)
+        topic_hits = (kw.astype(np.uint8) @ self.kw_topic.astype(np.uint8)) > 0
+        return pd.DataFrame(topic_hits, columns=self.topics, index=pd.Series(titles).index)
+
+    def keyword_counts(self, titles: pd.Series) -> pd.Series:
+        return pd.Series(self.keyword_matrix(titles).sum(axis=1), index=pd.Series(titles).index, dtype="int64")
+
+def _lex_key(lex: Dict[str, Sequence[str]]) -> Tuple:
+    return tuple((t, tuple(kws)) for t, kws in lex.items())
+
+@lru_cache(maxsize=16)
+def _compile(key: Tuple) -> LexiconMatcher:
+    return LexiconMatcher({t: list(kws) for t, kws in key})
+
+def compile_lexicon(lex: Dict[str, Sequence[str]]) -> LexiconMatcher:
+    """Memoized LexiconMatcher for a lexicon dict (topic -> keywords)."""
+    return _compile(_lex_key(lex))
+
+def compile_keywords(keywords: Sequence[str]) -> LexiconMatcher:
+    """Matcher for a flat keyword list (one pseudo-topic per keyword)."""
+    return _compile(tuple((kw, (kw,)) for kw in keywords))
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import pandas as pd
 import matplotlib.pyplot as plt
+from storage import read_dataset
 
 # Load the trimmed file created by backtest_prep.py
-df = pd.read_csv("filings_hist.csv", parse_dates=["date"])
+df = read_dataset("filings_hist", columns=["date","keyword_count"])
 
 # Monthly aggregates
 monthly_filings = df.resample("M", on="date").size().rename("filings_count")
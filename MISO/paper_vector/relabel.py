@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Raw-document layer and label state for relabel-without-refetch
+(`score.py --relabel`).
+
+Every score.py run keeps each source's raw pull (storage datasets raw_fr /
+raw_oira / raw_ua / raw_wh), the labeled (date, topic, source) events and
+cache/label_state.json: one fingerprint per lexicon topic (lexicon.py) plus
+the FR search keywords the stored documents cover. After a lexicon edit,
+`--relabel` diffs fingerprints, relabels only added/edited topics from the
+stored documents, drops removed ones and rescores just those topics; every
+other topic's events and topic_day rows are reused as they are.
+
+OIRA, UA and WH pulls are not keyword-filtered, so their documents cover any
+lexicon. FR documents are searched per keyword: hits for a keyword that was
+never searched are missing until the next fetching run (reported, not fatal).
+"""
+import json, os
+from typing import Dict, Iterable, List, Optional, Set
+import pandas as pd
+from lexicon import topic_fingerprints
+from storage import DATASETS, HAVE_PARQUET, read_dataset, write_dataset
+
+RAW_DATASETS = {"FR": "raw_fr", "OIRA": "raw_oira", "UA": "raw_ua", "WH": "raw_wh"}
+LABEL_STATE = os.path.join("cache", "label_state.json")
+
+def persist(df: pd.DataFrame, name: str, csv: bool = False) -> None:
+    """Parquet dataset, plus the CSV export when asked for (or when it is the only store)."""
+    if csv or not HAVE_PARQUET:
+        df.to_csv(DATASETS[name]["csv"], index=False)
+    write_dataset(df, name)
+
+def save_raw(frames: Dict[str, pd.DataFrame], csv: bool = False) -> None:
+    for src, name in RAW_DATASETS.items():
+        if src in frames:
+            persist(frames[src], name, csv)
+
+def load_raw() -> Dict[str, pd.DataFrame]:
+    return {src: read_dataset(name) for src, name in RAW_DATASETS.items()}
+
+def load_label_state(path: str = LABEL_STATE) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_labels(events: pd.DataFrame, lex: Dict[str, List[str]], fr_keywords: Iterable[str],
+                csv: bool = False, path: str = LABEL_STATE) -> None:
+    """Store labeled events with the lexicon fingerprints they were labeled under."""
+    persist(events, "events_labeled", csv)
+    state = {"fingerprints": topic_fingerprints(lex), "fr_keywords": sorted(set(fr_keywords))}
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, path)
+
+def replace_topics(old: pd.DataFrame, new: pd.DataFrame, topics: Set[str]) -> pd.DataFrame:
+    """old without `topics`, plus new (sorted by topic, date like a full build)."""
+    keep = old[~old["topic"].isin(topics)]
+    parts = [p for p in (keep, new) if not p.empty]
+    out = pd.concat(parts, ignore_index=True) if parts else new.iloc[:0]
+    return out.sort_values(["topic", "date"], kind="stable").reset_index(drop=True)
@@ -1,162 +1,70 @@
 #!/usr/bin/env python3
-import os, sys, time, json, math, argparse, re
-import datetime as dt
+import os, sys, argparse
 from typing import List, Dict
+import numpy as np
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlencode, quote_plus
-from io import StringIO
-
-
-CACHE_DIR = "./cache"
-os.makedirs(CACHE_DIR, exist_ok=True)
-
-def load_lexicon(path="lexicon.yaml")->Dict[str, List[str]]:
-    import yaml
-    with open(path, "r") as f:
-        raw = yaml.safe_load(f)
-    return {k: [s.lower() for s in v.get("include", [])] for k,v in raw.items()}
-
-# ---- Federal Register ----
-def pull_federal_register(keywords:List[str], days:int=365)->pd.DataFrame:
-    # API docs: https://www.federalregister.gov/developers/documentation/api/v1
-    base = "https://www.federalregister.gov/api/v1/documents.json"
-    start_date = (pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)).date().isoformat()
-    params = {
-        "per_page": 250,
-        "order": "newest",
-        "conditions[publication_date][gte]": start_date,
-    }
-    rows, seen_ids = [], set()
-    for kw in keywords:
-        q = params.copy()
-        if " " in kw: kw = f'"{kw}"'
-        q["conditions[term]"] = kw
-        url = f"{base}?{urlencode(q, quote_via=quote_plus)}"
-        try:
-            r = requests.get(url, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            for d in data.get("results", []):
-                if d.get("document_number") in seen_ids:
-                    continue
-                seen_ids.add(d.get("document_number"))
-                rows.append({
-                    "source":"FR",
-                    "id": d.get("document_number"),
-                    "title": d.get("title"),
-                    "agencies": ", ".join([a.get("name","") for a in d.get("agencies", [])]) if d.get("agencies") else None,
-                    "publication_date": d.get("publication_date"),
-                    "type": d.get("type"),
-                    "comments_close_on": d.get("comments_close_on"),
-                    "html_url": d.get("html_url"),
-                })
-            time.sleep(0.25)
-        except Exception as e:
-            print("[WARN] FR fetch failed for", kw, "->", e, file=sys.stderr)
-            continue
-    return pd.DataFrame(rows)
-
-# ---- OIRA / Reginfo ----
-def pull_oira_under_review(days:int=365)->pd.DataFrame:
-    # Fallback: parse EO review page tables (no API key). 
-    url = "https://www.reginfo.gov/public/do/eoReviewSearch"
-    try:
-                # --- FIX: fetch HTML manually to avoid SSL verify errors with read_html(url) ---
-        html = requests.get(url, timeout=30).text
-        tables = pd.read_html(StringIO(html))
-    except Exception as e:
-        print("[WARN] Could not parse OIRA page:", e, file=sys.stderr)
-        return pd.DataFrame(columns=["source","id","title","agency","stage","received","status","detail_url"])
-    frames = []
-    for t in tables:
-        cols = [str(c).lower() for c in t.columns]
-        if any("agency" in c for c in cols) and any("received" in c for c in cols):
-            df = t.copy()
-            df.columns = [str(c).strip().lower() for c in df.columns]
-            if "received" in df.columns:
-                df["received"] = pd.to_datetime(df["received"], errors="coerce")
-            cutoff = pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)
-            df = df[df["received"] >= cutoff]
-            df["source"] = "OIRA"
-            df["id"] = df["rin"] if "rin" in df.columns else None
-            df["title"] = df["title"] if "title" in df.columns else df.get("subject")
-            df["agency"] = df.get("agency")
-            df["stage"] = df.get("stage")
-            df["status"] = df.get("status")
-            df["detail_url"] = None
-            frames.append(df[["source","id","title","agency","stage","received","status","detail_url"]])
-    if not frames:
-        return pd.DataFrame(columns=["source","id","title","agency","stage","received","status","detail_url"])
-    return pd.concat(frames, ignore_index=True).drop_duplicates()
-
-def pull_unified_agenda_xml()->pd.DataFrame:
-    # Optional: gather a small sample of UA XML. 
-    index_url = "https://www.reginfo.gov/public/do/eAgendaXmlReport"
-    try:
-        html = requests.get(index_url, timeout=30).text
-        soup = BeautifulSoup(html, "html.parser")
-        links = [a.get("href") for a in soup.find_all("a") if a.get("href","").lower().endswith(".xml")]
-        links = links[:5]
-        rows = []
-        for link in links:
-            if not link.startswith("http"):
-                link = "https://www.reginfo.gov" + link
-            try:
-                xml = requests.get(link, timeout=30).text
-                for m in re.finditer(r"<Title>(.*?)</Title>.*?<RIN>(.*?)</RIN>.*?<Agency>(.*?)</Agency>.*?<Stage>(.*?)</Stage>", xml, re.S):
-                    title = BeautifulSoup(m.group(1), "xml").text
-                    rin = BeautifulSoup(m.group(2), "xml").text
-                    agency = BeautifulSoup(m.group(3), "xml").text
-                    stage = BeautifulSoup(m.group(4), "xml").text
-                    rows.append({"source":"UA","id":rin,"title":title,"agency":agency,"stage":stage,"date":pd.Timestamp.utcnow().normalize()})
-            except Exception as e:
-                print("[WARN] UA subfetch failed:", e, file=sys.stderr)
-        return pd.DataFrame(rows)
-    except Exception as e:
-        print("[WARN] UA index fetch failed:", e, file=sys.stderr)
-        return pd.DataFrame(columns=["source","id","title","agency","stage","date"])
-
-# ---- White House ----
-def pull_whitehouse(days:int=365)->pd.DataFrame:
-    pages = [
-        "https://www.whitehouse.gov/presidential-actions/executive-orders/",
-        "https://www.whitehouse.gov/briefings-statements/",
-        "https://www.whitehouse.gov/presidential-actions/"
-    ]
-    rows = []
-    cutoff = (pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=days)).date()
-    for url in pages:
-        try:
-            html = requests.get(url, timeout=30).text
-            soup = BeautifulSoup(html, "html.parser")
-            for item in soup.find_all(["article","li","div","a"]):
-                text = item.get_text(" ", strip=True)
-                if not text or len(text) < 20:
-                    continue
-                m = re.search(r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}", text)
-                if m:
-                    d = pd.to_datetime(m.group(0), errors="coerce")
-                    if pd.notna(d) and d.date() >= cutoff:
-                        href = item.get("href")
-                        rows.append({
-                            "source":"WH",
-                            "title": text[:200],
-                            "date": d.date(),
-                            "url": href if href and href.startswith("http") else url
-                        })
-        except Exception as e:
-            print("[WARN] WhiteHouse scrape failed for", url, "->", e, file=sys.stderr)
-    return pd.DataFrame(rows)
+from fetch import DEFAULT_CONCURRENCY, DEFAULT_RATE, configure as configure_fetch
+from lexicon import changed_topics, load_lexicon, topic_fingerprints
+from matcher import LexiconMatcher, compile_lexicon
+from features import BODY_COLUMNS, BODY_SOURCES, PRE_SCORE_COLUMNS, TOPIC_DAY_COLUMNS, build_features
+from incremental import score_incremental
+from fr_store import FRStore
+from fr_text import body_events, text_engine
+from ingest import CACHE_DIR, SOURCE_NAMES, fetch_documents, load_documents
+from export_regulatory_filings_flat import DEFAULT_AGENCY_PATTERN, write_flat
+from storage import read_dataset, trim_dataset, upsert_dataset, write_dataset
+from relabel import load_label_state, replace_topics, save_labels
+from instrument import add_profile_argument, finish_profile, span, start_profile
+
+
+SCORE_STATE = os.path.join(CACHE_DIR, "score_state.npz")
 
 def label_topic(title:str, lex:Dict[str, List[str]]):
-    t = (title or "").lower()
-    hits = []
-    for topic, kws in lex.items():
-        if any(kw in t for kw in kws):
-            hits.append(topic)
-    return hits
+    # one pass over the title via the compiled lexicon automaton (matcher.py)
+    return compile_lexicon(lex).topics_in(title)
+
+EVENT_COLUMNS = ["date","topic","source"]
+
+def to_day(values)->pd.Series:
+    """Parse a date column once; tz-aware values become naive UTC days."""
+    d = pd.to_datetime(pd.Series(values), errors="coerce", utc=True)
+    return d.dt.tz_convert(None).dt.normalize()
+
+def label_events(df:pd.DataFrame, date_col:str, title_col:str, source_col:str, matcher:LexiconMatcher)->pd.DataFrame:
+    """
+    Columnar labeling: parse dates once per column, build the (rows x topics)
+    hit matrix in bulk, then emit one (date, topic, source) row per hit.
+    Row order matches the old per-row loop (input order, topics in lexicon order).
+    """
+    if df is None or df.empty or date_col not in df.columns:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    dates = to_day(df[date_col].to_numpy())
+    keep = dates.notna().to_numpy()
+    if not keep.any():
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    titles = df[title_col].to_numpy()[keep] if title_col in df.columns else np.full(keep.sum(), "")
+    hits = matcher.topic_matrix(pd.Series(titles)).to_numpy()
+    rows, cols = np.nonzero(hits)
+    sources = df[source_col].to_numpy()[keep] if source_col in df.columns else np.full(keep.sum(), None)
+    return pd.DataFrame({
+        "date": dates.to_numpy()[keep][rows],
+        "topic": np.asarray(matcher.topics, dtype=object)[cols],
+        "source": sources[rows],
+    })
+
+def label_source(name:str, df:pd.DataFrame, matcher:LexiconMatcher)->pd.DataFrame:
+    """Events for one source's raw pull (each source keeps its date in a different column)."""
+    if name == "FR":
+        return label_events(df, "publication_date", "title", "source", matcher)
+    if name == "OIRA" and not df.empty:
+        df = df.rename(columns={"received":"date"})
+    if name == "UA" and not df.empty and "date" not in df.columns:
+        df = df.assign(date=pd.Timestamp.utcnow().normalize())
+    return label_events(df, "date", "title", "source", matcher)
+
+def concat_events(parts)->pd.DataFrame:
+    parts = [p for p in parts if not p.empty]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=EVENT_COLUMNS)
 
 def zscore(series: pd.Series)->pd.Series:
     mu, sd = series.mean(), series.std(ddof=0)
@@ -170,54 +78,122 @@ def main():
     ap.add_argument("--out", type=str, default="topic_day.csv")
     ap.add_argument("--dump", action="store_true",
                 help="Dump intermediate CSVs (raw pulls, labeled events, pre-score features)")
+    ap.add_argument("--concurrency", type=int, default=None,
+                    help="Parallel HTTP requests per source (default: per-source limits in fanout.py)")
+    ap.add_argument("--rate", type=float, default=None,
+                    help="Max requests/second per source (default: per-source limits in fanout.py)")
+    ap.add_argument("--budget", type=float, default=None,
+                    help="Wall-clock seconds allowed per source pull (default: per-source budgets in fanout.py)")
+    ap.add_argument("--offline", action="store_true", help="Replay responses from the cache only (no network)")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the on-disk response cache")
+    ap.add_argument("--cache-max-mb", type=int, default=512, help="LRU size bound for the response cache")
+    ap.add_argument("--full-resync", action="store_true", help="Ignore FR watermarks and re-pull the whole window")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Score only days since the last run and append them to --out (keeps running per-topic stats)")
+    ap.add_argument("--full-recompute", action="store_true",
+                    help="With --incremental: rebuild topic_day and the stored window from scratch")
+    ap.add_argument("--flat-out", type=str, default=None,
+                    help="Also write the agency-filtered filings_flat export from the same fetch (e.g. filings_flat.csv)")
+    ap.add_argument("--agency", type=str, default=DEFAULT_AGENCY_PATTERN,
+                    help="With --flat-out: pipe-separated agency terms (see export_regulatory_filings_flat.py)")
+    ap.add_argument("--relabel", action="store_true",
+                    help="After a lexicon.yaml edit: relabel/rescore only changed topics from stored raw documents (no fetch)")
+    ap.add_argument("--fr-text", action="store_true",
+                    help="Also download FR document bodies (cached gzipped in ./cache/fr_text) and add "
+                         "fr_body_count / fr_body_only_count to topic_day (fr_text.py)")
+
+    add_profile_argument(ap)
 
     args = ap.parse_args()
+    start_profile(args.profile)
+    try:
+        run(args)
+    finally:
+        finish_profile(args.profile)
+
+def relabel(args, lex):
+    """--relabel: relabel and rescore only the topics whose keyword sets changed, from stored documents."""
+    state = load_label_state()
+    if state is None:
+        print("[WARN] No stored labels yet; run score.py once without --relabel.", file=sys.stderr)
+        return
+    changed, removed = changed_topics(state["fingerprints"], topic_fingerprints(lex))
+    if not changed and not removed:
+        print("[OK] lexicon unchanged; nothing to relabel")
+        return
+    unsearched = sorted({kw for t in changed for kw in lex[t]} - set(state["fr_keywords"]))
+    if unsearched:
+        print(f"[WARN] {len(unsearched)} keyword(s) never searched on FR (e.g. {', '.join(unsearched[:5])}); "
+              "their FR hits are missing until the next run without --relabel", file=sys.stderr)
+
+    with span("relabel.load") as s:
+        frames = load_documents()
+        old_events = read_dataset("events_labeled")
+        old_feat = read_dataset("topic_day")
+        s.rows(out=sum(len(f) for f in frames.values()))
+    with span("label", rows_in=sum(len(f) for f in frames.values())) as s:
+        matcher = compile_lexicon({t: kws for t, kws in lex.items() if t in changed})
+        new_events = concat_events(label_source(name, frames[name], matcher) for name in SOURCE_NAMES)
+        if args.fr_text or old_events["source"].isin(BODY_SOURCES).any():
+            # body hits from the text already on disk; documents never downloaded stay title-only
+            new_events = concat_events([new_events, body_events(frames["FR"], matcher, fetch=False)])
+        events = replace_topics(old_events, new_events, changed | removed)
+        s.rows(out=len(new_events))
+    # keep the stored window so the rescored topics line up with the reused ones
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    start, end = ((old_feat["date"].min(), old_feat["date"].max()) if not old_feat.empty
+                  else (today - pd.Timedelta(days=args.days), today))
+    with span("features", rows_in=len(new_events)) as s:
+        fresh = build_features(new_events, start, end)
+        # topic_day stored before the body columns existed reads them back as missing / null
+        old_feat = old_feat.reindex(columns=TOPIC_DAY_COLUMNS).fillna({c: 0.0 for c in BODY_COLUMNS})
+        feat = replace_topics(old_feat, fresh, changed | removed)
+        s.rows(out=len(fresh))
+
+    with span("write.topic_day", rows_in=len(feat)):
+        feat.to_csv(args.out, index=False)
+        write_dataset(feat, "topic_day")
+        save_labels(events, lex, state["fr_keywords"], csv=args.dump)
+        if os.path.exists(SCORE_STATE):
+            os.remove(SCORE_STATE)  # --incremental's byte offsets no longer match --out; it rebaselines
+    print(f"[OK] relabeled {len(changed)} topic(s), dropped {len(removed)}; wrote {args.out} with {len(feat)} rows")
+
+def run(args):
+    configure_fetch(concurrency=args.concurrency or DEFAULT_CONCURRENCY,
+                    rate=args.rate if args.rate is not None else DEFAULT_RATE,
+                    cache_dir=None if args.no_cache else CACHE_DIR,
+                    offline=args.offline, cache_max_mb=args.cache_max_mb)
 
     lex = load_lexicon("lexicon.yaml")
+    if args.relabel:
+        return relabel(args, lex)
 
     # 1) Pull data
     all_keywords = sorted({kw for kws in lex.values() for kw in kws})
-    fr_df = pull_federal_register(all_keywords, days=args.days)
-    oira_df = pull_oira_under_review(days=args.days)
-    ua_df = pull_unified_agenda_xml()
-    wh_df = pull_whitehouse(days=args.days)
-
-    if args.dump:
-        fr_df.to_csv("raw_fr.csv", index=False)
-        oira_df.to_csv("raw_oira.csv", index=False)
-        ua_df.to_csv("raw_ua.csv", index=False)
-        wh_df.to_csv("raw_wh.csv", index=False)
-
-
-    # 2) Label topics from titles
-    def explode(df, date_col, title_col, source_col):
-        rows = []
-        if df is None or df.empty:
-            return pd.DataFrame(columns=["date","topic","source"])
-        for _,r in df.iterrows():
-            d = pd.to_datetime(r.get(date_col), errors="coerce")
-            if pd.isna(d): 
-                continue
-            topics = label_topic(str(r.get(title_col,"")), lex)
-            for t in topics:
-                rows.append({"date": d.normalize(), "topic": t, "source": r.get(source_col)})
-        return pd.DataFrame(rows)
-
-    fr_topics = explode(fr_df, "publication_date", "title", "source")
-    oira_df = oira_df.rename(columns={"received":"date"}) if not oira_df.empty else oira_df
-    oira_topics = explode(oira_df, "date", "title", "source")
-    ua_df = ua_df if not ua_df.empty else pd.DataFrame(columns=["date","title","source"])
-    if "date" not in ua_df.columns and not ua_df.empty:
-        ua_df["date"] = pd.Timestamp.utcnow().normalize()
-    ua_topics = explode(ua_df, "date", "title", "source")
-    wh_topics = explode(wh_df.rename(columns={"date":"date"}), "date", "title", "source")
-
-
-    parts = [fr_topics, oira_topics, ua_topics, wh_topics]
-    events = pd.concat([p for p in parts if not p.empty], ignore_index=True)
-
-    if args.dump:
-        events.to_csv("events_labeled.csv", index=False)
+    fr_store = None if args.no_cache else FRStore(os.path.join(CACHE_DIR, "fr_store"))
+    # one pass over every source; topic_day and (with --flat-out) filings_flat both derive from it (ingest.py)
+    frames, status = fetch_documents(all_keywords, args.days, fr_store, args.full_resync,
+                                     concurrency=args.concurrency, rate=args.rate, budget=args.budget, csv=args.dump)
+    fr_df, oira_df, ua_df, wh_df = (frames[n] for n in SOURCE_NAMES)
+    if args.flat_out:
+        write_flat(frames, all_keywords, args.flat_out, args.agency)
+
+    # 2) Label topics from titles (columnar: one date parse + one matcher pass per source)
+    with span("label", rows_in=len(fr_df) + len(oira_df) + len(ua_df) + len(wh_df)) as s:
+        matcher = compile_lexicon(lex)
+        events = concat_events(label_source(name, frames[name], matcher) for name in SOURCE_NAMES)
+        s.rows(out=len(events))
+
+    if args.fr_text:
+        # 2b) Body text: concurrent gzip-cached downloads, streamed through the matcher (fr_text.py)
+        with span("fr_text", rows_in=len(fr_df)) as s:
+            with text_engine(args.concurrency, args.rate) as engine:
+                body = body_events(fr_df, matcher, engine)
+            events = concat_events([events, body])
+            s.rows(out=len(body))
+
+    with span("write.events", rows_in=len(events)):
+        save_labels(events, lex, all_keywords, csv=args.dump)
 
 
     if events.empty:
@@ -225,66 +201,34 @@ def main():
         pd.DataFrame(columns=["date","topic","score"]).to_csv(args.out, index=False)
         return
 
-    # 3) Build daily index and features
-    idx = pd.MultiIndex.from_product(
-        [sorted(events["topic"].unique()), 
-         pd.date_range((pd.Timestamp.utcnow().normalize() - pd.Timedelta(days=args.days)).date(),
-                       pd.Timestamp.utcnow().normalize().date(), freq="D")],
-        names=["topic","date"]
-    )
-    feat = pd.DataFrame(index=idx).reset_index()
-
-    fr_daily = fr_topics.groupby(["topic","date"]).size().rename("fr_notice_count").reset_index()
-    feat = feat.merge(fr_daily, on=["topic","date"], how="left").fillna({"fr_notice_count":0})
-
-    feat["comment_rate_14d"] = feat.groupby("topic")["fr_notice_count"].transform(lambda s: s.rolling(14, min_periods=1).sum())
-
-    if not oira_topics.empty:
-        feat = feat.merge(oira_topics.groupby(["topic","date"]).size().rename("under_review_count").reset_index(),
-                          on=["topic","date"], how="left")
-    else:
-        feat["under_review_count"] = 0
-    feat["under_review_count"] = feat["under_review_count"].fillna(0).clip(0,1)
-
-    feat["econ_significant_flag"] = 0  # placeholder; could be upgraded if parsed
-
-    if not wh_topics.empty:
-        wh_daily = wh_topics.groupby(["topic","date"]).size().rename("wh_hits").reset_index()
-        feat = feat.merge(wh_daily, on=["topic","date"], how="left")
-    else:
-        feat["wh_hits"] = 0
-    feat["wh_hits"] = feat["wh_hits"].fillna(0)
-    feat["eo_hits_45d"] = feat.groupby("topic")["wh_hits"].transform(lambda s: s.rolling(45, min_periods=1).sum())
-
-    src_daily = events.groupby(["topic","date"])["source"].nunique().rename("src_n").reset_index()
-    feat = feat.merge(src_daily, on=["topic","date"], how="left").rename(columns={"src_n":"agency_diversity"})
-    feat["agency_diversity"] = feat["agency_diversity"].fillna(0).clip(0,4)
-
-    if args.dump:
-        pre_cols = ["topic","date","fr_notice_count","comment_rate_14d",
-                    "under_review_count","econ_significant_flag",
-                    "wh_hits","eo_hits_45d","agency_diversity"]
-        feat[pre_cols].to_csv("features_pre_score.csv", index=False)
-
-    # Score
-    def z(series): 
-        mu, sd = series.mean(), series.std(ddof=0)
-        return (series - mu) / sd if (sd not in [0, None] and not pd.isna(sd)) else pd.Series([0]*len(series), index=series.index)
-
-    feat["z_fr_notice"] = feat.groupby("topic")["fr_notice_count"].transform(z)
-    feat["z_comment_rate"] = feat.groupby("topic")["comment_rate_14d"].transform(z)
+    # 3) Build daily features + score on a dense topic x day grid (features.py)
+    today = pd.Timestamp.utcnow().normalize().tz_localize(None)
+    if args.incremental:
+        # only days after the last finalized one are scored and appended (incremental.py)
+        start = today - pd.Timedelta(days=args.days)
+        with span("score.incremental", rows_in=len(events)) as s:
+            feat = score_incremental(events, start, today, args.out,
+                                     SCORE_STATE, full=args.full_recompute)
+            s.rows(out=len(feat))
+        with span("write.parquet", rows_in=len(feat)):
+            if len(feat) and feat["date"].min() <= start:
+                write_dataset(feat, "topic_day")   # rebaseline: the whole window
+            else:
+                upsert_dataset(feat, "topic_day")  # only the new days' month partitions
+                trim_dataset("topic_day", start)   # months that left the --days window
+        print(f"[OK] appended {len(feat)} rows to {args.out}")
+        return
+    with span("features", rows_in=len(events)) as s:
+        feat = build_features(events, today - pd.Timedelta(days=args.days), today)
+        s.rows(out=len(feat))
 
-    score = (
-        20*feat["z_fr_notice"].fillna(0) +
-        25*feat["z_comment_rate"].fillna(0) +
-        15*feat["under_review_count"].fillna(0) +
-        10*feat["econ_significant_flag"].fillna(0) +
-        15*feat["eo_hits_45d"].fillna(0) +
-         5*feat["agency_diversity"].fillna(0)
-    )
-    feat["score"] = score.clip(0,100)
+    with span("write.topic_day", rows_in=len(feat)):
+        if args.dump:
+            feat[PRE_SCORE_COLUMNS].to_csv("features_pre_score.csv", index=False)
+            write_dataset(feat[PRE_SCORE_COLUMNS], "features_pre_score")
 
-    feat.sort_values(["topic","date"]).to_csv(args.out, index=False)
+        feat.to_csv(args.out, index=False)
+        write_dataset(feat, "topic_day")
     print(f"[OK] wrote {args.out} with {len(feat)} rows")
 
 if __name__ == "__main__":
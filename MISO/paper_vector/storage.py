@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Date-partitioned Parquet storage for the paper vector datasets.
+
+Each dataset (raw pulls, filings history, topic_day, pre-score features) has
+an explicit column schema and is written under ./parquet/<name>/ as Hive
+partitions by month (month=YYYY-MM). Dates are parsed exactly once, on
+write, and stored as date32, so readers get typed columns back and can push
+`date` / `topic` predicates and column projection down into the scan:
+
+  read_dataset("topic_day", columns=["topic","date","score"], start="2025-01-01", topics=["cooling"])
+
+The CSV exports stay for humans. When pyarrow is not installed, or a
+dataset has not been written as Parquet yet, readers fall back to the CSV
+(same columns, same filters, dates parsed on read).
+
+  python3 storage.py --import-csv                 # convert every existing CSV
+  python3 storage.py --import-csv filings_hist    # just one dataset
+"""
+import argparse, hashlib, os, shutil, sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAVE_PARQUET = True
+except ImportError:  # pragma: no cover
+    pa = ds = None
+    HAVE_PARQUET = False
+
+PARQUET_DIR = "parquet"
+PARTITION = "month"
+
+# ---- schemas: (column, kind) with kind in str / date / float / int ----
+DATASETS: Dict[str, Dict] = {
+    "raw_fr": {"csv": "raw_fr.csv", "date": "publication_date", "fields": [
+        ("source","str"),("id","str"),("title","str"),("agencies","str"),("publication_date","date"),
+        ("type","str"),("comments_close_on","date"),("html_url","str")]},
+    "raw_oira": {"csv": "raw_oira.csv", "date": "received", "fields": [
+        ("source","str"),("id","str"),("title","str"),("agency","str"),("stage","str"),
+        ("received","date"),("status","str"),("detail_url","str")]},
+    "raw_ua": {"csv": "raw_ua.csv", "date": "date", "fields": [
+        ("source","str"),("id","str"),("title","str"),("agency","str"),("stage","str"),("date","date"),
+        ("timetable","str"),("next_action_date","date"),("edition","str")]},
+    "raw_wh": {"csv": "raw_wh.csv", "date": "date", "fields": [
+        ("source","str"),("title","str"),("agency","str"),("date","date"),("url","str")]},
+    "events_labeled": {"csv": "events_labeled.csv", "date": "date", "fields": [
+        ("date","date"),("topic","str"),("source","str")]},
+    "filings_hist": {"csv": "filings_hist.csv", "date": "date", "fields": [
+        ("date","date"),("agency","str"),("filing_title","str"),("keyword_count","int")]},
+    "filings_flat": {"csv": "filings_flat.csv", "date": "date", "fields": [
+        ("date","date"),("agency","str"),("filing_title","str"),("keyword_count","int")]},
+    "topic_day": {"csv": "topic_day.csv", "date": "date", "key": ["topic","date"], "fields": [
+        ("topic","str"),("date","date"),("fr_notice_count","float"),("comment_rate_14d","float"),
+        ("under_review_count","int"),("econ_significant_flag","int"),("wh_hits","float"),
+        ("eo_hits_45d","float"),("agency_diversity","float"),("z_fr_notice","float"),
+        ("z_comment_rate","float"),("score","float"),("fr_body_count","float"),("fr_body_only_count","float")]},
+    "features_pre_score": {"csv": "features_pre_score.csv", "date": "date", "key": ["topic","date"], "fields": [
+        ("topic","str"),("date","date"),("fr_notice_count","float"),("comment_rate_14d","float"),
+        ("under_review_count","int"),("econ_significant_flag","int"),("wh_hits","float"),
+        ("eo_hits_45d","float"),("agency_diversity","float")]},
+}
+
+def _arrow_type(kind: str):
+    return {"str": pa.string(), "date": pa.date32(), "float": pa.float64(), "int": pa.int64()}[kind]
+
+def arrow_schema(name: str):
+    return pa.schema([(c, _arrow_type(k)) for c, k in DATASETS[name]["fields"]])
+
+def dataset_path(name: str, root: str = PARQUET_DIR) -> str:
+    return os.path.join(root, name)
+
+def _parse_dates(s: pd.Series) -> pd.Series:
+    d = pd.to_datetime(s, format="mixed", errors="coerce", utc=True)
+    return d.dt.tz_convert(None).dt.normalize().astype("datetime64[ns]")
+
+def coerce(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """Project/convert a frame onto the dataset schema (missing columns become nulls)."""
+    out = {}
+    for col, kind in DATASETS[name]["fields"]:
+        s = df[col] if col in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+        if kind == "date":
+            s = s if pd.api.types.is_datetime64_dtype(s) and getattr(s.dt, "tz", None) is None else _parse_dates(s)
+        elif kind == "float":
+            s = pd.to_numeric(s, errors="coerce").astype("float64")
+        elif kind == "int":
+            s = pd.to_numeric(s, errors="coerce").fillna(0).astype("int64")
+        else:
+            s = s.astype(object).where(s.notna(), None)
+            s = s.map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        out[col] = s
+    return pd.DataFrame(out, index=df.index).reset_index(drop=True)
+
+def _months(dates: pd.Series) -> pd.Series:
+    return dates.dt.strftime("%Y-%m").fillna("none")
+
+def _to_table(df: pd.DataFrame, name: str):
+    frame = coerce(df, name)
+    frame = frame.sort_values(DATASETS[name].get("key") or [DATASETS[name]["date"]], kind="stable")
+    table = pa.Table.from_pandas(frame, schema=arrow_schema(name), preserve_index=False)
+    return table.append_column(PARTITION, pa.array(_months(frame[DATASETS[name]["date"]]).to_numpy(), pa.string()))
+
+def _write(table, base_dir: str, behavior: str) -> None:
+    ds.write_dataset(table, base_dir, format="parquet",
+                     partitioning=ds.partitioning(pa.schema([(PARTITION, pa.string())]), flavor="hive"),
+                     existing_data_behavior=behavior, basename_template="part-{i}.parquet")
+
+_warned = False
+
+def write_dataset(df: pd.DataFrame, name: str, root: str = PARQUET_DIR) -> Optional[str]:
+    """Replace the whole dataset with df. Returns the dataset dir (None without pyarrow)."""
+    global _warned
+    if not HAVE_PARQUET:
+        if not _warned:
+            print("[WARN] pyarrow not installed; skipping Parquet writes (CSV only)", file=sys.stderr)
+            _warned = True
+        return None
+    base = dataset_path(name, root)
+    tmp = base + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    _write(_to_table(df, name), tmp, "error")
+    os.makedirs(tmp, exist_ok=True)  # an empty table writes no files
+    # two renames, so readers see the old or the new dataset and never a missing one for long
+    old = base + ".old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.isdir(base):
+        os.replace(base, old)
+    os.replace(tmp, base)
+    shutil.rmtree(old, ignore_errors=True)
+    return base
+
+def upsert_dataset(df: pd.DataFrame, name: str, root: str = PARQUET_DIR) -> Optional[str]:
+    """
+    Merge df into the dataset on its key columns (later rows win). Only the
+    month partitions df touches are read back and rewritten.
+    """
+    base = dataset_path(name, root)
+    if not HAVE_PARQUET or not os.path.isdir(base):
+        return write_dataset(df, name, root)
+    new = coerce(df, name)
+    months = sorted(set(_months(new[DATASETS[name]["date"]])))
+    old = _scan(base, name, None, ds.field(PARTITION).isin(months))
+    merged = pd.concat([old, new], ignore_index=True).drop_duplicates(DATASETS[name]["key"], keep="last")
+    _write(_to_table(merged, name), base, "delete_matching")
+    return base
+
+def trim_dataset(name: str, start, root: str = PARQUET_DIR) -> Optional[str]:
+    """
+    Delete the month partitions that end before start (whole partitions only,
+    nothing is rewritten; rows of start's own month stay until it ends).
+    """
+    base = dataset_path(name, root)
+    if not HAVE_PARQUET or not os.path.isdir(base):
+        return None
+    first = pd.Timestamp(start).strftime("%Y-%m")
+    for part in os.listdir(base):
+        key, _, month = part.partition("=")
+        if key == PARTITION and month < first:  # "none" (undated rows) sorts after every month
+            shutil.rmtree(os.path.join(base, part))
+    return base
+
+def _filter(name: str, start, end, topics: Optional[Iterable[str]]):
+    """Arrow predicate: [start, end) on the date column (+ month partitions), topic membership."""
+    date_col = DATASETS[name]["date"]
+    expr = None
+    def _and(e):
+        return e if expr is None else expr & e
+    if start is not None:
+        start = pd.Timestamp(start)
+        expr = _and((ds.field(date_col) >= pa.scalar(start.date(), pa.date32()))
+                    & (ds.field(PARTITION) >= start.strftime("%Y-%m")))
+    if end is not None:
+        end = pd.Timestamp(end)
+        expr = _and((ds.field(date_col) < pa.scalar(end.date(), pa.date32()))
+                    & (ds.field(PARTITION) <= end.strftime("%Y-%m")))
+    if topics is not None:
+        expr = _and(ds.field("topic").isin(list(topics)))
+    return expr
+
+def _scan(base: str, name: str, columns: Optional[Sequence[str]], expr) -> pd.DataFrame:
+    dataset = ds.dataset(base, format="parquet", schema=arrow_schema(name).append(pa.field(PARTITION, pa.string())),
+                         partitioning="hive")
+    cols = list(columns) if columns is not None else [c for c, _ in DATASETS[name]["fields"]]
+    df = dataset.to_table(columns=cols, filter=expr).to_pandas(date_as_object=False)
+    for c, kind in DATASETS[name]["fields"]:
+        if kind == "date" and c in df.columns:
+            df[c] = df[c].astype("datetime64[ns]")
+    return df
+
+def _read_csv(path: str, name: str, columns, start, end, topics) -> pd.DataFrame:
+    usecols = None if columns is None else (lambda c: c in set(columns) | {DATASETS[name]["date"]} | ({"topic"} if topics else set()))
+    try:
+        raw = pd.read_csv(path, usecols=usecols)
+    except pd.errors.EmptyDataError:  # a pull that returned nothing is written as a bare newline
+        raw = pd.DataFrame()
+    df = coerce(raw, name)
+    date_col = DATASETS[name]["date"]
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df[date_col] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df[date_col] < pd.Timestamp(end)
+    if topics is not None:
+        mask &= df["topic"].isin(list(topics))
+    cols = list(columns) if columns is not None else [c for c, _ in DATASETS[name]["fields"]]
+    return df.loc[mask, cols].reset_index(drop=True)
+
+def read_dataset(name: str, columns: Optional[Sequence[str]] = None, start=None, end=None,
+                 topics: Optional[Iterable[str]] = None, source: Optional[str] = None,
+                 root: str = PARQUET_DIR) -> pd.DataFrame:
+    """
+    Typed read of a dataset with projection and [start, end) / topic filters.
+    `source` may point at a Parquet dataset dir or a CSV file; by default the
+    Parquet dataset under `root` is used, else the dataset's CSV export.
+    """
+    path = resolve_source(name, source, root)
+    if os.path.isdir(path):
+        return _scan(path, name, columns, _filter(name, start, end, topics))
+    return _read_csv(path, name, columns, start, end, topics)
+
+def resolve_source(name: str, source: Optional[str] = None, root: str = PARQUET_DIR) -> str:
+    """The path read_dataset will read: the Parquet dir if usable, else the CSV."""
+    path = source or dataset_path(name, root)
+    if HAVE_PARQUET and os.path.isdir(path):
+        return path
+    return path if source is not None else DATASETS[name]["csv"]
+
+def fingerprint(name: str, source: Optional[str] = None, root: str = PARQUET_DIR) -> str:
+    """
+    Cheap content key for caches: path + size + mtime of the CSV, or of every
+    file in the Parquet dataset. Changes whenever a writer touches the data.
+    """
+    path = resolve_source(name, source, root)
+    if os.path.isdir(path):
+        stats = []
+        for d, _, files in os.walk(path):
+            for f in files:
+                st = os.stat(os.path.join(d, f))
+                stats.append((os.path.relpath(os.path.join(d, f), path), st.st_size, st.st_mtime_ns))
+        key = repr((path, sorted(stats)))
+    elif os.path.exists(path):
+        st = os.stat(path)
+        key = repr((path, st.st_size, st.st_mtime_ns))
+    else:
+        key = repr((path, None))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def import_csv(names: Sequence[str], root: str = PARQUET_DIR) -> List[Tuple[str, int]]:
+    done = []
+    for name in names:
+        path = DATASETS[name]["csv"]
+        try:
+            df = pd.read_csv(path)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            print(f"[WARN] {path} missing or empty; skipped", file=sys.stderr)
+            continue
+        if write_dataset(df, name, root):
+            done.append((name, len(df)))
+            print(f"[OK] wrote {dataset_path(name, root)} with {len(df)} rows")
+    return done
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--import-csv", nargs="*", metavar="DATASET", help=f"Convert CSV exports to Parquet (default: all of {', '.join(DATASETS)})")
+    ap.add_argument("--root", default=PARQUET_DIR)
+    args = ap.parse_args()
+    if args.import_csv is None:
+        ap.print_help()
+        return
+    import_csv(args.import_csv or list(DATASETS), args.root)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,32 @@
+import hashlib, io
 import pandas as pd
 import streamlit as st
 import altair as alt
+from storage import fingerprint, read_dataset
+from dashboard_data import FREQ_LABELS, aggregate_heatmap, choose_freq, trend_frame, watchlist
+
+COLUMNS = ["topic","date","score"]
+
+# ---- cached data layer ----
+# topic_day is keyed on its file fingerprint (path/size/mtime), so widget reruns
+# reuse the parsed frame until score.py rewrites the data.
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_topic_day(fp: str) -> pd.DataFrame:
+    return read_dataset("topic_day", columns=COLUMNS)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_upload(digest: str, _data: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(_data), usecols=COLUMNS, parse_dates=["date"])
+
+# LRU of prepared chart frames per (data version, topic selection, range);
+# _df is not hashed, the version key stands in for it.
+@st.cache_data(max_entries=32, show_spinner=False)
+def heatmap_frame(version: str, topics: tuple, start, end, freq: str, _df: pd.DataFrame) -> pd.DataFrame:
+    return aggregate_heatmap(_df, topics, start, end, freq=freq)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def trend_line(version: str, topic: str, start, end, _df: pd.DataFrame) -> pd.DataFrame:
+    return trend_frame(_df, topic, start, end)
 
 st.set_page_config(page_title="Data-Center Policy Momentum", layout="wide")
 
@@ -8,10 +34,14 @@ st.title("Data-Center Policy Momentum (Federal Signals)")
 
 uploaded = st.file_uploader("Upload topic_day.csv (or run score.py to generate)", type=["csv"])
 if uploaded:
-    df = pd.read_csv(uploaded, parse_dates=["date"])
+    data = uploaded.getvalue()
+    version = "upload:" + hashlib.sha1(data).hexdigest()
+    df = load_upload(version, data)
 else:
     try:
-        df = pd.read_csv("topic_day.csv", parse_dates=["date"])
+        # Parquet dataset when present (typed, projected), else topic_day.csv
+        version = fingerprint("topic_day")
+        df = load_topic_day(version)
     except:
         st.info("Run `python3 score.py` first, then refresh.")
         st.stop()
@@ -19,21 +49,23 @@ else:
 topics = sorted(df["topic"].unique().tolist())
 pick = st.multiselect("Topics", topics, default=topics)
 
-df = df[df["topic"].isin(pick)]
+lo, hi = df["date"].min().date(), df["date"].max().date()
+start, end = st.slider("Date range", min_value=lo, max_value=hi, value=(lo, hi)) if lo < hi else (lo, hi)
 
-st.subheader("Momentum Heatmap (score 0–100)")
-heat = df[["topic","date","score"]]
+freq = choose_freq(start, end)  # binned at the frequency the title shows, not one re-derived from the data
+st.subheader(f"Momentum Heatmap (score 0–100, {FREQ_LABELS[freq]} mean)")
+heat = heatmap_frame(version, tuple(sorted(pick)), start, end, freq, df)
 chart = alt.Chart(heat).mark_rect().encode(
     x=alt.X("date:T", axis=alt.Axis(format="%Y-%m-%d", labelAngle=-45)),
     y=alt.Y("topic:N", sort=topics),
     color=alt.Color("score:Q", scale=alt.Scale(domain=[0,100])),
-    tooltip=["topic","date","score"]
+    tooltip=["topic","date","score","score_max","days"]
 ).properties(height=300)
 st.altair_chart(chart, use_container_width=True)
 
 st.subheader("Trend (rolling)")
 topic_sel = st.selectbox("Drill-down topic", topics, index=0 if topics else None)
-line = alt.Chart(df[df["topic"]==topic_sel]).mark_line().encode(
+line = alt.Chart(trend_line(version, topic_sel, start, end, df)).mark_line().encode(
     x="date:T",
     y="score:Q",
     tooltip=["date","score"]
@@ -41,10 +73,6 @@ line = alt.Chart(df[df["topic"]==topic_sel]).mark_line().encode(
 st.altair_chart(line, use_container_width=True)
 
 st.subheader("Watchlist (Top 3 today)")
-today = df["date"].max()
-today_scores = (df[df["date"]==today]
-                .sort_values("score", ascending=False)
-                .head(3))[["topic","score"]]
-st.dataframe(today_scores.reset_index(drop=True))
+st.dataframe(watchlist(df, pick))
 
 st.caption("Sources: Federal Register API; Reginfo/OIRA pages; WhiteHouse.gov listings.")
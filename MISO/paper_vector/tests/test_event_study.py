@@ -0,0 +1,19 @@
+import os
+import pandas as pd
+import pytest
+
+from event_study import check_event_topics
+from lexicon import load_lexicon
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_shipped_events_use_lexicon_topics():
+    events = pd.read_csv(os.path.join(HERE, "regulatory_events.csv"))
+    assert set(events["topic"]) <= set(load_lexicon(os.path.join(HERE, "lexicon.yaml")))
+
+def test_check_event_topics_warns_on_missing_and_fails_on_none(capsys):
+    events = pd.DataFrame({"event_date": ["2025-01-14", "2025-07-23"], "topic": ["data_centers", "grid"]})
+    assert check_event_topics(events, ["data_centers", "cooling"]) == ["grid"]
+    assert "1 event(s) dropped" in capsys.readouterr().err
+    with pytest.raises(ValueError, match="no event topic"):
+        check_event_topics(events, ["cooling"])
@@ -0,0 +1,97 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from fr_store import FR_RESULT_CAP, UNATTRIBUTED, FRStore, search_batch
+
+DOCS = [
+    {"document_number": "2025-00001", "title": "Data center load forecasting", "publication_date": "2025-03-03"},
+    {"document_number": "2025-00002", "title": "Interconnection queue reform", "publication_date": "2025-03-02"},
+    {"document_number": "2025-00003", "title": "Combined Notice of Filings #1", "publication_date": "2025-03-01"},
+]
+
+class FakeEngine:
+    """Answers every FR search with the same single page."""
+    cache = None
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def get_json(self, url):
+        return {"count": len(self.docs), "results": self.docs, "next_page_url": None}
+
+    def map(self, fn, items):
+        return [fn(x) for x in items]
+
+def _lines(store):
+    with open(store.docs_path) as f:
+        return [json.loads(line) for line in f]
+
+def test_sync_twice_with_same_response_keeps_row_count(tmp_path):
+    store = FRStore(str(tmp_path))
+    keywords = ["data center", "interconnection"]
+    store.sync(keywords, days=30, engine=FakeEngine(DOCS))
+    first = _lines(store)
+    store.sync(keywords, days=30, engine=FakeEngine(DOCS))  # same watermark day re-queried
+    assert len(_lines(store)) == len(first) == 3
+    assert sorted(store.frame(keywords)["id"]) == ["2025-00001", "2025-00002", "2025-00003"]
+
+def test_unmatched_hit_is_stored_once_under_its_batch(tmp_path):
+    store = FRStore(str(tmp_path))
+    store.sync(["data center", "interconnection"], days=30, engine=FakeEngine(DOCS))
+    un = [d for d in _lines(store) if d["keyword"] == UNATTRIBUTED]
+    assert [d["id"] for d in un] == ["2025-00003"]
+    assert un[0]["batch"] == ["data center", "interconnection"]
+    # read back under any keyword of its batch, and only those
+    assert "2025-00003" in set(store.frame(["interconnection"])["id"])
+    assert set(store.frame(["data center"])["id"]) == {"2025-00001", "2025-00003"}
+    assert store.frame(["nuclear"]).empty
+
+def test_compaction_keeps_every_batch_of_an_unattributed_hit(tmp_path):
+    store = FRStore(str(tmp_path))
+    store.sync(["data center", "interconnection"], days=30, engine=FakeEngine(DOCS))
+    store.sync(["nuclear", "interconnection"], days=30, engine=FakeEngine(DOCS[2:]))  # overlapping batch
+    un = [d for d in _lines(store) if d["keyword"] == UNATTRIBUTED]
+    assert len(un) == 1 and un[0]["batch"] == ["data center", "interconnection", "nuclear"]
+    for kw in ("data center", "interconnection", "nuclear"):
+        assert "2025-00003" in set(store.frame([kw])["id"])
+
+def test_sync_and_frame_read_the_store_once(tmp_path, monkeypatch):
+    store = FRStore(str(tmp_path))
+    store.sync(["data center", "interconnection"], days=30, engine=FakeEngine(DOCS))
+    store = FRStore(str(tmp_path))
+    reads = []
+    real = store._records
+    monkeypatch.setattr(store, "_records", lambda: reads.append(1) or real())
+    store.sync(["data center", "interconnection"], days=30, engine=FakeEngine(DOCS))
+    assert len(store.frame(["data center", "interconnection"])) == 3
+    assert len(reads) == 1
+
+class DatedEngine(FakeEngine):
+    """`per_day` hits per day in the requested publication-date range."""
+    def __init__(self, per_day):
+        super().__init__([])
+        self.per_day, self.ranges = per_day, []
+
+    def get_json(self, url):
+        q = parse_qs(urlsplit(url).query)
+        start, end = q["conditions[publication_date][gte]"][0], q["conditions[publication_date][lte]"][0]
+        self.ranges.append((start, end))
+        days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+        doc = {"document_number": f"{start}-{end}", "title": "Data center siting", "publication_date": end}
+        return {"count": days * self.per_day, "results": [doc], "next_page_url": None}
+
+def test_single_keyword_overflow_is_split_by_date(capsys):
+    engine = DatedEngine(per_day=3000)  # FR_RESULT_CAP is reached by any range over 3 days
+    out = search_batch(engine, ["data center"], "2025-03-01", "2025-03-16")
+    hit_ranges = [r for r in engine.ranges if (pd.Timestamp(r[1]) - pd.Timestamp(r[0])).days < 3]
+    covered = sorted(d for s, e in hit_ranges for d in pd.date_range(s, e))
+    assert covered == list(pd.date_range("2025-03-01", "2025-03-16"))
+    assert len(out["data center"]) == len(hit_ranges)
+    assert capsys.readouterr().err == ""
+
+def test_single_day_overflow_warns_with_keyword_and_count(capsys):
+    search_batch(DatedEngine(per_day=FR_RESULT_CAP + 1), ["data center"], "2025-03-01", "2025-03-01")
+    err = capsys.readouterr().err
+    assert '"data center"' in err and str(FR_RESULT_CAP + 1) in err
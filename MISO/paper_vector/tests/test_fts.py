@@ -0,0 +1,13 @@
+import pandas as pd
+import pytest
+
+from fts import FTSIndex
+
+def test_update_skips_datasets_that_were_never_written(tmp_path, monkeypatch):
+    pytest.importorskip("sqlite3")
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"date": ["2025-03-01"], "agency": ["FERC"], "filing_title": ["Data center interconnection"],
+                  "keyword_count": [2]}).to_csv("filings_hist.csv", index=False)
+    with FTSIndex(str(tmp_path / "fts.sqlite")) as idx:
+        assert idx.update() == {"filings_hist": 1}  # filings_flat.csv and the raw_* pulls are missing
+        assert idx.count('"data center"') == 1
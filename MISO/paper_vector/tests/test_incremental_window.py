@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import TOPIC_DAY_COLUMNS, build_features
+from incremental import score_incremental
+
+DAYS = 60
+
+def _events(seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2025-01-01", "2025-06-30", freq="D")
+    n = 4000
+    ev = pd.DataFrame({"date": rng.choice(days, n),
+                       "topic": rng.choice(["cooling", "data_centers", "grid"], n),
+                       "source": rng.choice(["FR", "FR", "OIRA", "UA", "WH"], n)})
+    late = pd.DataFrame({"date": rng.choice(days[-40:], 50), "topic": "nuclear", "source": "FR"})
+    return pd.concat([ev, late], ignore_index=True)
+
+def _sorted(df):
+    return df.sort_values(["topic", "date"]).reset_index(drop=True)
+
+def test_incremental_matches_full_run_after_window_moves(tmp_path):
+    events = _events()
+    out, state = str(tmp_path / "topic_day.csv"), str(tmp_path / "score_state.npz")
+    today = pd.Timestamp("2025-04-01")
+    # baseline, one day, a three-day gap, one day, then most of a window with a new topic
+    for step in (0, 1, 3, 1, 55):
+        today += pd.Timedelta(days=step)
+        start = today - pd.Timedelta(days=DAYS)
+        seen = events[events["date"] <= today]  # "nuclear" only shows up in the last step
+        new = score_incremental(seen, start, today, out, state)
+        full = build_features(seen, start, today, topics=sorted(new["topic"].unique()))
+        full = full[full["date"] >= new["date"].min()]
+        pd.testing.assert_frame_equal(_sorted(new), _sorted(full), check_dtype=False)
+
+        published = pd.read_csv(out, parse_dates=["date"])
+        assert list(published.columns) == TOPIC_DAY_COLUMNS
+        # trimmed lazily: days before the window only linger until their month has left it
+        assert start.replace(day=1) <= published["date"].min() <= start
+        assert published["date"].max() == today
+        assert not published.duplicated(["topic", "date"]).any()
+        if step == 1 and published["date"].min() < start:  # same month: the old rows weren't rewritten
+            assert published_before.equals(published[published["date"] < new["date"].min()].reset_index(drop=True))
+        published_before = published[published["date"] < today].reset_index(drop=True)
+
+def test_trim_dataset_drops_months_before_start(tmp_path):
+    pytest.importorskip("pyarrow")
+    from storage import read_dataset, trim_dataset, write_dataset
+    dates = pd.date_range("2025-01-20", "2025-03-10", freq="D")
+    df = pd.DataFrame({c: 1.0 for c in TOPIC_DAY_COLUMNS}, index=range(len(dates)))
+    df["topic"], df["date"] = "grid", dates
+    write_dataset(df, "topic_day", root=str(tmp_path))
+    trim_dataset("topic_day", "2025-02-15", root=str(tmp_path))
+    back = read_dataset("topic_day", root=str(tmp_path))
+    assert back["date"].min() == pd.Timestamp("2025-02-01") and back["date"].max() == dates[-1]
+    assert len(back) == len(dates[dates >= "2025-02-01"])
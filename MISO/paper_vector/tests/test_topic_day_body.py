@@ -0,0 +1,62 @@
+import gzip, os, sys
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+import fr_text, score
+from features import BODY_COLUMNS, TOPIC_DAY_COLUMNS
+from fr_store import FR_COLUMNS
+from ingest import OIRA_COLUMNS
+from relabel import save_raw
+from storage import read_dataset, write_dataset
+from unified_agenda import UA_COLUMNS
+from whitehouse import WH_COLUMNS
+
+def test_topic_day_round_trips_body_columns(tmp_path):
+    dates = pd.date_range("2025-01-30", periods=5, freq="D")
+    df = pd.DataFrame({c: np.arange(5, dtype=float) for c in TOPIC_DAY_COLUMNS})
+    df["topic"], df["date"] = "dc", dates
+    df["fr_body_count"] = [0.0, 1.0, 2.0, 3.0, 4.0]
+    df["fr_body_only_count"] = [0.0, 1.0, 0.0, 2.0, 1.0]
+    write_dataset(df, "topic_day", root=str(tmp_path))
+    back = read_dataset("topic_day", root=str(tmp_path))
+    assert list(back.columns) == TOPIC_DAY_COLUMNS
+    pd.testing.assert_frame_equal(back[BODY_COLUMNS], df[BODY_COLUMNS], check_dtype=False)
+
+def _run_score(monkeypatch, frames, *argv):
+    def fake_fetch(*a, **k):
+        save_raw(frames)
+        return frames, {}
+    monkeypatch.setattr(score, "fetch_documents", fake_fetch)
+    monkeypatch.setattr(sys, "argv", ["score.py", "--no-cache", "--days", "30", *argv])
+    score.main()
+
+def test_relabel_keeps_body_counts_of_untouched_topics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open("lexicon.yaml", "w") as f:
+        f.write('dc:\n  include: ["data center"]\ngrid:\n  include: ["interconnection"]\n')
+    today = pd.Timestamp.now("UTC").tz_localize(None).normalize()
+    ids = [f"2025-{i:05d}" for i in range(20)]
+    fr = pd.DataFrame({"source": "FR", "id": ids, "title": "Combined Notice of Filings #1", "agencies": "FERC",
+                       "publication_date": [(today - pd.Timedelta(days=i)).date().isoformat() for i in range(20)],
+                       "type": "Notice", "comments_close_on": None, "html_url": None}, columns=FR_COLUMNS)
+    for i, doc_id in enumerate(ids):  # bodies already cached: no download
+        path = fr_text.text_path(fr_text.TEXT_DIR, doc_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "wt") as f:
+            f.write("notice of filings. " * 20 + ("a new data center load " if i % 2 else "interconnection queue "))
+    frames = {"FR": fr, "OIRA": pd.DataFrame(columns=OIRA_COLUMNS),
+              "UA": pd.DataFrame(columns=UA_COLUMNS), "WH": pd.DataFrame(columns=WH_COLUMNS)}
+
+    _run_score(monkeypatch, frames, "--fr-text")
+    before = read_dataset("topic_day")
+    dc_before = before.loc[before["topic"] == "dc", BODY_COLUMNS].sum()
+    assert dc_before["fr_body_count"] == 10 and dc_before["fr_body_only_count"] == 10
+
+    with open("lexicon.yaml", "w") as f:
+        f.write('dc:\n  include: ["data center"]\ngrid:\n  include: ["interconnection", "queue"]\n')
+    _run_score(monkeypatch, frames, "--relabel")
+    for after in (read_dataset("topic_day"), pd.read_csv("topic_day.csv")):
+        pd.testing.assert_series_equal(after.loc[after["topic"] == "dc", BODY_COLUMNS].sum(), dc_before)
+        assert after.loc[after["topic"] == "grid", "fr_body_count"].sum() == 10
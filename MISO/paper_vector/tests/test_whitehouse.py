@@ -0,0 +1,54 @@
+import pandas as pd
+import requests
+
+from whitehouse import crawl_listing, page_url
+
+LISTING = "https://www.whitehouse.gov/presidential-actions/"
+
+def _page(n):
+    day = pd.Timestamp("2025-06-30") - pd.Timedelta(days=10 * n)
+    return "".join(f'<article><h2><a href="/p{n}-{i}/">Post {n}.{i}</a></h2>'
+                   f'<time datetime="{(day - pd.Timedelta(days=i)).date()}"></time></article>' for i in range(3))
+
+def _http_error(status):
+    resp = requests.Response()
+    resp.status_code = status
+    return requests.HTTPError(f"{status} error", response=resp)
+
+class FakeEngine:
+    concurrency = 2
+
+    def __init__(self, errors, last_page):
+        self.errors, self.last_page, self.requested = errors, last_page, []
+
+    def get_text(self, url):
+        n = next(n for n in range(1, 50) if page_url(LISTING, n) == url)
+        self.requested.append(n)
+        if n in self.errors:
+            raise self.errors[n]
+        if n > self.last_page:
+            raise _http_error(404)
+        return _page(n)
+
+    def map(self, fn, items):
+        out = []
+        for x in items:
+            try:
+                out.append(fn(x))
+            except Exception as e:
+                out.append(e)
+        return out
+
+def test_failed_page_is_reported_and_skipped(capsys):
+    engine = FakeEngine({3: _http_error(503)}, last_page=5)
+    rows = crawl_listing(LISTING, pd.Timestamp("2024-01-01"), engine)
+    pages = sorted({int(r["url"].split("-")[0][2:]) for r in rows})
+    assert pages == [1, 2, 4, 5]  # past page 3, up to the 404 on page 6
+    assert "page 3" in capsys.readouterr().err
+
+def test_consecutive_failures_give_up_on_the_listing(capsys):
+    engine = FakeEngine({n: requests.ConnectionError("down") for n in range(2, 50)}, last_page=40)
+    rows = crawl_listing(LISTING, pd.Timestamp("2024-01-01"), engine)
+    assert {r["url"] for r in rows} == {f"/p1-{i}/" for i in range(3)}
+    assert max(engine.requested) < 10
+    assert "giving up" in capsys.readouterr().err
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Per-host adaptive concurrency, retries and circuit breaking for fetch.py.
+
+Every outbound GET goes through the HostController of its host (shared
+by all engines in the process, so OIRA and UA pulls against reginfo.gov
+see one controller):
+
+- AIMD concurrency: the in-flight limit grows by ~1 per window of clean
+  responses (+1/limit each) up to the engine's concurrency, and halves on
+  429 / 503 / timeouts, so each host runs as wide as it tolerates.
+- Retries: 429, 5xx and connection errors are retried with full-jitter
+  exponential backoff; a Retry-After header (seconds or HTTP date) pauses
+  the whole host, not just the one request.
+- Circuit breaker: after BREAKER_FAILURES consecutive failures the host is
+  failed fast (CircuitOpen) for BREAKER_COOLDOWN seconds, then one probe
+  request decides whether it closes again.
+
+host_stats() / format_host_stats() report per-host requests, retries,
+throttles, bytes, throughput and the current limit.
+"""
+import random, threading, time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+import requests
+from instrument import count
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5   # seconds; attempt n sleeps U(0, min(BACKOFF_CAP, BASE * 2**n))
+BACKOFF_CAP = 30.0
+MAX_RETRY_AFTER = 300.0
+BREAKER_FAILURES = 8
+BREAKER_COOLDOWN = 60.0
+INITIAL_LIMIT = 2.0
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of a request while a host's circuit breaker is open."""
+
+def retry_after(resp: requests.Response) -> Optional[float]:
+    """Seconds asked for by a Retry-After header (delta or HTTP date), if any."""
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        secs = float(value)
+    except ValueError:
+        try:
+            secs = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(MAX_RETRY_AFTER, max(0.0, secs))
+
+def backoff(attempt: int) -> float:
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+class HostController:
+    def __init__(self, host: str, max_limit: int):
+        self.host = host
+        self.max_limit = max(1, int(max_limit))
+        self.limit = min(INITIAL_LIMIT, float(self.max_limit))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.cond = threading.Condition()
+        self.stats = {"requests": 0, "ok": 0, "retries": 0, "throttled": 0, "errors": 0,
+                      "breaker_trips": 0, "bytes": 0, "busy_s": 0.0}
+        self.t0 = time.monotonic()
+
+    # ---- admission ----
+    def acquire(self, wait_until: Optional[float] = None) -> bool:
+        """Block for a slot under the current limit (and any Retry-After pause); True for a half-open probe."""
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                if now < self.open_until:
+                    raise CircuitOpen(f"{self.host}: circuit open for {self.open_until - now:.0f}s more")
+                if self.open_until and not self.probing and self.in_flight == 0:
+                    self.probing = True  # half-open: let exactly one request through
+                    self.in_flight += 1
+                    return True
+                if not self.open_until and now >= self.paused_until and self.in_flight < int(self.limit):
+                    break
+                wake = self.paused_until if now < self.paused_until else None
+                if wait_until is not None and (wake or now) >= wait_until:
+                    raise TimeoutError(f"{self.host}: no slot before the deadline")
+                self.cond.wait(timeout=min(1.0, (wake - now) if wake else 1.0))
+            self.in_flight += 1
+            return False
+
+    def release(self, probe: bool = False) -> None:
+        with self.cond:
+            self.in_flight -= 1
+            if probe:
+                self.probing = False  # a probe that raised leaves the breaker half-open for the next one
+            self.cond.notify_all()
+
+    # ---- feedback ----
+    def success(self, nbytes: int, seconds: float) -> None:
+        with self.cond:
+            self.stats["ok"] += 1
+            self.stats["bytes"] += nbytes
+            self.stats["busy_s"] += seconds
+            self.failures = 0
+            self.open_until, self.probing = 0.0, False
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(1.0, self.limit))
+            self.cond.notify_all()
+
+    def failure(self, throttled: bool, pause: Optional[float] = None) -> None:
+        with self.cond:
+            self.stats["throttled" if throttled else "errors"] += 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            if pause:
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            self.failures += 1
+            if self.probing or self.failures >= BREAKER_FAILURES:
+                self.open_until = time.monotonic() + BREAKER_COOLDOWN
+                self.probing = False
+                self.stats["breaker_trips"] += 1
+                count("http_breaker_trips")
+            self.cond.notify_all()
+
+    def snapshot(self) -> Dict:
+        with self.cond:
+            s = dict(self.stats)
+            elapsed = max(1e-9, time.monotonic() - self.t0)
+            s.update(limit=round(self.limit, 2), req_per_s=round(s["requests"] / elapsed, 2),
+                     kb_per_s=round(s["bytes"] / 1024 / elapsed, 1), busy_s=round(s["busy_s"], 3),
+                     open=time.monotonic() < self.open_until)
+            return s
+
+_hosts: Dict[str, HostController] = {}
+_hosts_lock = threading.Lock()
+
+def controller(url: str, max_limit: int) -> HostController:
+    """The process-wide controller for url's host; its ceiling is the widest engine using it."""
+    host = urlsplit(url).netloc.lower()
+    with _hosts_lock:
+        c = _hosts.get(host)
+        if c is None:
+            c = _hosts[host] = HostController(host, max_limit)
+        else:
+            c.max_limit = max(c.max_limit, int(max_limit))
+        return c
+
+def request(send: Callable[..., requests.Response], url: str, max_limit: int,
+            deadline: Optional[float] = None, retries: int = MAX_RETRIES, **kw) -> requests.Response:
+    """
+    send(url, **kw) under url's host controller, retrying 429 / 5xx /
+    connection errors. Returns the last response (callers raise_for_status);
+    re-raises the last network error once retries are spent.
+    """
+    ctl = controller(url, max_limit)
+    for attempt in range(retries + 1):
+        probe = ctl.acquire(deadline)
+        t0 = time.monotonic()
+        try:
+            with ctl.cond:
+                ctl.stats["requests"] += 1
+            try:
+                resp, err = send(url, **kw), None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                resp, err = None, e
+            if err is None and resp.status_code not in RETRY_STATUS:
+                nbytes = int(resp.headers.get("Content-Length") or 0) if kw.get("stream") else len(resp.content)
+                ctl.success(nbytes, time.monotonic() - t0)
+                return resp
+            pause = retry_after(resp)
+            throttled = isinstance(err, requests.Timeout) or (resp is not None and resp.status_code in THROTTLE_STATUS)
+            ctl.failure(throttled, pause=pause)
+        finally:
+            ctl.release(probe)
+        if attempt == retries:
+            break
+        wait = max(pause or 0.0, backoff(attempt))
+        if deadline is not None and time.monotonic() + wait >= deadline:
+            break
+        with ctl.cond:
+            ctl.stats["retries"] += 1
+        count("http_retries")
+        if resp is not None:
+            resp.close()  # release the connection of a streamed response before retrying
+        time.sleep(wait)
+    if err is not None:
+        raise err
+    return resp
+
+def host_stats() -> Dict[str, Dict]:
+    with _hosts_lock:
+        hosts = dict(_hosts)
+    return {h: c.snapshot() for h, c in sorted(hosts.items())}
+
+def format_host_stats(stats: Optional[Dict[str, Dict]] = None) -> str:
+    stats = host_stats() if stats is None else stats
+    return "  ".join(f"{h}={s['requests']} req ({s['retries']} retried, {s['throttled']} throttled, "
+                     f"{s['errors']} failed) {s['req_per_s']}/s limit {s['limit']}"
+                     + (" OPEN" if s["open"] else "") for h, s in stats.items()) or "no network requests"
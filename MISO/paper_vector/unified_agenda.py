@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Streaming Unified Agenda ingester.
+
+Every agenda edition linked from reginfo.gov's XML report page is downloaded
+concurrently straight to disk (editions are immutable, so existing files are
+reused), then parsed incrementally with iterparse: one <RIN_INFO> record at a
+time, cleared as soon as it is read, so memory stays flat no matter how many
+editions are loaded.
+
+Per record we keep RIN, title, agency, stage, the timetable (action/date
+pairs) and the edition's publication date, which is used as the event date.
+"""
+import os, re, sys
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+import pandas as pd
+from bs4 import BeautifulSoup
+from fetch import FetchEngine, default_engine
+
+try:
+    from lxml import etree as ET  # faster iterparse when available
+except ImportError:  # pragma: no cover
+    import xml.etree.ElementTree as ET
+
+INDEX_URL = "https://www.reginfo.gov/public/do/eAgendaXmlReport"
+UA_COLUMNS = ["source","id","title","agency","stage","date","timetable","next_action_date","edition"]
+
+def _local(tag) -> str:
+    tag = tag if isinstance(tag, str) else ""
+    return tag.rsplit("}", 1)[-1].upper()
+
+def parse_ua_date(s: Optional[str]) -> Optional[pd.Timestamp]:
+    """Agenda dates look like 03/00/2024 (day unknown) or 03/15/2024."""
+    m = re.match(r"\s*(\d{1,2})/(\d{1,2})/(\d{4})", s or "")
+    if not m:
+        return None
+    month, day, year = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    try:
+        return pd.Timestamp(year=year, month=max(month, 1), day=max(day, 1))
+    except ValueError:
+        return None
+
+def edition_date(pub_id: Optional[str]) -> Optional[pd.Timestamp]:
+    """PUBLICATION_ID like 202310 -> 2023-10-01."""
+    m = re.match(r"\s*(\d{4})(\d{2})", pub_id or "")
+    return pd.Timestamp(year=int(m.group(1)), month=int(m.group(2)), day=1) if m else None
+
+def _text(el) -> str:
+    return (el.text or "").strip() if el is not None else ""
+
+def _record(el) -> Dict:
+    rec = {"id": "", "title": "", "agency": "", "stage": "", "timetable": [], "edition": ""}
+    for child in el:
+        tag = _local(child.tag)
+        if tag == "RIN":
+            rec["id"] = _text(child)
+        elif tag in ("RULE_TITLE", "TITLE"):
+            rec["title"] = _text(child)
+        elif tag == "RULE_STAGE":
+            rec["stage"] = _text(child)
+        elif tag == "AGENCY":
+            name = next((c for c in child if _local(c.tag) == "NAME"), None)
+            rec["agency"] = _text(name) or _text(child)
+        elif tag == "PUBLICATION":
+            pid = next((c for c in child if _local(c.tag) == "PUBLICATION_ID"), None)
+            rec["edition"] = _text(pid)
+        elif tag == "TIMETABLE_LIST":
+            for tt in child:
+                parts = {_local(c.tag): _text(c) for c in tt}
+                if parts.get("TTBL_ACTION"):
+                    rec["timetable"].append((parts.get("TTBL_ACTION"), parts.get("TTBL_DATE", "")))
+    return rec
+
+def iter_agenda_entries(path: str) -> Iterator[Dict]:
+    """Yield one dict per RIN_INFO record, clearing parsed elements as we go."""
+    context = ET.iterparse(path, events=("start", "end"))
+    root = None
+    for event, el in context:
+        if root is None and event == "start":
+            root = el
+            continue
+        if event != "end" or _local(el.tag) != "RIN_INFO":
+            continue
+        rec = _record(el)
+        el.clear()
+        if root is not None:
+            root.clear()  # drop references to already-processed siblings
+        ed = edition_date(rec["edition"])
+        dates = [(a, parse_ua_date(d)) for a, d in rec["timetable"]]
+        upcoming = [d for _, d in dates if d is not None and ed is not None and d >= ed]
+        yield {
+            "source": "UA",
+            "id": rec["id"],
+            "title": rec["title"],
+            "agency": rec["agency"],
+            "stage": rec["stage"],
+            "date": ed,
+            "timetable": "; ".join(f"{a}: {d.date() if d is not None else ''}" for a, d in dates),
+            "next_action_date": min(upcoming) if upcoming else None,
+            "edition": rec["edition"],
+        }
+
+def list_agenda_links(engine: FetchEngine) -> List[str]:
+    html = engine.get_text(INDEX_URL)
+    soup = BeautifulSoup(html, "html.parser")
+    links = [a.get("href") for a in soup.find_all("a") if a.get("href","").lower().endswith(".xml")]
+    return list(dict.fromkeys(urljoin("https://www.reginfo.gov", l) for l in links))
+
+def download_agenda_files(links: List[str], dest_dir: str, engine: FetchEngine) -> List[str]:
+    """Stream each edition to dest_dir concurrently; already-downloaded files are reused."""
+    os.makedirs(dest_dir, exist_ok=True)
+    offline = engine.cache is not None and engine.cache.offline
+    def _download(link: str) -> Optional[str]:
+        path = os.path.join(dest_dir, os.path.basename(link.split("?")[0]))
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            return path
+        if offline:
+            return None
+        engine.download(link, path)  # throttled per host; a failed transfer leaves no partial file
+        return path
+    paths = []
+    for link, res in zip(links, engine.map(_download, links)):
+        if isinstance(res, Exception):
+            print("[WARN] UA subfetch failed:", link, "->", res, file=sys.stderr)
+        elif res:
+            paths.append(res)
+    return paths
+
+def load_unified_agenda(dest_dir: str, engine: Optional[FetchEngine] = None) -> pd.DataFrame:
+    engine = engine or default_engine()
+    try:
+        links = list_agenda_links(engine)
+    except Exception as e:
+        print("[WARN] UA index fetch failed:", e, file=sys.stderr)
+        links = []
+    paths = download_agenda_files(links, dest_dir, engine) if links else []
+    if not paths and os.path.isdir(dest_dir):  # index unreachable: fall back to what's on disk
+        paths = sorted(os.path.join(dest_dir, f) for f in os.listdir(dest_dir) if f.lower().endswith(".xml"))
+    rows = []
+    for p in paths:
+        try:
+            rows.extend(iter_agenda_entries(p))
+        except Exception as e:
+            print("[WARN] UA parse failed:", p, "->", e, file=sys.stderr)
+    return pd.DataFrame(rows, columns=UA_COLUMNS)
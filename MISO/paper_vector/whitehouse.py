@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+whitehouse.gov listing parser.
+
+Targets the actual post cards on the WordPress archive pages (one title
+link + one <time> per card) instead of get_text() on every nested
+article/li/div/a, which re-extracted the same text per nesting level and
+emitted duplicate rows. Archive pages (/page/N/) are fetched concurrently in
+batches until a page is older than the cutoff, comes back empty or 404s
+(a page failing for any other reason is reported and skipped), and results
+are deduped by URL across listings.
+"""
+import re, sys
+from typing import Dict, List, Optional
+import pandas as pd
+from bs4 import BeautifulSoup
+from fetch import FetchEngine, default_engine
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover
+    HTML_PARSER = "html.parser"
+
+LISTINGS = [
+    "https://www.whitehouse.gov/presidential-actions/executive-orders/",
+    "https://www.whitehouse.gov/briefings-statements/",
+    "https://www.whitehouse.gov/presidential-actions/",
+]
+MAX_PAGES = 200
+MAX_FAILED_PAGES = 3  # consecutive pages failing (after retries) before a listing is abandoned
+WH_COLUMNS = ["source","title","agency","date","url"]
+_DATE_RE = re.compile(r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}")
+CARD_SELECTOR = "li.wp-block-post, article"
+TITLE_SELECTOR = "h2 a[href], h3 a[href], .wp-block-post-title a[href]"
+
+def page_url(listing: str, n: int) -> str:
+    return listing if n == 1 else f"{listing.rstrip('/')}/page/{n}/"
+
+def _card_date(card) -> Optional[pd.Timestamp]:
+    t = card.find("time")
+    if t is not None:
+        d = pd.to_datetime(t.get("datetime") or t.get_text(" ", strip=True), errors="coerce", utc=True)
+        if pd.notna(d):
+            return d.tz_convert(None).normalize()
+    m = _DATE_RE.search(card.get_text(" ", strip=True))
+    return pd.to_datetime(m.group(0), errors="coerce") if m else None
+
+def parse_listing(html: str) -> List[Dict]:
+    """One row per post card: title, url, date."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    cards = soup.select(CARD_SELECTOR)
+    if not cards:
+        # unfamiliar markup: treat the nearest ancestor holding both a <time> and a link as the card
+        cards = []
+        for t in soup.find_all("time"):
+            el = t.parent
+            while el is not None and el.find("a", href=True) is None:
+                el = el.parent
+            if el is not None:
+                cards.append(el)
+    rows, seen = [], set()
+    for card in cards:
+        a = card.select_one(TITLE_SELECTOR) or card.find("a", href=True)
+        if a is None:
+            continue
+        url = a.get("href")
+        if not url or url in seen:
+            continue
+        d = _card_date(card)
+        if d is None or pd.isna(d):
+            continue
+        seen.add(url)
+        rows.append({"title": a.get_text(" ", strip=True), "url": url, "date": d})
+    return rows
+
+def _is_404(e: Exception) -> bool:
+    return getattr(getattr(e, "response", None), "status_code", None) == 404
+
+def crawl_listing(listing: str, cutoff: pd.Timestamp, engine: FetchEngine, max_pages: int = MAX_PAGES) -> List[Dict]:
+    """
+    Rows newer than cutoff, page by page until the archive ends (404 / empty
+    page) or a page reaches past the cutoff. A page that still fails after the
+    fetch layer's retries is reported and skipped; MAX_FAILED_PAGES failures
+    in a row give up on the listing.
+    """
+    rows, page, batch, failed = [], 1, max(1, engine.concurrency), 0
+    while page <= max_pages:
+        nums = list(range(page, min(page + batch, max_pages + 1)))
+        results = engine.map(lambda n: parse_listing(engine.get_text(page_url(listing, n))), nums)
+        done = False
+        for n, res in zip(nums, results):
+            if isinstance(res, Exception):
+                if _is_404(res):
+                    if n == 1:
+                        print("[WARN] WhiteHouse listing not found:", listing, file=sys.stderr)
+                    done = True  # past the last archive page
+                    break
+                failed += 1
+                print(f"[WARN] WhiteHouse page {n} of {listing} failed, skipped -> {res}", file=sys.stderr)
+                if failed >= MAX_FAILED_PAGES:
+                    print(f"[WARN] WhiteHouse: giving up on {listing} after {failed} failed pages in a row "
+                          f"(last {n})", file=sys.stderr)
+                    done = True
+                    break
+                continue
+            failed = 0
+            if not res:
+                done = True
+                break
+            rows.extend(r for r in res if r["date"] >= cutoff)
+            if min(r["date"] for r in res) < cutoff:
+                done = True
+                break
+        if done:
+            break
+        page += batch
+    return rows
+
+def pull_whitehouse_listings(days: int = 365, engine: Optional[FetchEngine] = None,
+                             listings: List[str] = LISTINGS) -> pd.DataFrame:
+    engine = engine or default_engine()
+    cutoff = pd.Timestamp.utcnow().normalize().tz_localize(None) - pd.Timedelta(days=days)
+    rows = [r for listing in listings for r in crawl_listing(listing, cutoff, engine)]
+    df = pd.DataFrame(rows, columns=["title","url","date"]).drop_duplicates("url")
+    df.insert(0, "source", "WH")
+    df["agency"] = "White House"
+    return df[WH_COLUMNS].reset_index(drop=True)
@@ -1,7 +1,16 @@
-import json, glob, re
+import argparse, json, glob, os, re, sys
 import pandas as pd
 from dateutil import parser
 
+# shared --profile instrumentation lives with the paper vector pipeline
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "paper_vector"))
+from instrument import add_profile_argument, finish_profile, stage, start_profile
+
+ap = argparse.ArgumentParser()
+add_profile_argument(ap)
+args = ap.parse_args()
+start_profile(args.profile)
+
 KEYWORDS = [k.strip().lower() for k in open("keywords.txt") if k.strip()]
 
 def read_jsonl(path):
@@ -27,6 +36,7 @@ def detect_keywords(text):
     hits = sorted({k for k in KEYWORDS if k in text})
     return ",".join(hits)
 
+st = stage("read.raw")
 files = glob.glob("data_raw/*_raw.jsonl")
 frames = []
 for fp in files:
@@ -35,12 +45,15 @@ for fp in files:
     frames.append(df)
 
 df = pd.concat(frames, ignore_index=True).fillna("")
+st.rows(in_=len(files), out=len(df))
+st = stage("normalize").rows(in_=len(df))
 # unify fields
 df["posted_at"] = df["posted_raw"].apply(normalize_date)
 df["text"] = (df["job_title"].astype(str) + " " + df["desc"].astype(str))
 df["keywords_detected"] = df["text"].apply(detect_keywords)
 
 # filter: keep rows with ≥1 keyword
+st = stage("filter.dedupe").rows(in_=len(df))
 df = df[df["keywords_detected"] != ""]
 
 # dedupe by title+company+location
@@ -52,6 +65,8 @@ df_out = df[[
     "posted_at","job_title","company","location","keywords_detected","source","url"
 ]].sort_values("posted_at", ascending=False)
 
+st.rows(out=len(df_out))
+stage("write").rows(in_=len(df_out))
 csv_path = "data_clean/people_vector_clean.csv"
 parquet_path = "data_clean/people_vector_clean.parquet"
 df_out.to_csv(csv_path, index=False)
@@ -62,3 +77,4 @@ print(f"Wrote {csv_path} and {parquet_path}")
 # quick daily counts (starter signal)
 daily = df_out.assign(date=df_out["posted_at"].dt.date).groupby("date").size().reset_index(name="count")
 daily.to_csv("data_clean/daily_counts.csv", index=False)
+finish_profile(args.profile)
@@ -1,34 +1,38 @@
-import json, requests, time
+import os, sys, json
 from datetime import datetime
 
+# shared HTTP client (per-host adaptive concurrency, retries, circuit breaker)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "paper_vector"))
+from fetch import FetchEngine
+from throttle import format_host_stats
+
 COMPANIES = [
     "rmi", "nrdc", "formenergy", "breakthroughenergy", "bloomenergy"
 ]
 
+ENGINE = FetchEngine(concurrency=4, rate=4.0, timeout=20)
+
 def fetch(company):
     url = f"https://boards-api.greenhouse.io/v1/boards/{company}/jobs"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    return r.json().get("jobs", [])
+    return ENGINE.get_json(url).get("jobs", [])
 
 out = []
-for c in COMPANIES:
-    try:
-        jobs = fetch(c)
-        for j in jobs:
-            out.append({
-                "source": "greenhouse",
-                "company": c,
-                "job_title": j.get("title",""),
-                "location": (j.get("location") or {}).get("name",""),
-                "posted_raw": j.get("updated_at",""),
-                "url": j.get("absolute_url",""),
-                "scraped_at": datetime.utcnow().isoformat(timespec="seconds")+"Z",
-                "desc": j.get("content","")
-            })
-        time.sleep(0.5)
-    except Exception as e:
-        print("err", c, e)
+for c, jobs in zip(COMPANIES, ENGINE.map(fetch, COMPANIES)):
+    if isinstance(jobs, Exception):
+        print("err", c, jobs)
+        continue
+    for j in jobs:
+        out.append({
+            "source": "greenhouse",
+            "company": c,
+            "job_title": j.get("title",""),
+            "location": (j.get("location") or {}).get("name",""),
+            "posted_raw": j.get("updated_at",""),
+            "url": j.get("absolute_url",""),
+            "scraped_at": datetime.utcnow().isoformat(timespec="seconds")+"Z",
+            "desc": j.get("content","")
+        })
+print("hosts:", format_host_stats())
 
 fn = "data_raw/greenhouse_raw.jsonl"
 with open(fn,"w") as f:
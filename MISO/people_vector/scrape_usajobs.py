@@ -1,14 +1,19 @@
-import os, json, time
-import requests
+import os, sys, json
 from datetime import datetime
 from urllib.parse import urlencode
 
+# shared HTTP client (per-host adaptive concurrency, retries, circuit breaker)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "paper_vector"))
+from fetch import FetchEngine
+from throttle import format_host_stats
+
 API_KEY = os.getenv("USAJOBS_API_KEY")
 HEADERS = {
     "User-Agent": "youremail@example.com",
     "Authorization-Key": API_KEY
 }
 BASE = "https://data.usajobs.gov/api/search"
+ENGINE = FetchEngine(concurrency=4, rate=2.0)
 
 TERMS = [
     "energy", "regulatory", "utility", "transmission",
@@ -18,29 +23,29 @@ TERMS = [
 def search(term, page=1):
     params = {"Keyword": term, "ResultsPerPage": 50, "Page": page}
     url = f"{BASE}?{urlencode(params)}"
-    r = requests.get(url, headers=HEADERS, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return ENGINE.get_json(url, headers=HEADERS)
 
 if __name__ == "__main__":
     assert API_KEY, "Set USAJOBS_API_KEY env var"
+    pages = [(term, page) for term in TERMS for page in range(1, 4)]  # first 150 results/term
     out = []
-    for term in TERMS:
-        for page in range(1, 4):  # first 150 results/term
-            data = search(term, page)
-            for item in data.get("SearchResult", {}).get("SearchResultItems", []):
-                pos = item["MatchedObjectDescriptor"]
-                out.append({
-                    "source": "usajobs",
-                    "job_title": pos.get("PositionTitle",""),
-                    "company": pos.get("OrganizationName",""),
-                    "location": ", ".join([l.get("LocationName","") for l in pos.get("PositionLocation",[])]),
-                    "posted_raw": pos.get("PublicationStartDate",""),
-                    "url": pos.get("PositionURI",""),
-                    "scraped_at": datetime.utcnow().isoformat(timespec="seconds")+"Z",
-                    "desc": pos.get("UserArea",{}).get("Details",{}).get("JobSummary","")
-                })
-            time.sleep(0.8)
+    for (term, page), data in zip(pages, ENGINE.map(lambda tp: search(*tp), pages)):
+        if isinstance(data, Exception):
+            print("err", term, page, data)
+            continue
+        for item in data.get("SearchResult", {}).get("SearchResultItems", []):
+            pos = item["MatchedObjectDescriptor"]
+            out.append({
+                "source": "usajobs",
+                "job_title": pos.get("PositionTitle",""),
+                "company": pos.get("OrganizationName",""),
+                "location": ", ".join([l.get("LocationName","") for l in pos.get("PositionLocation",[])]),
+                "posted_raw": pos.get("PublicationStartDate",""),
+                "url": pos.get("PositionURI",""),
+                "scraped_at": datetime.utcnow().isoformat(timespec="seconds")+"Z",
+                "desc": pos.get("UserArea",{}).get("Details",{}).get("JobSummary","")
+            })
+    print("hosts:", format_host_stats())
     fn = "data_raw/usajobs_raw.jsonl"
     with open(fn,"w") as f:
         for r in out:
@@ -4,10 +4,16 @@
 import json
 import csv
 import os
+import re
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    import pyarrow.dataset as pa_ds  # optional: typed reads of the paper vector Parquet store
+except ImportError:
+    pa_ds = None
+
 # Define paths
 PROJECT_ROOT = Path(__file__).parent
 MISO_DATA = PROJECT_ROOT / "MISO"
@@ -81,16 +87,43 @@ def _parse_float(value, default=0.0):
         return default
 
 
-def process_paper_vector():
-    """Process paper vector momentum scores"""
+PAPER_COLUMNS = [
+    "topic", "date", "score", "fr_notice_count", "comment_rate_14d", "under_review_count",
+    "econ_significant_flag", "wh_hits", "eo_hits_45d",
+]
+
+
+PAPER_TREND_DAYS = 90  # trend window; also covers the 30-day change baseline
+
+
+def _paper_filter(dataset):
+    """Arrow predicate for the last PAPER_TREND_DAYS of topic_day (date + month partitions, as storage.py)."""
+    months = sorted(m.group(1) for m in (re.search(r"month=(\d{4}-\d{2})", f) for f in dataset.files) if m)
+    if not months:
+        return None
+    dates = dataset.to_table(columns=["date"], filter=pa_ds.field("month") == months[-1]).column("date")
+    latest = max((d for d in dates.to_pylist() if d is not None), default=None)
+    if latest is None:
+        return None
+    start = latest - timedelta(days=PAPER_TREND_DAYS)
+    return (pa_ds.field("date") >= start) & (pa_ds.field("month") >= start.strftime("%Y-%m"))
+
+
+def _paper_rows():
+    """Yield (date, row) from the topic_day Parquet dataset if present, else topic_day.csv."""
+    parquet_dir = MISO_DATA / "paper_vector" / "parquet" / "topic_day"
+    if pa_ds is not None and parquet_dir.is_dir():
+        dataset = pa_ds.dataset(parquet_dir, format="parquet", partitioning="hive")
+        table = dataset.to_table(columns=PAPER_COLUMNS, filter=_paper_filter(dataset))
+        for row in table.to_pylist():
+            if row["date"] is not None:
+                yield datetime.combine(row["date"], datetime.min.time()), row
+        return
+
     paper_file = MISO_DATA / "paper_vector" / "topic_day.csv"
     if not paper_file.exists():
         print(f"Warning: {paper_file} not found")
-        return {"topics": [], "trend": []}
-
-    topic_entries: dict[str, list[tuple[datetime, dict]]] = defaultdict(list)
-    daily_scores: dict[datetime, list[float]] = defaultdict(list)
-
+        return
     with open(paper_file, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -98,11 +131,19 @@ def process_paper_vector():
                 dt = datetime.strptime(row["date"], "%Y-%m-%d")
             except (KeyError, ValueError):
                 continue
+            yield dt, row
+
+
+def process_paper_vector(rows=None):
+    """Process paper vector momentum scores (rows: (date, row) pairs, default read from disk)"""
+    topic_entries: dict[str, list[tuple[datetime, dict]]] = defaultdict(list)
+    daily_scores: dict[datetime, list[float]] = defaultdict(list)
 
-            score = _parse_float(row.get("score"), 0.0)
-            topic = row.get("topic", "").strip() or "unknown"
-            topic_entries[topic].append((dt, row))
-            daily_scores[dt].append(score)
+    for dt, row in (rows if rows is not None else _paper_rows()):
+        score = _parse_float(row.get("score"), 0.0)
+        topic = (row.get("topic") or "").strip() or "unknown"
+        topic_entries[topic].append((dt, row))
+        daily_scores[dt].append(score)
 
     if not topic_entries:
         return {"topics": [], "trend": []}
@@ -142,7 +183,7 @@ def process_paper_vector():
     top_topics = top_topics[:5]
 
     max_dt = max(daily_scores.keys())
-    min_dt = max_dt - timedelta(days=90)
+    min_dt = max_dt - timedelta(days=PAPER_TREND_DAYS)
     trend = []
     for dt in sorted(daily_scores.keys()):
         if dt < min_dt:
@@ -189,6 +230,25 @@ def process_keywords():
     
     return keywords
 
+def write_json(path, data):
+    """Write JSON via a temp file + rename so the client never reads a half-written file"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def publish_paper_vector(rows=None):
+    """Refresh only the paper_vector block of vector_data.json (MISO/paper_vector/daemon.py)"""
+    output_file = CLIENT_DATA / "vector_data.json"
+    if not output_file.exists():
+        main()
+        return
+    with open(output_file, 'r', encoding='utf-8') as f:
+        combined = json.load(f)
+    combined['paper_vector'] = process_paper_vector(rows)
+    combined.setdefault('metadata', {})['paper_vector_updated_at'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    write_json(output_file, combined)
+
 def main():
     """Main processing function"""
     print("Processing MISO vector data for client...")
@@ -220,8 +280,7 @@ def main():
     
     # Write to JSON files
     output_file = CLIENT_DATA / "vector_data.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_data, f, indent=2, ensure_ascii=False)
+    write_json(output_file, combined_data)
     
     print(f"✓ Data processed and saved to {output_file}")
     print(f"  - People vector entries: {len(people_data)}")